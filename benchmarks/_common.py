@@ -0,0 +1,24 @@
+import os
+import sys
+import time
+from typing import Callable
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+
+# Os módulos de src/ são importados pelo nome (ex.: "from _pdf_base import ...")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+def time_per_call(func: Callable, number: int, repeat: int = 5) -> float:
+    """
+    Tempo (s) por chamada da função: melhor média entre as repetições.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
@@ -0,0 +1,58 @@
+"""
+Custo do modo de arquivamento (PDF/A-2b) em relação ao modo padrão: tempo de
+geração, tamanho do PDF e bytes de fontes embutidas, e o custo do primeiro
+documento do processo, que carrega o perfil ICC e os programas das fontes.
+
+    python benchmarks/bench_archival.py [--number 10]
+"""
+
+import argparse
+import io
+
+from _common import time_per_call
+from fixtures import certificate_record
+
+from _archival import embedded_font, srgb_profile, standard_font_program
+from _font_registry import embedded_font_bytes
+from _image_assets import image_asset_cache
+from certificate_without_humidity import CertificateWithoutHumidity
+
+
+def first_render_ms(certificate: CertificateWithoutHumidity, archival: bool) -> float:
+    """
+    Tempo do primeiro documento do processo, sem os recursos compartilhados
+    (imagens decodificadas e, no modo de arquivamento, perfil ICC e programas
+    das fontes).
+    """
+    image_asset_cache.clear()
+    for cached in (srgb_profile, standard_font_program, embedded_font):
+        cached.cache_clear()
+    return (
+        time_per_call(lambda: certificate.render_bytes(archival=archival), 1, 1) * 1e3
+    )
+
+
+def run(number: int = 10) -> dict:
+    certificate = CertificateWithoutHumidity.model_validate(certificate_record(3))
+    results = {}
+    for mode, archival in (("standard", False), ("archival", True)):
+        pdf = certificate.render_bytes(archival=archival)
+        results[f"output_{mode}_bytes"] = len(pdf)
+        results[f"fonts_{mode}_bytes"] = embedded_font_bytes(pdf)
+        results[f"render_{mode}_ms"] = (
+            time_per_call(
+                lambda: certificate.generate_pdf(io.BytesIO(), archival=archival),
+                number,
+            )
+            * 1e3
+        )
+        results[f"render_{mode}_first_ms"] = first_render_ms(certificate, archival)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=10)
+    args = parser.parse_args()
+    for name, value in run(args.number).items():
+        print(f"{name}: {value:.1f}")
@@ -0,0 +1,72 @@
+"""
+Latência do AsyncRenderer sob carga concorrente (percentis p50/p95/p99).
+
+    python benchmarks/bench_async.py [--requests N] [--concurrency 1 4 16]
+"""
+
+import argparse
+import asyncio
+import time
+
+import _common  # noqa: F401  (coloca src/ no sys.path)
+from fixtures import certificate_record
+
+from async_generation import AsyncRenderer, process_executor
+from batch_generation import BatchSummary, RecordResult
+from certificate_without_humidity import CertificateWithoutHumidity
+
+
+async def _load(renderer: AsyncRenderer, documents: list) -> BatchSummary:
+    """
+    Dispara todas as requisições ao mesmo tempo, como clientes simultâneos;
+    a latência inclui a espera pelo semáforo do renderer.
+    """
+
+    async def request(index: int, document) -> RecordResult:
+        start = time.perf_counter()
+        await renderer.render(document)
+        return RecordResult(index, None, time.perf_counter() - start)
+
+    summary = BatchSummary()
+    start = time.perf_counter()
+    for result in await asyncio.gather(
+        *(request(index, document) for index, document in enumerate(documents))
+    ):
+        summary.add(result)
+    summary.elapsed = time.perf_counter() - start
+    return summary
+
+
+def run(requests: int = 40, concurrency: tuple = (1, 4, 16)) -> dict:
+    documents = [
+        CertificateWithoutHumidity.model_validate(certificate_record(3, seed))
+        for seed in range(requests)
+    ]
+    results = {}
+    for max_concurrency in concurrency:
+        renderer = AsyncRenderer(max_concurrency=max_concurrency)
+        results[f"threads_c{max_concurrency}"] = asyncio.run(
+            _load(renderer, documents)
+        ).as_dict()
+        with process_executor(max_workers=max_concurrency) as executor:
+            # Aquece os processos antes da medição
+            executor.submit(int).result()
+            renderer = AsyncRenderer(executor, max_concurrency=max_concurrency)
+            results[f"processes_c{max_concurrency}"] = asyncio.run(
+                _load(renderer, documents)
+            ).as_dict()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+    for name, summary in run(args.requests, tuple(args.concurrency)).items():
+        print(
+            f"{name}: {summary['throughput_per_s']:.1f} docs/s, "
+            f"p50 {summary['latency_p50_s'] * 1000:.0f} ms, "
+            f"p95 {summary['latency_p95_s'] * 1000:.0f} ms, "
+            f"p99 {summary['latency_p99_s'] * 1000:.0f} ms"
+        )
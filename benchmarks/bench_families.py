@@ -0,0 +1,67 @@
+"""
+Preparação das famílias de certificado: cada família montando o próprio
+contexto (estilos, imagens, estilos de tabela, template) contra todas as
+famílias registradas compartilhando um único contexto, e latência por
+documento em um lote que mistura os tipos.
+
+    python benchmarks/bench_families.py [--number 20]
+"""
+
+import argparse
+import itertools
+
+from _common import time_per_call
+from fixtures import certificate_record
+
+from _certificate_registry import certificate_types, resolve_record
+from _compiled_template import clear_compiled_templates
+from _image_assets import image_asset_cache
+from _render_context import clear_render_contexts
+
+
+def cold():
+    clear_compiled_templates()
+    clear_render_contexts()
+    image_asset_cache.clear()
+
+
+def run(number: int = 20) -> dict:
+    families = certificate_types()
+
+    def warm_separately():
+        # Cada família paga a preparação como se fosse a única do processo
+        for family in families.values():
+            cold()
+            family.warm_up()
+
+    def warm_shared():
+        cold()
+        for family in families.values():
+            family.warm_up()
+
+    results = {
+        "warm_separately_ms": time_per_call(warm_separately, 1) * 1e3,
+        "warm_shared_ms": time_per_call(warm_shared, 1) * 1e3,
+    }
+
+    records = itertools.cycle(
+        [
+            resolve_record({**certificate_record(3), "certificate_type": type_id}, None)
+            for type_id in families
+        ]
+    )
+
+    def render_mixed():
+        certificate_cls, record = next(records)
+        certificate_cls.model_validate(record).render_bytes()
+
+    results["mixed_render_ms"] = time_per_call(render_mixed, number) * 1e3
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+    for name, value in run(args.number).items():
+        print(f"{name}: {value:.3f}")
@@ -0,0 +1,51 @@
+"""
+Tamanho do PDF, bytes de fontes embutidas e tempo de geração por tema de
+fontes (Helvetica padrão do PDF e Vera TrueType com subset), e o tempo de
+ler as faces TrueType (uma única vez por processo).
+
+    python benchmarks/bench_fonts.py [--number 10]
+"""
+
+import argparse
+
+from _common import time_per_call
+from fixtures import certificate_record
+from reportlab.pdfbase.ttfonts import TTFont
+
+from _font_registry import VERA, embedded_font_bytes
+from certificate_without_humidity import CertificateWithoutHumidity
+from paragraph_style_gota import ParagraphStylesVera
+
+
+class CertificateVera(CertificateWithoutHumidity):
+    paragraph_styles = ParagraphStylesVera
+
+
+THEMES = {"helvetica": CertificateWithoutHumidity, "vera": CertificateVera}
+
+
+def run(number: int = 10) -> dict:
+    results = {}
+    for name, certificate_cls in THEMES.items():
+        certificate = certificate_cls.model_validate(certificate_record(3))
+        pdf = certificate.render_bytes()
+        results[f"output_{name}_bytes"] = len(pdf)
+        results[f"fonts_{name}_bytes"] = embedded_font_bytes(pdf)
+        results[f"render_{name}_ms"] = (
+            time_per_call(certificate.render_bytes, number) * 1e3
+        )
+
+    def parse():
+        for face_name, path in VERA.faces().items():
+            TTFont(face_name, path)
+
+    results["faces_parse_ms"] = time_per_call(parse, number) * 1e3
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=10)
+    args = parser.parse_args()
+    for name, value in run(args.number).items():
+        print(f"{name}: {value:.1f}")
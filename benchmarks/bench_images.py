@@ -0,0 +1,48 @@
+"""
+Bytes economizados por documento pelo pipeline de imagens (reamostragem para
+a área de exibição e escolha entre JPEG e Flate).
+
+    python benchmarks/bench_images.py [--number 10]
+"""
+
+import argparse
+import os
+
+from _common import time_per_call
+from fixtures import certificate_record
+
+from _compiled_template import clear_compiled_templates
+from _image_pipeline import image_pipeline
+from certificate_without_humidity import CertificateWithoutHumidity
+
+
+def run(number: int = 10) -> dict:
+    certificate = CertificateWithoutHumidity.model_validate(certificate_record(3))
+    results = {}
+    for enabled in (False, True):
+        image_pipeline.enabled = enabled
+        # A assinatura faz parte do template compilado
+        clear_compiled_templates()
+        name = "prepared" if enabled else "original"
+        results[f"output_{name}_bytes"] = len(certificate.render_bytes())
+        results[f"render_{name}_ms"] = (
+            time_per_call(certificate.render_bytes, number) * 1e3
+        )
+    results["saved_bytes_per_document"] = (
+        results["output_original_bytes"] - results["output_prepared_bytes"]
+    )
+    results["pipeline_saved_bytes_per_document"] = certificate.image_savings()[
+        "saved_bytes"
+    ]
+    for item in image_pipeline.stats():
+        name = os.path.basename(item["source"])
+        results[f"{name}_saved_bytes"] = item["saved_bytes"]
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=10)
+    args = parser.parse_args()
+    for name, value in run(args.number).items():
+        print(f"{name}: {value:.1f}")
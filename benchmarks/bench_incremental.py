@@ -0,0 +1,71 @@
+"""
+Regeneração incremental de certificados longos: geração completa contra
+generate_incremental quando nada mudou e quando só o último ponto de medição
+mudou (as páginas até a última linha alterada da tabela são copiadas).
+
+    python benchmarks/bench_incremental.py [--points 200 1000]
+"""
+
+import argparse
+import io
+import itertools
+import os
+import tempfile
+
+from _common import time_per_call
+from fixtures import certificate_record
+
+from certificate_without_humidity import CertificateWithoutHumidity
+
+
+def with_last_point(record: dict, vml: float) -> CertificateWithoutHumidity:
+    points = list(record["measurement_points"])
+    points[-1] = {**points[-1], "vml": vml}
+    return CertificateWithoutHumidity.model_validate(
+        {**record, "measurement_points": points}
+    )
+
+
+def run(point_counts: tuple = (200, 1_000)) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for count in point_counts:
+            record = certificate_record(count)
+            certificate = CertificateWithoutHumidity.model_validate(record)
+            sidecar = os.path.join(directory, f"certificado_{count}.layout.json")
+
+            results[f"full_{count}_points_ms"] = (
+                time_per_call(lambda: certificate.render_bytes(reproducible=True), 1)
+                * 1e3
+            )
+
+            def generate(document: CertificateWithoutHumidity):
+                return document.generate_incremental(io.BytesIO(), sidecar, True)
+
+            generate(certificate)
+            results[f"unchanged_{count}_points_ms"] = (
+                time_per_call(lambda: generate(certificate), 1) * 1e3
+            )
+            results[f"unchanged_{count}_points_reused_pages"] = generate(
+                certificate
+            ).reused_pages
+
+            # Alterna entre dois valores: cada geração difere da anterior
+            versions = itertools.cycle(
+                [with_last_point(record, 10.0), with_last_point(record, 20.0)]
+            )
+            results[f"last_point_{count}_points_ms"] = (
+                time_per_call(lambda: generate(next(versions)), 1) * 1e3
+            )
+            result = generate(next(versions))
+            results[f"last_point_{count}_points_reused_pages"] = result.reused_pages
+            results[f"pages_{count}_points"] = result.pages
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, nargs="+", default=[200, 1_000])
+    args = parser.parse_args()
+    for name, value in run(tuple(args.points)).items():
+        print(f"{name}: {value:.1f}")
@@ -0,0 +1,77 @@
+"""
+Vazão e pico de memória da leitura de leituras brutas (CSV e JSONL): o pico
+deve ser ~constante com o tamanho do arquivo.
+
+    python benchmarks/bench_ingestion.py [--instruments 1000 10000]
+"""
+
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from fixtures import readings_rows
+
+from ingestion import iter_certificates
+
+POINTS = 3
+READINGS = 5
+
+
+def write_files(directory: str, instruments: int) -> dict[str, str]:
+    paths = {
+        "csv": os.path.join(directory, f"readings_{instruments}.csv"),
+        "jsonl": os.path.join(directory, f"readings_{instruments}.jsonl"),
+    }
+    with (
+        open(paths["csv"], "w", newline="", encoding="utf-8") as csv_file,
+        open(paths["jsonl"], "w", encoding="utf-8") as jsonl_file,
+    ):
+        writer = csv.writer(csv_file)
+        writer.writerow(("serial_number", "vvc", "reading"))
+        for serial_number, vvc, reading in readings_rows(instruments, POINTS, READINGS):
+            writer.writerow((serial_number, vvc, reading))
+            jsonl_file.write(
+                json.dumps(
+                    {"serial_number": serial_number, "vvc": vvc, "reading": reading}
+                )
+                + "\n"
+            )
+    return paths
+
+
+def measure(path: str) -> tuple[float, int]:
+    """
+    Tempo (s) e pico de memória (bytes) para ler o arquivo inteiro.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in iter_certificates(path):
+        pass
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def run(instrument_counts: tuple = (1_000, 10_000)) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for instruments in instrument_counts:
+            rows = instruments * POINTS * READINGS
+            for name, path in write_files(directory, instruments).items():
+                elapsed, peak = measure(path)
+                results[f"{name}_{rows}_rows_per_s"] = rows / elapsed
+                results[f"{name}_{rows}_rows_peak_kb"] = peak / 1024
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--instruments", type=int, nargs="+", default=[1_000, 10_000])
+    args = parser.parse_args()
+    for name, value in run(tuple(args.instruments)).items():
+        print(f"{name}: {value:.1f}")
@@ -0,0 +1,62 @@
+"""
+Pico de memória (tracemalloc) da geração de certificados longos: com os
+flowables gerados sob demanda e as páginas comprimidas ao final de cada uma,
+o pico cresce apenas com o tamanho do PDF comprimido, não com o número de
+linhas das tabelas. Com tracemalloc a geração fica ~10x mais lenta (100.000
+linhas levam alguns minutos).
+
+    python benchmarks/bench_memory.py [--rows 10000 100000]
+"""
+
+import argparse
+import tracemalloc
+
+import _common  # noqa: F401  (coloca src/ no sys.path)
+from fixtures import certificate_record
+
+from certificate_without_humidity import CertificateWithoutHumidity
+
+
+class NullWriter:
+    """
+    Descarta o PDF, contando os bytes: o buffer de saída não entra no pico.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def write(self, data) -> int:
+        self.count += len(data)
+        return len(data)
+
+
+def peak_bytes(rows: int) -> tuple[int, int]:
+    certificate = CertificateWithoutHumidity.model_validate(certificate_record(rows))
+    output = NullWriter()
+    # Os pontos de medição já estão no modelo; mede apenas a geração
+    tracemalloc.start()
+    try:
+        certificate.generate_pdf(output)
+        return tracemalloc.get_traced_memory()[1], output.count
+    finally:
+        tracemalloc.stop()
+
+
+def run(row_counts: tuple = (10_000, 100_000)) -> dict:
+    # Aquece caches e imports (NumPy, fontes, imagens, templates)
+    CertificateWithoutHumidity.model_validate(certificate_record(100)).render_bytes()
+    results = {}
+    for rows in row_counts:
+        peak, pdf_bytes = peak_bytes(rows)
+        results[f"peak_{rows}_rows_mb"] = peak / 2**20
+        results[f"pdf_{rows}_rows_mb"] = pdf_bytes / 2**20
+        results[f"peak_{rows}_rows_bytes_per_row"] = peak / rows
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+    for name, value in run(tuple(args.rows)).items():
+        print(f"{name}: {value:.1f}")
@@ -0,0 +1,66 @@
+"""
+Cálculo e formatação da tabela de resultados: Python célula a célula contra
+NumPy em uma única passada, e o cálculo dos pontos de muitos instrumentos
+por instrumento contra em lote.
+
+    python benchmarks/bench_metrology.py [--points 100 1000 10000]
+"""
+
+import argparse
+
+import numpy as np
+from _common import time_per_call
+from fixtures import certificate_record, readings_rows
+
+import calibration_certificate
+from _metrology import calibration_points
+from calibration_certificate import results_rows
+from certificate_without_humidity import CertificateWithoutHumidity
+
+
+def format_table(points: tuple, vectorized: bool) -> list:
+    threshold = calibration_certificate.VECTORIZED_MIN_POINTS
+    calibration_certificate.VECTORIZED_MIN_POINTS = 0 if vectorized else 10**9
+    try:
+        return results_rows(points)
+    finally:
+        calibration_certificate.VECTORIZED_MIN_POINTS = threshold
+
+
+def run(point_counts: tuple = (100, 1_000, 10_000), instruments: int = 2_000) -> dict:
+    results = {}
+    for count in point_counts:
+        points = CertificateWithoutHumidity.model_validate(
+            certificate_record(count)
+        ).measurement_points
+        for name, vectorized in (("python", False), ("numpy", True)):
+            results[f"table_{count}_points_{name}_ms"] = (
+                time_per_call(lambda: format_table(points, vectorized), 5) * 1e3
+            )
+
+    serial_numbers, vvc, readings = zip(*readings_rows(instruments))
+    group = np.unique(np.asarray(serial_numbers), return_inverse=True)[1]
+    vvc, readings = np.asarray(vvc), np.asarray(readings)
+    bounds = np.flatnonzero(np.diff(group)) + 1
+    starts, stops = [0, *bounds.tolist()], [*bounds.tolist(), len(group)]
+
+    def per_instrument():
+        for start, stop in zip(starts, stops):
+            calibration_points(group[start:stop], vvc[start:stop], readings[start:stop])
+
+    results[f"points_{instruments}_instruments_per_instrument_ms"] = (
+        time_per_call(per_instrument, 3) * 1e3
+    )
+    results[f"points_{instruments}_instruments_batch_ms"] = (
+        time_per_call(lambda: calibration_points(group, vvc, readings), 3) * 1e3
+    )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--instruments", type=int, default=2_000)
+    args = parser.parse_args()
+    for name, value in run(tuple(args.points), args.instruments).items():
+        print(f"{name}: {value:.2f}")
@@ -0,0 +1,38 @@
+"""
+Custo de layout por linha da tabela de resultados (deve ser ~constante).
+
+    python benchmarks/bench_results_table.py [--rows 100 1000 10000]
+"""
+
+import argparse
+import io
+
+import _common  # noqa: F401  (coloca src/ no sys.path)
+from fixtures import certificate_record
+
+from certificate_without_humidity import CertificateWithoutHumidity
+
+
+def layout_seconds(rows: int) -> float:
+    certificate = CertificateWithoutHumidity.model_validate(certificate_record(rows))
+    metrics = certificate.generate_pdf(io.BytesIO(), hooks=[lambda metrics: None])
+    return metrics.phases["layout"].wall
+
+
+def run(row_counts: tuple = (100, 1_000, 10_000)) -> dict:
+    layout_seconds(3)  # aquece caches e imports
+    base = layout_seconds(0)
+    results = {}
+    for rows in row_counts:
+        # Desconta o layout do restante do certificado (0 linhas)
+        per_row = (layout_seconds(rows) - base) / rows
+        results[f"layout_{rows}_rows_us_per_row"] = per_row * 1e6
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1_000, 10_000])
+    args = parser.parse_args()
+    for name, value in run(tuple(args.rows)).items():
+        print(f"{name}: {value:.1f}")
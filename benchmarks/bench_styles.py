@@ -0,0 +1,66 @@
+"""
+Alocações de ParagraphStyle por certificado (CertificateWithoutHumidity).
+
+    python benchmarks/bench_styles.py [--documents N]
+"""
+
+import argparse
+import tracemalloc
+
+from _common import time_per_call
+from reportlab.lib import styles as reportlab_styles
+
+from certificate_without_humidity import CertificateWithoutHumidity
+
+
+def run(documents: int = 50) -> dict:
+    certificate = CertificateWithoutHumidity()
+
+    def content():
+        return list(certificate.content_to_pdf())
+
+    content()  # aquece caches e imports
+
+    created = 0
+    original_init = reportlab_styles.ParagraphStyle.__init__
+
+    def counting_init(self, *args, **kwargs):
+        nonlocal created
+        created += 1
+        original_init(self, *args, **kwargs)
+
+    reportlab_styles.ParagraphStyle.__init__ = counting_init
+    try:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        # Mantém os flowables vivos para que as alocações apareçam no snapshot
+        contents = [content() for _ in range(documents)]
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+    finally:
+        reportlab_styles.ParagraphStyle.__init__ = original_init
+
+    style_filter = [tracemalloc.Filter(True, reportlab_styles.__file__)]
+    style_bytes = sum(
+        stat.size_diff
+        for stat in after.filter_traces(style_filter).compare_to(
+            before.filter_traces(style_filter), "filename"
+        )
+    )
+    total_bytes = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del contents
+
+    return {
+        "styles_created_per_document": created / documents,
+        "style_bytes_per_document": style_bytes / documents,
+        "content_bytes_per_document": total_bytes / documents,
+        "content_to_pdf_us": 1e6 * time_per_call(content, 200),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=50)
+    args = parser.parse_args()
+    for name, value in run(args.documents).items():
+        print(f"{name}: {value:.1f}")
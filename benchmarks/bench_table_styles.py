@@ -0,0 +1,60 @@
+"""
+Montagem de cada bloco da tabela de resultados com o estilo pré-compilado
+(TableStylePreset) e com os mesmos comandos em um TableStyle comum, aplicados
+célula a célula pela Table, como antes.
+
+    python benchmarks/bench_table_styles.py [--rows 40] [--number 200]
+"""
+
+import argparse
+
+from _common import time_per_call
+from reportlab.platypus import TableStyle
+
+from _results_table import ResultsTable
+from calibration_certificate import RESULTS_TABLE_STYLE
+from certificate_without_humidity import CertificateWithoutHumidity
+
+
+def plain_style(rows: int) -> TableStyle:
+    preset = RESULTS_TABLE_STYLE
+    return TableStyle(
+        [
+            *preset.commands,
+            *(
+                ("BACKGROUND", (0, row), (-1, row), preset.band_color)
+                for row in range(preset.first_band_row, rows, 2)
+            ),
+            ("ALIGN", (0, 0), (-1, -1), preset.cell_style.alignment),
+            ("VALIGN", (0, 0), (-1, -1), preset.cell_style.valign),
+        ]
+    )
+
+
+def run(rows: int = 40, number: int = 200) -> dict:
+    context = CertificateWithoutHumidity.render_context()
+    header_rows = CertificateWithoutHumidity.template()[
+        "results_header_rows_temperature"
+    ]
+    data = [("-20,00", "-21,13", "-1,13", "0,34", "2,00", "0,68")] * rows
+    col_widths = context.column_widths["results"]
+
+    results = {}
+    for name, style in (
+        ("preset", RESULTS_TABLE_STYLE),
+        ("table_style", plain_style(len(header_rows) + rows)),
+    ):
+        chunk = ResultsTable(header_rows, data, col_widths, style)
+        results[f"chunk_{rows}_rows_{name}_us"] = (
+            time_per_call(chunk._table, number) * 1e6
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=40)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+    for name, value in run(args.rows, args.number).items():
+        print(f"{name}: {value:.1f}")
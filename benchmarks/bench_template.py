@@ -0,0 +1,47 @@
+"""
+Latência por documento com o template compilado (partes estáticas montadas
+uma única vez) e recompilando o template a cada documento, como antes.
+
+    python benchmarks/bench_template.py [--number 50]
+"""
+
+import argparse
+
+from _common import time_per_call
+from fixtures import certificate_record
+
+from _compiled_template import clear_compiled_templates
+from certificate_without_humidity import CertificateWithoutHumidity
+
+
+def run(number: int = 50) -> dict:
+    certificate = CertificateWithoutHumidity.model_validate(certificate_record(3))
+    certificate.render_bytes()  # aquece fontes, estilos e imagens
+
+    def content():
+        return list(certificate.content_to_pdf())
+
+    def recompiled(func):
+        def call():
+            clear_compiled_templates()
+            func()
+
+        return call
+
+    return {
+        "content_compiled_ms": time_per_call(content, number) * 1e3,
+        "content_recompiled_ms": time_per_call(recompiled(content), number) * 1e3,
+        "render_compiled_ms": time_per_call(certificate.render_bytes, number) * 1e3,
+        "render_recompiled_ms": time_per_call(
+            recompiled(certificate.render_bytes), number
+        )
+        * 1e3,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=50)
+    args = parser.parse_args()
+    for name, value in run(args.number).items():
+        print(f"{name}: {value:.3f}")
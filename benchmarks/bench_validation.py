@@ -0,0 +1,51 @@
+"""
+Custo de validação por registro do CertificateWithoutHumidity.
+
+    python benchmarks/bench_validation.py [--points N]
+"""
+
+import argparse
+
+from _common import time_per_call
+from fixtures import certificate_record
+
+from certificate_without_humidity import CertificateWithoutHumidity
+
+
+def run(points: int = 3, number: int = 2000) -> dict:
+    record = certificate_record(points)
+    certificate = CertificateWithoutHumidity.model_validate(record)
+    json_record = certificate.model_dump_json()
+    python_record = certificate.model_dump()
+    # Submodelos já instanciados (ex.: vindos da ingestão de leituras)
+    model_record = {
+        name: getattr(certificate, name)
+        for name in CertificateWithoutHumidity.model_fields
+    }
+
+    return {
+        "model_validate_us": 1e6
+        * time_per_call(
+            lambda: CertificateWithoutHumidity.model_validate(record), number
+        ),
+        "model_validate_json_us": 1e6
+        * time_per_call(
+            lambda: CertificateWithoutHumidity.model_validate_json(json_record), number
+        ),
+        "from_trusted_us": 1e6
+        * time_per_call(
+            lambda: CertificateWithoutHumidity.from_trusted(python_record), number
+        ),
+        "from_trusted_models_us": 1e6
+        * time_per_call(
+            lambda: CertificateWithoutHumidity.from_trusted(model_record), number
+        ),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, default=3)
+    args = parser.parse_args()
+    for name, value in run(args.points).items():
+        print(f"{name}: {value:.1f}")
@@ -0,0 +1,72 @@
+import random
+from datetime import date, timedelta
+from typing import Iterator
+
+import _common  # noqa: F401  (coloca src/ no sys.path)
+
+
+def measurement_points(count: int, seed: int = 0) -> list[dict]:
+    """
+    Pontos de calibração sintéticos, espaçados de 0,5 °C a partir de -20 °C.
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            "vvc": round(-20.0 + 0.5 * index, 2),
+            "vml": round(-20.0 + 0.5 * index + rng.uniform(-1.2, 1.2), 2),
+            "uc": round(rng.uniform(0.2, 0.5), 2),
+            "k": 2.0,
+        }
+        for index in range(count)
+    ]
+
+
+def certificate_record(points: int = 3, seed: int = 0) -> dict:
+    """
+    Registro de certificado no formato JSON (como vem de um arquivo JSONL).
+    """
+    rng = random.Random(seed)
+    calibration_date = date(2024, 1, 1) + timedelta(days=rng.randrange(365))
+    return {
+        "filename": f"certificado_{seed:06d}.pdf",
+        "number": str(1000 + seed),
+        "norm_reference": "04_00",
+        "requester": {
+            "name": f"Laboratório {seed}",
+            "address": f"Rua Exemplo, {rng.randrange(1, 999)} - Centro, "
+            "Rio de Janeiro - RJ",
+        },
+        "instrument": {
+            "description": "Termômetro",
+            "brand": "Senfio",
+            "model": "EXPLORER",
+            "serial_number": f"{seed:04d}",
+        },
+        "calibration": {
+            "calibration_date": calibration_date.isoformat(),
+            "issue_date": (calibration_date + timedelta(days=1)).isoformat(),
+            "location": "Senfio Soluções Tecnológicas",
+        },
+        "ambient_conditions": {
+            "temperature": round(rng.uniform(20, 28), 1),
+            "temperature_uncertainty": 1.0,
+        },
+        "measurement_points": measurement_points(points, seed),
+    }
+
+
+def readings_rows(
+    instruments: int, points: int = 3, readings: int = 5, seed: int = 0
+) -> Iterator[tuple[str, float, float]]:
+    """
+    Leituras brutas sintéticas (nº de série, vvc, leitura), agrupadas por
+    instrumento como exportadas pelos bancos de calibração.
+    """
+    rng = random.Random(seed)
+    for instrument in range(instruments):
+        serial_number = f"{instrument:06d}"
+        offset = rng.uniform(-1.2, 1.2)
+        for index in range(points):
+            vvc = round(-20.0 + 0.5 * index, 2)
+            for _ in range(readings):
+                yield serial_number, vvc, round(vvc + offset + rng.gauss(0, 0.3), 2)
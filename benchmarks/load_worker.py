@@ -0,0 +1,108 @@
+"""
+Teste de carga do render_worker: sobe o worker em um processo à parte, envia
+jobs de duas prioridades para a fila SQLite (todos de uma vez ou a uma taxa
+fixa) e mede vazão e latência de ponta a ponta (envio até o PDF gravado) por
+prioridade, além da profundidade máxima da fila.
+
+    python benchmarks/load_worker.py [--jobs 200] [--workers 2] [--rate 0]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from _common import SRC_DIR
+from fixtures import certificate_record
+
+from _job_queue import JobQueue
+from batch_generation import BatchSummary, RecordResult
+
+
+def _records(jobs: int, high_share: float):
+    # Uma fração dos jobs com prioridade alta, espalhada pela carga
+    step = round(1 / high_share) if high_share else 0
+    for index in range(jobs):
+        record = certificate_record(3, index)
+        record["filename"] = f"certificado_{index:06d}.pdf"
+        yield (1 if step and index % step == 0 else 0), record
+
+
+def _summary(rows: list[tuple]) -> BatchSummary:
+    summary = BatchSummary()
+    for job_id, _, submitted_at, finished_at in rows:
+        summary.add(RecordResult(job_id, None, finished_at - submitted_at))
+    if rows:
+        summary.elapsed = max(row[3] for row in rows) - min(row[2] for row in rows)
+    return summary
+
+
+def run(
+    jobs: int = 200, workers: int = 2, rate: float = 0.0, high_share: float = 0.1
+) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "fila.db")
+        job_queue = JobQueue(path)
+        worker = subprocess.Popen(
+            [
+                sys.executable,
+                os.path.join(SRC_DIR, "render_worker.py"),
+                "serve",
+                path,
+                "--output-dir",
+                os.path.join(directory, "saida"),
+                "--workers",
+                str(workers),
+            ],
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            max_depth = 0
+            start = time.monotonic()
+            for index, (priority, record) in enumerate(_records(jobs, high_share)):
+                if rate:
+                    time.sleep(max(start + index / rate - time.monotonic(), 0.0))
+                job_queue.submit(record, priority=priority)
+                if index % 10 == 0:
+                    max_depth = max(max_depth, job_queue.depth()["queued"])
+            while True:
+                depth = job_queue.depth()
+                max_depth = max(max_depth, depth["queued"])
+                if depth["done"] + depth["failed"] >= jobs:
+                    break
+                time.sleep(0.05)
+        finally:
+            worker.terminate()
+            worker.wait()
+
+        state = job_queue.state("metrics")
+        rows = job_queue.finished()
+        job_queue.close()
+
+    results = {"all": _summary(rows).as_dict()}
+    for priority in sorted({row[1] for row in rows}, reverse=True):
+        results[f"priority_{priority}"] = _summary(
+            [row for row in rows if row[1] == priority]
+        ).as_dict()
+    results["max_queue_depth"] = max_depth
+    if state is not None:
+        results["worker_render_p95_s"] = state[0]["render_latency"]["p95_s"]
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="jobs/s (0: todos de uma vez)"
+    )
+    parser.add_argument(
+        "--high-share", type=float, default=0.1, help="fração com prioridade alta"
+    )
+    args = parser.parse_args()
+    for name, value in run(args.jobs, args.workers, args.rate, args.high_share).items():
+        print(f"{name}: {json.dumps(value)}")
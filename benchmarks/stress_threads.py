@@ -0,0 +1,100 @@
+"""
+Teste de estresse da geração em threads: gera os mesmos documentos em série
+e em um ThreadPoolExecutor e verifica que cada PDF gerado em paralelo é
+idêntico, byte a byte, ao gerado em série (modo reproducible).
+
+    python benchmarks/stress_threads.py [--documents 24] [--threads 8] [--rounds 3]
+
+Termina com código 1 se algum PDF divergir.
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fixtures import certificate_record
+
+from _compiled_template import clear_compiled_templates
+from certificate_without_humidity import CertificateWithoutHumidity
+from paragraph_style_gota import ParagraphStylesVera
+
+# Tamanhos variados: uma página, tabela quebrada em páginas e tabela longa
+POINT_COUNTS = (3, 40, 300)
+
+
+class CertificateVera(CertificateWithoutHumidity):
+    paragraph_styles = ParagraphStylesVera
+
+
+def documents(count: int) -> list:
+    """
+    Certificados com dados, tamanhos e temas de fontes diferentes.
+    """
+    themes = (CertificateWithoutHumidity, CertificateVera)
+    return [
+        themes[index % len(themes)].model_validate(
+            certificate_record(POINT_COUNTS[index % len(POINT_COUNTS)], seed=index)
+        )
+        for index in range(count)
+    ]
+
+
+def render(document) -> bytes:
+    return document.render_bytes(reproducible=True)
+
+
+def run(documents_count: int = 24, threads: int = 8, rounds: int = 3) -> dict:
+    items = documents(documents_count)
+    # Troca de thread muito mais frequente que o padrão (5 ms), para expor
+    # condições de corrida
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        return _run(items, threads, rounds)
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+
+def _run(items: list, threads: int, rounds: int) -> dict:
+    documents_count = len(items)
+
+    # Primeira geração em paralelo, com os templates ainda não compilados
+    clear_compiled_templates()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        first = list(executor.map(render, items))
+
+    start = time.perf_counter()
+    expected = [render(document) for document in items]
+    serial = time.perf_counter() - start
+
+    mismatches = sum(a != b for a, b in zip(first, expected))
+    parallel = 0.0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            # Cada documento aparece várias vezes na mesma rodada
+            outputs = list(executor.map(render, items * 2))
+        parallel += time.perf_counter() - start
+        mismatches += sum(
+            output != expected[index % len(items)]
+            for index, output in enumerate(outputs)
+        )
+    return {
+        "documents": documents_count * (2 * rounds + 1),
+        "mismatches": mismatches,
+        "serial_ms_per_document": serial / documents_count * 1e3,
+        "threaded_ms_per_document": parallel / (2 * rounds * documents_count) * 1e3,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=24)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    results = run(args.documents, args.threads, args.rounds)
+    for name, value in results.items():
+        print(f"{name}: {value:.1f}")
+    sys.exit(1 if results["mismatches"] else 0)
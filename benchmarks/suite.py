@@ -0,0 +1,279 @@
+"""
+Suíte de benchmarks da geração de documentos, com verificação de regressão.
+
+    python benchmarks/suite.py                    # roda e compara com o baseline
+    python benchmarks/suite.py --quick            # sem o cenário de 10.000 linhas
+    python benchmarks/suite.py --update-baseline  # grava o baseline atual
+    python benchmarks/suite.py --threshold 0.10   # tolera até 10% de piora
+    python benchmarks/suite.py --import-budget-ms 500  # limite absoluto de import
+
+Todos os dados são gerados localmente (benchmarks/fixtures.py); nada é lido
+da rede. As métricas terminadas em "_per_s" são "quanto maior, melhor"; as
+demais (tempo, memória, tamanho) são "quanto menor, melhor".
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from _common import ROOT_DIR, SRC_DIR
+from fixtures import certificate_record
+
+BENCHMARKS_DIR = os.path.join(ROOT_DIR, "benchmarks")
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+# Módulos cujo tempo de import é medido (CLI e processos do pool)
+IMPORT_MODULES = ("certificate_without_humidity", "batch_generation")
+
+ROW_COUNTS = (3, 100, 10_000)
+QUICK_ROW_COUNTS = (3, 100)
+
+_COLD_START_SCRIPT = """
+import sys
+sys.path.insert(0, {src!r})
+from certificate_without_humidity import CertificateWithoutHumidity
+CertificateWithoutHumidity().render_bytes()
+"""
+
+
+def _run_json(*args: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, *args], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def render_document(rows: int) -> dict:
+    """
+    Executado em um processo novo: aquece com um certificado pequeno e mede
+    um certificado com o número de linhas informado.
+    """
+    import resource
+
+    from certificate_without_humidity import CertificateWithoutHumidity
+
+    CertificateWithoutHumidity.model_validate(certificate_record(3)).render_bytes()
+    certificate = CertificateWithoutHumidity.model_validate(certificate_record(rows))
+    repeat = 5 if rows <= 100 else 1
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = certificate.render_bytes()
+        best = min(best, time.perf_counter() - start)
+    # ru_maxrss: KiB no Linux, bytes no macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        max_rss *= 1024
+    return {
+        f"render_{rows}_rows_s": best,
+        f"peak_rss_{rows}_rows_mb": max_rss / 2**20,
+        f"output_{rows}_rows_kb": len(data) / 1024,
+    }
+
+
+def cold_start(repeat: int = 3) -> dict:
+    """
+    Tempo do interpretador novo até o primeiro PDF pronto (imports incluídos).
+    """
+    script = _COLD_START_SCRIPT.format(src=SRC_DIR)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", script], check=True)
+        best = min(best, time.perf_counter() - start)
+    return {"cold_start_s": best}
+
+
+def _parse_importtime(stderr: str, module: str) -> tuple[float, float]:
+    """
+    Lê a saída de "python -X importtime": retorna o tempo cumulativo do import
+    do módulo e a soma do tempo próprio dos módulos de src/, em ms.
+    """
+    own_modules = {
+        os.path.splitext(name)[0]
+        for name in os.listdir(SRC_DIR)
+        if name.endswith(".py")
+    }
+    total = own = 0.0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # cabeçalho
+        name = name.strip()
+        if name == module:
+            total = int(cumulative_us) / 1000
+        if name in own_modules:
+            own += int(self_us) / 1000
+    return total, own
+
+
+def import_time(modules: tuple = IMPORT_MODULES, repeat: int = 5) -> dict:
+    """
+    Tempo de import de cada módulo em um interpretador novo, medido com
+    "python -X importtime" (melhor de repeat execuções).
+    """
+    metrics = {}
+    for module in modules:
+        best_total = best_own = float("inf")
+        for _ in range(repeat):
+            stderr = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                cwd=SRC_DIR,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stderr
+            total, own = _parse_importtime(stderr, module)
+            best_total, best_own = min(best_total, total), min(best_own, own)
+        metrics[f"import_{module}_ms"] = best_total
+        metrics[f"import_{module}_own_ms"] = best_own
+    return metrics
+
+
+def rendering(row_counts: tuple) -> dict:
+    metrics = {}
+    for rows in row_counts:
+        metrics.update(
+            _run_json(os.path.join(BENCHMARKS_DIR, "suite.py"), "--render", str(rows))
+        )
+    return metrics
+
+
+def batch_throughput(records: int = 60) -> dict:
+    from batch_generation import generate_batch
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        summary = generate_batch(
+            (certificate_record(3, seed) for seed in range(records)),
+            output_dir=output_dir,
+        )
+    if summary.failed:
+        raise RuntimeError(summary.format())
+    return {
+        "batch_docs_per_s": summary.throughput,
+        "batch_latency_p95_s": summary.percentile(95),
+    }
+
+
+def validation() -> dict:
+    import bench_validation
+
+    return {
+        f"validation_{name}": value
+        for name, value in bench_validation.run(points=100, number=500).items()
+    }
+
+
+def run_suite(quick: bool = False) -> dict:
+    row_counts = QUICK_ROW_COUNTS if quick else ROW_COUNTS
+    metrics = {}
+    metrics.update(cold_start())
+    metrics.update(import_time())
+    metrics.update(rendering(row_counts))
+    metrics.update(batch_throughput())
+    metrics.update(validation())
+    return {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "quick": quick,
+        },
+        "metrics": {name: round(value, 6) for name, value in metrics.items()},
+    }
+
+
+def higher_is_better(metric: str) -> bool:
+    return metric.endswith("_per_s")
+
+
+def compare(metrics: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Lista as métricas que pioraram mais que o threshold em relação ao baseline.
+    Métricas ausentes em um dos lados são ignoradas.
+    """
+    regressions = []
+    for name, value in metrics.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        change = (value - reference) / reference
+        if higher_is_better(name):
+            change = -change
+        if change > threshold:
+            regressions.append(
+                f"{name}: {value:.6g} (baseline {reference:.6g}, {change:+.0%} pior)"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--import-budget-ms",
+        type=float,
+        help="falha se o import de algum módulo passar deste tempo",
+    )
+    parser.add_argument("--output", help="grava os resultados em JSON")
+    parser.add_argument("--render", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.render is not None:
+        print(json.dumps(render_document(args.render)))
+        return 0
+
+    results = run_suite(quick=args.quick)
+    for name, value in results["metrics"].items():
+        print(f"{name}: {value:.6g}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+            file.write("\n")
+        print(f"Baseline gravado em {args.baseline}")
+        return 0
+
+    regressions = []
+    if args.import_budget_ms is not None:
+        regressions.extend(
+            f"{name}: {value:.6g} (limite {args.import_budget_ms:.6g})"
+            for name, value in results["metrics"].items()
+            if name.startswith("import_")
+            and not name.endswith("_own_ms")
+            and value > args.import_budget_ms
+        )
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["metrics"]
+        regressions.extend(compare(results["metrics"], baseline, args.threshold))
+    elif not regressions:
+        print(f"Sem baseline em {args.baseline}; use --update-baseline.")
+        return 0
+    if regressions:
+        print("Regressões:")
+        print("\n".join(f"  {regression}" for regression in regressions))
+        return 1
+    print(f"Sem regressões acima de {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
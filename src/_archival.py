@@ -0,0 +1,329 @@
+import os
+import re
+import zlib
+from dataclasses import dataclass
+from functools import cache
+from typing import Any
+from xml.sax.saxutils import escape
+
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import _fontdata, pdfmetrics
+from reportlab.pdfbase.pdfdoc import (PDFArray, PDFCatalog, PDFDate,
+                                      PDFDictionary, PDFDocument, PDFName,
+                                      PDFStream, PDFString, format)
+
+from _bounded_build import PageFlushingCanvas
+from _image_assets import flatten_image, image_asset_cache
+
+# Nível do PDF/A gerado. O perfil sRGB do LittleCMS (Pillow) é ICC v4, aceito
+# pelo PDF/A-2 (o PDF/A-1 exige ICC v2)
+PDFA_PART = 2
+PDFA_CONFORMANCE = "B"
+
+# Incrementar ao alterar o PDF/A gerado, para invalidar os PDFs em cache
+ARCHIVAL_VERSION = "1"
+
+OUTPUT_CONDITION = "sRGB IEC61966-2.1"
+
+_DATE = re.compile(r"D:(\d{4})(\d\d)(\d\d)(\d\d)(\d\d)(\d\d)([+-]\d\d)'(\d\d)'")
+_FONT_BBOX = re.compile(rb"/FontBBox\s*\{([^}]*)\}")
+_ITALIC_ANGLE = re.compile(rb"/ItalicAngle\s+(-?[\d.]+)")
+
+_XMP_TEMPLATE = """<?xpacket begin="\ufeff" id="W5M0MpCehiHzreSzNTczkc9d"?>
+<x:xmpmeta xmlns:x="adobe:ns:meta/">
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">
+<rdf:Description rdf:about=""
+ xmlns:pdfaid="http://www.aiim.org/pdfa/ns/id/"
+ xmlns:dc="http://purl.org/dc/elements/1.1/"
+ xmlns:xmp="http://ns.adobe.com/xap/1.0/"
+ xmlns:pdf="http://ns.adobe.com/pdf/1.3/">
+<pdfaid:part>{part}</pdfaid:part>
+<pdfaid:conformance>{conformance}</pdfaid:conformance>
+<dc:format>application/pdf</dc:format>
+<dc:title><rdf:Alt><rdf:li xml:lang="x-default">{title}</rdf:li></rdf:Alt></dc:title>
+<dc:creator><rdf:Seq><rdf:li>{author}</rdf:li></rdf:Seq></dc:creator>
+<dc:description><rdf:Alt><rdf:li xml:lang="x-default">{subject}</rdf:li></rdf:Alt></dc:description>
+<dc:subject><rdf:Bag>{subject_items}</rdf:Bag></dc:subject>
+{identifier}<pdf:Producer>{producer}</pdf:Producer>
+<pdf:Keywords>{keywords}</pdf:Keywords>
+<pdf:Trapped>{trapped}</pdf:Trapped>
+<xmp:CreatorTool>{creator}</xmp:CreatorTool>
+<xmp:CreateDate>{date}</xmp:CreateDate>
+<xmp:ModifyDate>{date}</xmp:ModifyDate>
+<xmp:MetadataDate>{date}</xmp:MetadataDate>
+</rdf:Description>
+</rdf:RDF>
+</x:xmpmeta>
+<?xpacket end="w"?>
+"""
+
+
+@dataclass(frozen=True)
+class DocumentMetadata:
+    """
+    Metadados do documento gravados no dicionário Info e no XMP do PDF/A.
+    """
+
+    title: str
+    author: str
+    subject: str = ""
+    keywords: tuple[str, ...] = ()
+    identifier: str | None = None
+    creator: str = "report-lab-learning"
+
+
+@cache
+def srgb_profile() -> bytes:
+    """
+    Perfil ICC sRGB da output intent, já comprimido (Flate): montado uma
+    única vez por processo e gravado como está em cada documento.
+    """
+    from PIL import ImageCms
+
+    profile = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB"))
+    return zlib.compress(profile.tobytes())
+
+
+@dataclass(frozen=True)
+class _FontProgram:
+    # Programa Type 1 (PFB sem os cabeçalhos de segmento), já comprimido
+    data: bytes
+    length1: int
+    length2: int
+    length3: int
+    bbox: tuple[int, ...]
+    italic_angle: float
+
+
+def _pfb_segments(data: bytes) -> list[bytes]:
+    # Segmentos do PFB: 0x80, tipo (1 texto, 2 binário, 3 fim), tamanho (LE)
+    segments = []
+    position = 0
+    while data[position + 1] != 3:
+        if data[position] != 0x80:
+            raise ValueError("Arquivo PFB inválido.")
+        size = int.from_bytes(data[position + 2 : position + 6], "little")
+        segments.append(data[position + 6 : position + 6 + size])
+        position += 6 + size
+    return segments
+
+
+@cache
+def standard_font_program(face_name: str) -> _FontProgram:
+    """
+    Programa Type 1 de uma das 14 fontes padrão do PDF, distribuído com o
+    ReportLab (as mesmas larguras das métricas usadas no layout), lido e
+    comprimido uma única vez por processo.
+    :param face_name: Nome da fonte padrão (ex.: "Helvetica-Bold").
+    """
+    path = _fontdata.findT1File(face_name)
+    if not path or not os.path.exists(path):
+        raise ValueError(f"Programa da fonte {face_name} não encontrado.")
+    with open(path, "rb") as file:
+        clear, binary, trailer = _pfb_segments(file.read())
+    bbox = _FONT_BBOX.search(clear)
+    italic_angle = _ITALIC_ANGLE.search(clear)
+    return _FontProgram(
+        data=zlib.compress(clear + binary + trailer),
+        length1=len(clear),
+        length2=len(binary),
+        length3=len(trailer),
+        bbox=tuple(int(value) for value in bbox.group(1).split()),
+        italic_angle=float(italic_angle.group(1)) if italic_angle else 0.0,
+    )
+
+
+class _EmbeddedStandardFont(pdfmetrics.Font):
+    """
+    Fonte padrão (Helvetica, Times...) com o programa embutido: mesmo nome,
+    codificação e larguras da original, então o layout não muda.
+    """
+
+    def __init__(self, font: pdfmetrics.Font):
+        self.__dict__.update(font.__dict__)
+
+    def addObjects(self, doc: PDFDocument):
+        super().addObjects(doc)
+        internal_name = doc.fontMapping[self.fontName][1:]
+        pdf_font = doc.idToObject["BasicFonts"].dict[internal_name]
+        face = self.face
+        program = standard_font_program(face.name)
+        font_file = PDFStream(
+            PDFDictionary(
+                {
+                    "Filter": PDFName("FlateDecode"),
+                    "Length1": program.length1,
+                    "Length2": program.length2,
+                    "Length3": program.length3,
+                }
+            ),
+            program.data,
+        )
+        # Flags: 4 = símbolos (Symbol, ZapfDingbats), 32 = texto; 64 = itálico
+        flags = 4 if face.requiredEncoding else 32
+        if program.italic_angle:
+            flags |= 64
+        descriptor = PDFDictionary(
+            {
+                "Type": PDFName("FontDescriptor"),
+                "FontName": PDFName(face.name),
+                "Flags": flags,
+                "FontBBox": PDFArray(list(program.bbox)),
+                "ItalicAngle": program.italic_angle,
+                "Ascent": face.ascent,
+                "Descent": face.descent,
+                "CapHeight": face.ascent,
+                "StemV": 80,
+                "FontFile": doc.Reference(font_file, f"fontFile:{face.name}"),
+            }
+        )
+        pdf_font.FirstChar = 0
+        pdf_font.LastChar = 255
+        pdf_font.Widths = PDFArray(self.widths)
+        pdf_font.FontDescriptor = doc.Reference(
+            descriptor, f"fontDescriptor:{face.name}"
+        )
+
+
+@cache
+def embedded_font(font_name: str) -> pdfmetrics.Font | None:
+    """
+    Versão embutida de uma fonte padrão do PDF, ou None se a fonte não é uma
+    das 14 padrão (TrueType e Type 1 registradas já são embutidas).
+    """
+    font = pdfmetrics.getFont(font_name)
+    if font._dynamicFont or font.face.name not in _fontdata.standardFonts:
+        return None
+    return _EmbeddedStandardFont(font)
+
+
+def _xmp_date(document: PDFDocument) -> str:
+    # A mesma data do dicionário Info (CreationDate/ModDate), no formato XMP
+    text = PDFDate(
+        ts=document._timeStamp, dateFormatter=document.info._dateFormatter
+    ).format(document)
+    year, month, day, hour, minute, second, zone, zone_minutes = _DATE.search(
+        text.decode("latin-1")
+    ).groups()
+    return f"{year}-{month}-{day}T{hour}:{minute}:{second}{zone}:{zone_minutes}"
+
+
+def xmp_packet(document: PDFDocument, metadata: DocumentMetadata) -> str:
+    """
+    Pacote XMP do PDF/A, com os mesmos valores do dicionário Info.
+    """
+    info = document.info
+    identifier = ""
+    if metadata.identifier is not None:
+        identifier = f"<dc:identifier>{escape(metadata.identifier)}</dc:identifier>\n"
+    return _XMP_TEMPLATE.format(
+        part=PDFA_PART,
+        conformance=PDFA_CONFORMANCE,
+        title=escape(info.title),
+        author=escape(info.author),
+        subject=escape(info.subject),
+        subject_items="".join(
+            f"<rdf:li>{escape(keyword)}</rdf:li>" for keyword in metadata.keywords
+        ),
+        identifier=identifier,
+        producer=escape(info.producer),
+        keywords=escape(info.keywords),
+        trapped=info.trapped,
+        creator=escape(info.creator),
+        date=_xmp_date(document),
+    )
+
+
+class _MetadataStream(PDFStream):
+    # O PDF/A exige o XMP sem filtros; o conteúdo é montado na gravação,
+    # quando o dicionário Info (datas, produtor) já está completo
+    def __init__(self, metadata: DocumentMetadata):
+        super().__init__()
+        self.metadata = metadata
+
+    def format(self, document: PDFDocument) -> bytes:
+        content = xmp_packet(document, self.metadata).encode("utf-8")
+        dictionary = PDFDictionary(
+            {
+                "Type": PDFName("Metadata"),
+                "Subtype": PDFName("XML"),
+                "Length": len(content),
+            }
+        )
+        return format(dictionary, document) + b"\nstream\n" + content + b"endstream\n"
+
+
+def _opaque_reader(image: ImageReader) -> ImageReader:
+    # Imagens lidas de arquivo usam a versão opaca em cache; as demais são
+    # compostas a cada uso
+    image.getRGBData()
+    source = image._image
+    if (
+        image._dataA is None
+        and image.mode != "CMYK"
+        and "transparency" not in source.info
+    ):
+        return image
+    if isinstance(image.fileName, str) and os.path.isfile(image.fileName):
+        return image_asset_cache.opaque(image.fileName).reader
+    return ImageReader(flatten_image(source))
+
+
+class ArchivalCanvas(PageFlushingCanvas):
+    """
+    Canvas que gera PDF/A-2b na mesma passagem do build: as fontes padrão
+    são embutidas, o catálogo recebe a output intent sRGB e o XMP com os
+    metadados do documento, e as imagens com transparência (mask="auto") são
+    desenhadas compostas sobre branco, sem máscara.
+    """
+
+    def __init__(self, *args, metadata: DocumentMetadata, **kwargs):
+        """
+        :param metadata: Metadados do documento (os mesmos do Info, que o
+            SimpleDocTemplate grava; ver _PDFBase.base_template_pdf).
+        """
+        super().__init__(*args, **kwargs)
+        document = self._doc
+        profile = PDFStream(
+            PDFDictionary({"N": 3, "Filter": PDFName("FlateDecode")}),
+            srgb_profile(),
+        )
+        output_intent = PDFDictionary(
+            {
+                "Type": PDFName("OutputIntent"),
+                "S": PDFName("GTS_PDFA1"),
+                "OutputConditionIdentifier": PDFString(OUTPUT_CONDITION),
+                "Info": PDFString(OUTPUT_CONDITION),
+                "RegistryName": PDFString("http://www.color.org"),
+                "DestOutputProfile": document.Reference(profile, "sRGBProfile"),
+            }
+        )
+        catalog = document.Catalog
+        # O PDFCatalog só grava as chaves listadas em __NoDefault__
+        catalog.__NoDefault__ = [*PDFCatalog.__NoDefault__, "OutputIntents"]
+        catalog.OutputIntents = PDFArray([output_intent])
+        catalog.Metadata = _MetadataStream(metadata)
+
+    def _make_preamble(self):
+        # O preâmbulo já registra a fonte inicial: as fontes padrão passam a
+        # ser embutidas antes dele
+        document = self._doc
+        if "getInternalFontName" not in vars(document):
+            lookup = document.getInternalFontName
+
+            def internal_font_name(font_name: str) -> str:
+                if font_name not in document.fontMapping:
+                    font = embedded_font(font_name)
+                    if font is not None:
+                        font.addObjects(document)
+                return lookup(font_name)
+
+            document.getInternalFontName = internal_font_name
+        super()._make_preamble()
+
+    def drawImage(self, image: Any, *args, mask: Any = None, **kwargs):
+        if isinstance(image, str):
+            image = image_asset_cache.opaque(image).reader
+        else:
+            image = _opaque_reader(image)
+        return super().drawImage(image, *args, mask=None, **kwargs)
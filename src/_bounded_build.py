@@ -0,0 +1,110 @@
+import sys
+from typing import Any, Iterable
+
+from reportlab import rl_config
+from reportlab.pdfbase.pdfdoc import (PDFArray, PDFBase85Encode, PDFDictionary,
+                                      PDFName, PDFStream, PDFZCompress)
+from reportlab.pdfgen.canvas import Canvas
+
+
+def _keeps_with_next(flowable: Any) -> bool:
+    get_keep_with_next = getattr(flowable, "getKeepWithNext", None)
+    return bool(get_keep_with_next and get_keep_with_next())
+
+
+class FlowableQueue:
+    """
+    Fila de flowables para SimpleDocTemplate.build consumida sob demanda.
+
+    O build trata a lista de flowables como uma fila: lê e remove o primeiro
+    item, devolve ao início as partes de um split e agrupa os itens com
+    keepWithNext. A fila implementa apenas essas operações sobre um buffer
+    pequeno, preenchido a partir de um iterável (ex.: o gerador de
+    content_to_pdf): cada flowable é criado pouco antes do layout e liberado
+    logo depois de desenhado, em vez de o documento inteiro existir desde o
+    início do build.
+    """
+
+    def __init__(self, flowables: Iterable):
+        """
+        :param flowables: Flowables do documento, na ordem; consumido uma vez.
+        """
+        self._source = iter(flowables)
+        self._buffer: list = []
+
+    def _fill(self, count: int):
+        buffer = self._buffer
+        while len(buffer) < count and self._source is not None:
+            try:
+                buffer.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    @staticmethod
+    def _needed(index: int | slice) -> int:
+        # Quantos itens precisam estar no buffer para o índice valer
+        if isinstance(index, slice):
+            if index.step not in (None, 1) or (index.start or 0) < 0:
+                return sys.maxsize
+            if index.stop is None or index.stop < 0:
+                return sys.maxsize
+            return index.stop
+        return sys.maxsize if index < 0 else index + 1
+
+    def __len__(self) -> int:
+        # O build lê len() como limite ao agrupar flowables com keepWithNext:
+        # o buffer sempre cobre a sequência inteira e o flowable seguinte
+        self._fill(1)
+        buffer = self._buffer
+        while self._source is not None and _keeps_with_next(buffer[-1]):
+            self._fill(len(buffer) + 1)
+        return len(buffer)
+
+    def __getitem__(self, index: int | slice) -> Any:
+        self._fill(self._needed(index))
+        return self._buffer[index]
+
+    def __setitem__(self, index: int | slice, value: Any):
+        self._fill(self._needed(index))
+        self._buffer[index] = value
+
+    def __delitem__(self, index: int | slice):
+        self._fill(self._needed(index))
+        del self._buffer[index]
+
+    def insert(self, index: int, value: Any):
+        self._fill(index)
+        self._buffer.insert(index, value)
+
+
+def _compressed_stream(text: str) -> PDFStream:
+    # Mesmos filtros e dicionário que o PDFPage monta ao gravar o arquivo
+    filters = [PDFBase85Encode, PDFZCompress] if rl_config.useA85 else [PDFZCompress]
+    content = text
+    for stream_filter in reversed(filters):
+        content = stream_filter.encode(content)
+    dictionary = PDFDictionary(
+        {"Filter": PDFArray([PDFName(item.pdfname) for item in filters])}
+    )
+    stream = PDFStream(dictionary, content)
+    stream.__Comment__ = "page stream"
+    return stream
+
+
+class PageFlushingCanvas(Canvas):
+    """
+    Canvas que comprime o conteúdo de cada página assim que ela é concluída.
+
+    O ReportLab guarda o texto das operações de todas as páginas até o
+    save() e só então as comprime; em documentos com milhares de páginas é a
+    maior parte da memória do build. Aqui cada página guarda apenas o stream
+    já comprimido, com os mesmos bytes que seriam gravados no save().
+    """
+
+    def showPage(self):
+        pages = self._doc.Pages.pages
+        super().showPage()
+        page = pages[-1]
+        if page.compression and page.stream and page.Contents is None:
+            page.Contents = _compressed_stream(page.stream)
+            page.stream = None
@@ -0,0 +1,91 @@
+import importlib
+import threading
+from typing import Callable, Mapping, TypeVar
+
+# Campo opcional dos registros (JSONL) com o tipo do certificado
+TYPE_FIELD = "certificate_type"
+
+# Famílias incluídas no projeto, importadas (e registradas) na primeira
+# consulta ao registro
+BUILTIN_FAMILIES = (
+    "certificate_without_humidity",
+    "certificate_with_humidity",
+    "certificate_pressure",
+    "certificate_electrical",
+)
+
+_certificate_types: dict[str, type] = {}
+_certificate_types_lock = threading.Lock()
+_builtins_loaded = False
+
+CertificateClass = TypeVar("CertificateClass", bound=type)
+
+
+def register_certificate(
+    type_id: str,
+) -> Callable[[CertificateClass], CertificateClass]:
+    """
+    Decorador que registra uma classe de certificado com um id de tipo,
+    usado no campo certificate_type dos registros de um lote.
+    :param type_id: Id do tipo (ex.: "pressure").
+    """
+
+    def register(cls: CertificateClass) -> CertificateClass:
+        with _certificate_types_lock:
+            current = _certificate_types.get(type_id)
+            if current is not None and (current.__module__, current.__qualname__) != (
+                cls.__module__,
+                cls.__qualname__,
+            ):
+                raise ValueError(
+                    f"O tipo de certificado {type_id!r} já está registrado "
+                    f"para {current.__module__}.{current.__qualname__}."
+                )
+            _certificate_types[type_id] = cls
+        cls.type_id = type_id
+        return cls
+
+    return register
+
+
+def _load_builtin_families():
+    global _builtins_loaded
+    if not _builtins_loaded:
+        for module in BUILTIN_FAMILIES:
+            importlib.import_module(module)
+        _builtins_loaded = True
+
+
+def certificate_types() -> Mapping[str, type]:
+    """
+    Classes de certificado registradas, por id de tipo.
+    """
+    _load_builtin_families()
+    return dict(_certificate_types)
+
+
+def certificate_type(type_id: str) -> type:
+    """
+    Classe de certificado registrada com o id informado.
+    """
+    types = certificate_types()
+    try:
+        return types[type_id]
+    except KeyError:
+        raise ValueError(
+            f"Tipo de certificado desconhecido: {type_id!r} "
+            f"(registrados: {', '.join(sorted(types))})"
+        ) from None
+
+
+def resolve_record(record: dict, default: type) -> tuple[type, dict]:
+    """
+    Classe de certificado de um registro, pelo campo certificate_type, e o
+    registro sem esse campo.
+    :param record: Dados do certificado.
+    :param default: Classe usada quando o registro não informa o tipo.
+    """
+    if TYPE_FIELD not in record:
+        return default, record
+    record = dict(record)
+    return certificate_type(record.pop(TYPE_FIELD)), record
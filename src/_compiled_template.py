@@ -0,0 +1,74 @@
+import threading
+from copy import copy
+from typing import Any, Callable, Hashable, Mapping
+
+from reportlab.platypus import Flowable
+
+
+def _fresh(value: Any) -> Any:
+    if isinstance(value, Flowable):
+        return copy(value)
+    if isinstance(value, list):
+        return [_fresh(item) for item in value]
+    return value
+
+
+class CompiledTemplate:
+    """
+    Partes estáticas de um tipo de documento (textos fixos, cabeçalhos de
+    tabela, imagens), montadas uma única vez por processo.
+
+    Os protótipos nunca entram em um documento: cada acesso devolve uma cópia
+    rasa, que compartilha o texto já interpretado (frags do Paragraph) e a
+    imagem já decodificada, mas tem o seu próprio estado de layout (wrap,
+    split). Assim o mesmo template pode ser usado por vários documentos, em
+    sequência ou em threads diferentes.
+    """
+
+    def __init__(self, prototypes: Mapping[str, Any]):
+        """
+        :param prototypes: Flowables (ou listas de flowables, como as linhas
+            de cabeçalho de uma tabela) por nome.
+        """
+        self._prototypes = dict(prototypes)
+
+    def __getitem__(self, name: str) -> Any:
+        return _fresh(self._prototypes[name])
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._prototypes
+
+    def names(self) -> tuple[str, ...]:
+        return tuple(self._prototypes)
+
+
+# Templates já compilados, por (classe do documento, chave do template)
+_compiled_templates: dict[tuple, CompiledTemplate] = {}
+_compiled_templates_lock = threading.Lock()
+
+
+def compiled_template(
+    key: Hashable, compile: Callable[[], Mapping[str, Any]]
+) -> CompiledTemplate:
+    """
+    Retorna o template da chave, compilando-o apenas na primeira vez.
+    :param key: Identifica o template (classe do documento + configurações).
+    :param compile: Monta os protótipos dos flowables estáticos.
+    """
+    template = _compiled_templates.get(key)
+    if template is None:
+        with _compiled_templates_lock:
+            template = _compiled_templates.get(key)
+            if template is None:
+                template = CompiledTemplate(compile())
+                _compiled_templates[key] = template
+    return template
+
+
+def clear_compiled_templates():
+    """
+    Descarta os templates compilados (ex.: após trocar a imagem de assinatura
+    ou o tema de fontes em tempo de execução).
+    """
+    with _compiled_templates_lock:
+        _compiled_templates.clear()
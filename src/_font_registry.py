@@ -0,0 +1,138 @@
+import os
+import re
+import threading
+from dataclasses import dataclass
+
+import reportlab
+from reportlab.lib.fonts import addMapping
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+REPORTLAB_FONTS_DIR = os.path.join(os.path.dirname(reportlab.__file__), "fonts")
+
+_FONT_FILE_REFERENCE = re.compile(rb"/FontFile[23]? (\d+) 0 R")
+
+
+@dataclass(frozen=True)
+class FontFamily:
+    """
+    Família TrueType: arquivos das variações normal, negrito, itálico e
+    negrito itálico. Os nomes registrados no ReportLab são <name>,
+    <name>-Bold, <name>-Italic e <name>-BoldItalic.
+    """
+
+    name: str
+    normal: str
+    bold: str
+    italic: str | None = None
+    bold_italic: str | None = None
+
+    @property
+    def font_name(self) -> str:
+        return self.name
+
+    @property
+    def font_bold_name(self) -> str:
+        return f"{self.name}-Bold"
+
+    def faces(self) -> dict[str, str]:
+        """
+        Arquivo de cada variação, pelo nome registrado no ReportLab.
+        """
+        faces = {self.font_name: self.normal, self.font_bold_name: self.bold}
+        if self.italic:
+            faces[f"{self.name}-Italic"] = self.italic
+        if self.bold_italic:
+            faces[f"{self.name}-BoldItalic"] = self.bold_italic
+        return faces
+
+
+# Bitstream Vera, distribuída com o ReportLab
+VERA = FontFamily(
+    name="Vera",
+    normal=os.path.join(REPORTLAB_FONTS_DIR, "Vera.ttf"),
+    bold=os.path.join(REPORTLAB_FONTS_DIR, "VeraBd.ttf"),
+    italic=os.path.join(REPORTLAB_FONTS_DIR, "VeraIt.ttf"),
+    bold_italic=os.path.join(REPORTLAB_FONTS_DIR, "VeraBI.ttf"),
+)
+
+
+class SharedTTFont(TTFont):
+    """
+    Fonte TrueType compartilhada pelos documentos do processo. O subset de
+    cada documento é montado lendo o arquivo com a posição de leitura da
+    face, então só um documento por vez pode montá-lo.
+    """
+
+    def __init__(self, name: str, filename: str, **kwargs):
+        super().__init__(name, filename, **kwargs)
+        self._subset_lock = threading.Lock()
+
+    def addObjects(self, doc):
+        with self._subset_lock:
+            super().addObjects(doc)
+
+
+def embedded_font_bytes(pdf: bytes) -> int:
+    """
+    Soma dos streams de fontes embutidas em um PDF (Type 1 em FontFile, TrueType
+    em FontFile2 e CFF em FontFile3).
+    """
+    total = 0
+    for object_id in set(_FONT_FILE_REFERENCE.findall(pdf)):
+        match = re.search(rb"\n" + object_id + rb" 0 obj\s*<<[^>]*?/Length (\d+)", pdf)
+        if match:
+            total += int(match.group(1))
+    return total
+
+
+class FontRegistry:
+    """
+    Registro das famílias TrueType usadas nos documentos.
+
+    Cada família é registrada uma única vez por processo (pdfmetrics e o
+    mapeamento de <b>/<i> dos parágrafos): o arquivo TTF é lido na primeira
+    vez que um documento usa a família. O ReportLab já embute em cada PDF
+    apenas os glifos usados pelo documento (subset).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._families: dict[str, FontFamily] = {}
+
+    def register(self, family: FontFamily) -> FontFamily:
+        """
+        Registra a família no ReportLab, apenas na primeira chamada.
+        :param family: Família TrueType.
+        """
+        if family.name in self._families:
+            return family
+        with self._lock:
+            if family.name in self._families:
+                return family
+            for name, path in family.faces().items():
+                pdfmetrics.registerFont(SharedTTFont(name, path))
+            # <b> e <i> dos parágrafos; sem itálico, usa a variação reta
+            italic = f"{family.name}-Italic" if family.italic else family.font_name
+            bold_italic = family.font_bold_name
+            if family.bold_italic:
+                bold_italic = f"{family.name}-BoldItalic"
+            addMapping(family.name, 0, 0, family.font_name)
+            addMapping(family.name, 1, 0, family.font_bold_name)
+            addMapping(family.name, 0, 1, italic)
+            addMapping(family.name, 1, 1, bold_italic)
+            self._families[family.name] = family
+        return family
+
+    def registered(self) -> tuple[str, ...]:
+        return tuple(self._families)
+
+    def stats(self) -> dict:
+        """
+        Famílias registradas no processo.
+        """
+        with self._lock:
+            return {"families": len(self._families)}
+
+
+font_registry = FontRegistry()
@@ -0,0 +1,236 @@
+import io
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Hashable
+
+from PIL import Image as PILImage
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen.canvas import Canvas
+
+from _image_pipeline import image_pipeline
+
+
+@dataclass(frozen=True)
+class ImagePlacement:
+    """
+    Geometria de exibição de uma imagem na página (em pontos).
+    """
+
+    x: float
+    y: float
+    width: float
+    height: float
+
+
+@dataclass(frozen=True)
+class ImageAsset:
+    """
+    Imagem já decodificada, identificada pelo caminho e pelo mtime do arquivo.
+    """
+
+    path: str
+    mtime_ns: int
+    reader: ImageReader = field(compare=False, repr=False)
+    pixel_width: int
+    pixel_height: int
+
+    @property
+    def key(self) -> tuple[str, int]:
+        return self.path, self.mtime_ns
+
+    @property
+    def aspect(self) -> float:
+        return self.pixel_height / float(self.pixel_width)
+
+
+def decode_image(reader: ImageReader) -> ImageReader:
+    """
+    Prepara a imagem para ser compartilhada entre documentos e threads. O
+    ImageReader decodifica os pixels (e a máscara de transparência) no
+    primeiro drawImage, e essa leitura preguiçosa do PIL falha quando duas
+    threads desenham a mesma imagem ao mesmo tempo: a decodificação é feita
+    agora.
+    :param reader: Imagem a ser compartilhada.
+    """
+    reader.getRGBData()
+    if reader._dataA is not None:
+        reader._dataA.getRGBData()
+    if reader.jpeg_fh() is not None:
+        # JPEG é embutido como está, lido do mesmo BytesIO (seek + read) por
+        # todos os documentos: cada leitura recebe o seu próprio stream
+        data = reader.fp.getvalue()
+        reader.jpeg_fh = lambda: io.BytesIO(data)
+    return reader
+
+
+def flatten_image(image: PILImage.Image) -> PILImage.Image:
+    """
+    Versão da imagem sem transparência e sem CMYK: a transparência é composta
+    sobre fundo branco (a cor da página), com a mesma aparência e sem máscara
+    (SMask) no PDF.
+    """
+    if image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info:
+        image = image.convert("RGBA")
+        background = PILImage.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    if image.mode == "CMYK":
+        return image.convert("RGB")
+    return image
+
+
+class ImageAssetCache:
+    """
+    Cache de imagens compartilhado pelo processo.
+
+    Cada imagem é decodificada uma única vez enquanto o arquivo não for
+    modificado (chave: caminho + mtime), antes de ser compartilhada. A
+    geometria de exibição também é calculada uma única vez por layout.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._assets: dict[str, ImageAsset] = {}
+        self._placements: dict[tuple, ImagePlacement] = {}
+        self._opaque: dict[str, ImageAsset] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, image_path: str) -> ImageAsset:
+        """
+        Retorna a imagem decodificada, lendo o arquivo apenas quando ele
+        ainda não está no cache ou foi modificado.
+        :param image_path: Caminho da imagem.
+        :return: Instância de ImageAsset.
+        """
+        try:
+            mtime_ns = os.stat(image_path).st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"A imagem não existe no caminho especificado: {image_path}"
+            ) from None
+
+        with self._lock:
+            asset = self._assets.get(image_path)
+            if asset is not None and asset.mtime_ns == mtime_ns:
+                self.hits += 1
+                return asset
+            self.misses += 1
+
+        reader = decode_image(ImageReader(image_path))
+        pixel_width, pixel_height = reader.getSize()
+        asset = ImageAsset(
+            path=image_path,
+            mtime_ns=mtime_ns,
+            reader=reader,
+            pixel_width=pixel_width,
+            pixel_height=pixel_height,
+        )
+        with self._lock:
+            self._assets[image_path] = asset
+        return asset
+
+    def opaque(self, image_path: str) -> ImageAsset:
+        """
+        Retorna a imagem sem transparência (ver flatten_image), decodificada
+        uma única vez por versão do arquivo. Imagens opacas em RGB ou cinza
+        são as mesmas de get().
+        :param image_path: Caminho da imagem.
+        """
+        asset = self.get(image_path)
+        with self._lock:
+            opaque = self._opaque.get(image_path)
+        if opaque is not None and opaque.mtime_ns == asset.mtime_ns:
+            return opaque
+
+        with PILImage.open(image_path) as source:
+            source.load()
+            flattened = flatten_image(source)
+        if flattened is source:
+            opaque = asset
+        else:
+            opaque = ImageAsset(
+                path=image_path,
+                mtime_ns=asset.mtime_ns,
+                reader=decode_image(ImageReader(flattened)),
+                pixel_width=asset.pixel_width,
+                pixel_height=asset.pixel_height,
+            )
+        with self._lock:
+            self._opaque[image_path] = opaque
+        return opaque
+
+    def placement(
+        self,
+        asset: ImageAsset,
+        layout_key: Hashable,
+        layout: Callable[[ImageAsset], ImagePlacement],
+    ) -> ImagePlacement:
+        """
+        Retorna a geometria de exibição da imagem para um layout, calculando-a
+        apenas na primeira vez.
+        :param asset: Imagem decodificada.
+        :param layout_key: Identifica o layout (tipo de área e suas dimensões).
+        :param layout: Função que calcula a geometria a partir da imagem.
+        """
+        key = (asset.key, layout_key)
+        with self._lock:
+            placement = self._placements.get(key)
+        if placement is None:
+            placement = layout(asset)
+            with self._lock:
+                self._placements[key] = placement
+        return placement
+
+    def draw(
+        self,
+        canvas: Canvas,
+        image_path: str,
+        layout_key: Hashable,
+        layout: Callable[[ImageAsset], ImagePlacement],
+    ):
+        """
+        Desenha a imagem com a geometria em cache, usando a versão preparada
+        para a área de exibição (ver ImagePipeline). Para desenhar a mesma
+        imagem em várias páginas sem recodificá-la, desenhe-a dentro de um
+        form XObject (ver _PDFBase.PageBase.add_header_and_footer).
+        :param canvas: Canvas do documento.
+        :param image_path: Caminho da imagem.
+        :param layout_key: Identifica o layout (tipo de área e suas dimensões).
+        :param layout: Função que calcula a geometria a partir da imagem.
+        """
+        asset = self.get(image_path)
+        placement = self.placement(asset, layout_key, layout)
+        prepared = image_pipeline.prepare(image_path, placement.width, placement.height)
+        canvas.drawImage(
+            image=self.get(prepared.path).reader,
+            x=placement.x,
+            y=placement.y,
+            width=placement.width,
+            height=placement.height,
+            preserveAspectRatio=True,
+            mask="auto",
+        )
+
+    def stats(self) -> dict:
+        """
+        Contadores do cache, no formato esperado por coletores de métricas.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._assets),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._assets.clear()
+            self._placements.clear()
+            self._opaque.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+image_asset_cache = ImageAssetCache()
@@ -0,0 +1,334 @@
+import hashlib
+import io
+import json
+import math
+import os
+import tempfile
+import threading
+import zlib
+from dataclasses import asdict, dataclass
+from typing import Iterable
+
+from PIL import Image as PILImage
+
+from _output_cache import asset_digest, private_directory, user_cache_dir
+
+# Resolução das imagens preparadas, na área em que são exibidas
+DEFAULT_DPI = 200
+DEFAULT_JPEG_QUALITY = 90
+DEFAULT_CACHE_DIR = user_cache_dir("images")
+
+# JPEG só substitui Flate (sem perdas) quando reduz o tamanho pelo menos à
+# metade: em logotipos e textos a compressão com perdas gera artefatos visíveis
+JPEG_MAX_RATIO = 0.5
+
+# Incrementar ao alterar o algoritmo, para invalidar as imagens em disco
+PIPELINE_VERSION = 2
+
+ENCODING_ORIGINAL = "original"
+ENCODING_FLATE = "flate"
+ENCODING_JPEG = "jpeg"
+
+_JPEG_FORMATS = ("JPEG", "MPO")
+
+# Extensão do arquivo preparado, pela codificação
+_SUFFIXES = {ENCODING_FLATE: ".png", ENCODING_JPEG: ".jpg"}
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    """
+    Imagem pronta para ser embutida no PDF e a economia em relação à original.
+    Os tamanhos são os bytes do stream de imagem no PDF (JPEG embutido como
+    está; demais formatos como pixels comprimidos com Flate, mais a máscara
+    de transparência, se houver).
+    """
+
+    source: str
+    path: str
+    pixel_width: int
+    pixel_height: int
+    encoding: str
+    source_bytes: int
+    prepared_bytes: int
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.source_bytes - self.prepared_bytes
+
+
+def _embeds_alpha(image: PILImage.Image) -> bool:
+    # Com mask="auto", o ReportLab grava a máscara de qualquer imagem com canal
+    # alfa, mesmo que ela seja toda opaca
+    return image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+
+
+def _has_alpha(image: PILImage.Image) -> bool:
+    if image.mode in ("RGBA", "LA", "PA"):
+        return image.getchannel("A").getextrema() != (255, 255)
+    return "transparency" in image.info
+
+
+def embedded_size(image: PILImage.Image) -> int:
+    """
+    Tamanho aproximado da imagem no PDF quando o ReportLab a comprime com
+    Flate (pixels RGB e, se houver transparência, a máscara).
+    """
+    size = len(zlib.compress(image.convert("RGB").tobytes()))
+    if _embeds_alpha(image):
+        size += len(zlib.compress(image.convert("RGBA").getchannel("A").tobytes()))
+    return size
+
+
+def _file_embedded_size(path: str, image: PILImage.Image) -> int:
+    if image.format in _JPEG_FORMATS:
+        return os.path.getsize(path)
+    return embedded_size(image)
+
+
+class ImagePipeline:
+    """
+    Prepara as imagens fixas dos documentos (cabeçalho, rodapé, assinatura)
+    para o tamanho em que são exibidas.
+
+    Cada imagem é reamostrada para a resolução alvo (dpi) da área de exibição,
+    a transparência é descartada quando a máscara é toda opaca e a imagem é
+    gravada com a codificação que resulta no menor PDF: Flate (PNG, sem
+    perdas) ou JPEG (embutido como está pelo ReportLab). As imagens preparadas
+    ficam em um cache em disco do usuário, compartilhado entre processos,
+    identificado pelo conteúdo da original, pelo tamanho alvo e pelas
+    configurações. Se o diretório não for privado (dono e modo 0700), o cache
+    fica em um diretório temporário próprio do processo.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        dpi: int = DEFAULT_DPI,
+        jpeg_quality: int = DEFAULT_JPEG_QUALITY,
+        enabled: bool = True,
+    ):
+        """
+        :param cache_dir: Diretório das imagens preparadas (padrão: cache do
+            usuário, ver user_cache_dir).
+        :param dpi: Resolução alvo na área de exibição.
+        :param jpeg_quality: Qualidade das imagens recomprimidas em JPEG.
+        :param enabled: Desligado, as imagens originais são usadas.
+        """
+        self.cache_dir = cache_dir
+        self.dpi = dpi
+        self.jpeg_quality = jpeg_quality
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._prepared: dict[tuple, PreparedImage] = {}
+        self._cache_dir_checked = False
+
+    def settings(self) -> tuple:
+        """
+        Configurações que alteram as imagens embutidas (entram na chave do
+        cache de PDFs).
+        """
+        return PIPELINE_VERSION, self.enabled, self.dpi, self.jpeg_quality
+
+    def target_size(self, width: float, height: float) -> tuple[int, int]:
+        """
+        Tamanho em pixels de uma área de exibição em pontos, na resolução alvo.
+        """
+        return (
+            math.ceil(width / 72.0 * self.dpi),
+            math.ceil(height / 72.0 * self.dpi),
+        )
+
+    def prepare(self, image_path: str, width: float, height: float) -> PreparedImage:
+        """
+        Retorna a imagem preparada para uma área de exibição, processando-a
+        apenas quando ainda não está no cache (memória ou disco).
+        :param image_path: Caminho da imagem original.
+        :param width: Largura de exibição em pontos.
+        :param height: Altura de exibição em pontos.
+        """
+        if not self.enabled:
+            return PreparedImage(
+                source=image_path,
+                path=image_path,
+                pixel_width=0,
+                pixel_height=0,
+                encoding=ENCODING_ORIGINAL,
+                source_bytes=0,
+                prepared_bytes=0,
+            )
+
+        digest = asset_digest(image_path)
+        target = self.target_size(width, height)
+        key = (digest, target, self.settings())
+        prepared = self._prepared.get(key)
+        if prepared is None:
+            name = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:32]
+            self._check_cache_dir()
+            prepared = self._load(image_path, name)
+            if prepared is None:
+                prepared = self._process(image_path, name, target)
+            with self._lock:
+                self._prepared[key] = prepared
+        return prepared
+
+    def _check_cache_dir(self):
+        if self._cache_dir_checked:
+            return
+        with self._lock:
+            if not self._cache_dir_checked:
+                if not private_directory(self.cache_dir):
+                    # Outro usuário poderia trocar as imagens dos documentos
+                    self.cache_dir = tempfile.mkdtemp(prefix="report-lab-learning-")
+                self._cache_dir_checked = True
+
+    def _path(self, name: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, f"{name}{suffix}")
+
+    def _load(self, image_path: str, name: str) -> PreparedImage | None:
+        # O caminho da imagem vem do nome, nunca dos metadados; metadados
+        # ilegíveis ou incompletos são tratados como ausência no cache
+        try:
+            with open(self._path(name, ".json"), encoding="utf-8") as file:
+                metadata = json.load(file)
+            encoding = metadata["encoding"]
+            if encoding == ENCODING_ORIGINAL:
+                path = image_path
+            else:
+                path = self._path(name, _SUFFIXES[encoding])
+            prepared = PreparedImage(
+                source=image_path,
+                path=path,
+                pixel_width=int(metadata["pixel_width"]),
+                pixel_height=int(metadata["pixel_height"]),
+                encoding=encoding,
+                source_bytes=int(metadata["source_bytes"]),
+                prepared_bytes=int(metadata["prepared_bytes"]),
+            )
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+        if not os.path.isfile(prepared.path):
+            return None
+        return prepared
+
+    def _write(self, name: str, suffix: str, data: bytes) -> str:
+        path = self._path(name, suffix)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        return path
+
+    def _process(
+        self, image_path: str, name: str, target: tuple[int, int]
+    ) -> PreparedImage:
+        with PILImage.open(image_path) as source:
+            source.load()
+        source_bytes = _file_embedded_size(image_path, source)
+        size = (min(source.width, target[0]), min(source.height, target[1]))
+        resized = size != source.size
+
+        if not resized and source.format in _JPEG_FORMATS:
+            # Reamostrar não reduz a imagem e recomprimir só perderia qualidade
+            prepared = PreparedImage(
+                source=image_path,
+                path=image_path,
+                pixel_width=source.width,
+                pixel_height=source.height,
+                encoding=ENCODING_ORIGINAL,
+                source_bytes=source_bytes,
+                prepared_bytes=source_bytes,
+            )
+        else:
+            image = source
+            if _has_alpha(image):
+                # Reamostra com alfa pré-multiplicado para não escurecer as bordas
+                image = image.convert("RGBa")
+                if resized:
+                    image = image.resize(size, PILImage.Resampling.LANCZOS)
+                image = image.convert("RGBA")
+            else:
+                image = image.convert("RGB")
+                if resized:
+                    image = image.resize(size, PILImage.Resampling.LANCZOS)
+
+            png = io.BytesIO()
+            image.save(png, "PNG", optimize=True)
+            encoding, data = ENCODING_FLATE, png.getvalue()
+            prepared_bytes = embedded_size(image)
+            if image.mode == "RGB" and image.getcolors(256) is None:
+                jpeg = io.BytesIO()
+                image.save(jpeg, "JPEG", quality=self.jpeg_quality, optimize=True)
+                if jpeg.tell() <= prepared_bytes * JPEG_MAX_RATIO:
+                    encoding, data = ENCODING_JPEG, jpeg.getvalue()
+                    prepared_bytes = jpeg.tell()
+
+            if prepared_bytes >= source_bytes:
+                # Mesmo reamostrada a imagem não ficou menor: a original não
+                # aumenta o PDF e não perde qualidade
+                image, encoding, path = source, ENCODING_ORIGINAL, image_path
+                prepared_bytes = source_bytes
+            else:
+                path = self._write(name, _SUFFIXES[encoding], data)
+            prepared = PreparedImage(
+                source=image_path,
+                path=path,
+                pixel_width=image.width,
+                pixel_height=image.height,
+                encoding=encoding,
+                source_bytes=source_bytes,
+                prepared_bytes=prepared_bytes,
+            )
+
+        metadata = {
+            field: value
+            for field, value in asdict(prepared).items()
+            if field not in ("source", "path")
+        }
+        metadata = json.dumps(metadata).encode("utf-8")
+        self._write(name, ".json", metadata)
+        return prepared
+
+    def stats(self) -> list[dict]:
+        """
+        Imagens preparadas neste processo, com os bytes economizados por
+        imagem embutida.
+        """
+        with self._lock:
+            prepared = list(self._prepared.values())
+        return [{**asdict(item), "saved_bytes": item.saved_bytes} for item in prepared]
+
+    def document_stats(self, image_paths: Iterable[str]) -> dict:
+        """
+        Bytes economizados em um documento: soma das imagens preparadas neste
+        processo a partir das imagens que ele embute (cada imagem entra uma
+        única vez no PDF, mesmo desenhada em todas as páginas).
+        :param image_paths: Imagens originais usadas pelo documento.
+        """
+        sources = set(image_paths)
+        with self._lock:
+            prepared = [
+                item for item in self._prepared.values() if item.source in sources
+            ]
+        source_bytes = sum(item.source_bytes for item in prepared)
+        prepared_bytes = sum(item.prepared_bytes for item in prepared)
+        return {
+            "images": len(prepared),
+            "source_bytes": source_bytes,
+            "prepared_bytes": prepared_bytes,
+            "saved_bytes": source_bytes - prepared_bytes,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._prepared.clear()
+
+
+image_pipeline = ImagePipeline()
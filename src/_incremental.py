@@ -0,0 +1,463 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import types
+import zlib
+from dataclasses import dataclass
+from typing import Any, BinaryIO
+
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import ActionFlowable, Flowable, PageBreak
+
+from _results_table import ResultsTable
+
+# Versão do formato do sidecar: incremente ao mudar os campos gravados
+SIDECAR_VERSION = 1
+
+# Sidecar padrão: <arquivo do PDF> + sufixo
+SIDECAR_SUFFIX = ".layout.json"
+
+# Campos de cada flowable e de cada página no sidecar
+_FLOWABLE_KEYS = frozenset({"digest", "rows"})
+_PAGE_KEYS = frozenset(
+    {
+        "first",
+        "first_row",
+        "continued",
+        "last",
+        "last_row",
+        "fonts",
+        "replayable",
+        "pdf_version",
+        "ops",
+    }
+)
+
+# Índice do flowable em content_to_pdf, herdado pelas partes de um split
+_TAG = "_layout_index"
+
+# Atributos de layout (ou do próprio registro), fora da impressão digital.
+# Os frags do Paragraph são derivados do texto e do estilo e ganham
+# atributos durante o wrap (_fkind), então ficam de fora
+_LAYOUT_ATTRIBUTES = frozenset(
+    {_TAG, "canv", "_frame", "_postponed", "blPara", "frags", "_fkind"}
+)
+
+# Atributos da ResultsTable que não definem o layout: as linhas têm
+# impressões digitais próprias e start/stop mudam com o número de linhas
+_RESULTS_TABLE_ATTRIBUTES = frozenset({"rows", "start", "stop", "_header_height"})
+
+
+@dataclass(frozen=True)
+class IncrementalResult:
+    """
+    Resultado de _PDFBase.generate_incremental.
+    """
+
+    pages: int  # Total de páginas do PDF gerado
+    reused_pages: int  # Páginas copiadas da geração anterior, sem layout
+
+
+def _token(value: Any, memo: dict[int, bytes]) -> bytes:
+    """
+    Representação estável de um valor (igual entre processos para os mesmos
+    dados). Objetos sem representação conhecida recebem um token com o id, que
+    muda a cada geração: na dúvida, o flowable é tratado como alterado.
+    """
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return repr(value).encode("utf-8", "surrogatepass")
+    if isinstance(value, (list, tuple)):
+        items = b",".join(_token(item, memo) for item in value)
+        return type(value).__name__.encode("ascii") + b"[" + items + b"]"
+    if isinstance(value, dict):
+        items = sorted(
+            (_token(key, memo), _token(item, memo)) for key, item in value.items()
+        )
+        return b"{" + b",".join(key + b":" + item for key, item in items) + b"}"
+
+    key = id(value)
+    token = memo.get(key)
+    if token is not None:
+        return token
+    # Protege contra referências circulares
+    memo[key] = b"<cycle>"
+    if isinstance(value, ImageReader):
+        # O conteúdo das imagens entra na chave do layout (asset_paths)
+        token = b"ImageReader:" + repr(value.fileName).encode("utf-8")
+    elif isinstance(value, (type, types.FunctionType)):
+        token = f"{value.__module__}.{value.__qualname__}".encode("utf-8")
+    elif hasattr(value, "__dict__"):
+        digest = hashlib.blake2b(digest_size=16)
+        cls = type(value)
+        digest.update(f"{cls.__module__}.{cls.__qualname__}".encode("utf-8"))
+        for name, item in sorted(vars(value).items()):
+            if name not in _LAYOUT_ATTRIBUTES:
+                digest.update(name.encode("utf-8"))
+                digest.update(_token(item, memo))
+        token = digest.digest()
+    else:
+        token = f"{type(value).__qualname__}@{key}".encode("utf-8")
+    memo[key] = token
+    return token
+
+
+def _row_digest(row) -> str:
+    return hashlib.blake2b("\x1f".join(row).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def fingerprints(content: list) -> list[dict]:
+    """
+    Impressão digital de cada flowable de content_to_pdf, calculada antes do
+    layout. Nas ResultsTable cada linha de dados tem a sua, para que uma
+    alteração no fim de uma tabela longa não invalide as páginas do início.
+    """
+    memo: dict[int, bytes] = {}
+    result = []
+    for flowable in content:
+        if isinstance(flowable, ResultsTable):
+            state = {
+                name: item
+                for name, item in vars(flowable).items()
+                if name not in _RESULTS_TABLE_ATTRIBUTES
+            }
+            token = b"ResultsTable" + _token(state, memo)
+            rows = [
+                _row_digest(row)
+                for row in flowable.rows[flowable.start : flowable.stop]
+            ]
+        else:
+            token, rows = _token(flowable, memo), None
+        digest = hashlib.blake2b(token, digest_size=16).hexdigest()
+        result.append({"digest": digest, "rows": rows})
+    return result
+
+
+def _encode_ops(code: list[str]) -> str:
+    data = zlib.compress(json.dumps(code).encode("utf-8"), 6)
+    return base64.b64encode(data).decode("ascii")
+
+
+def _decode_ops(data: str) -> list[str]:
+    return json.loads(zlib.decompress(base64.b64decode(data)))
+
+
+class _ReplayPage(Flowable):
+    """
+    Flowable sem tamanho que ocupa uma página reaproveitada: o conteúdo da
+    página é trocado pelas operações gravadas ao final da página.
+    """
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        pass
+
+
+def _page_resources(canvas) -> tuple[int, ...]:
+    return (
+        len(canvas._formsinuse),
+        len(canvas._annotationrefs),
+        len(canvas._colorsUsed),
+        len(canvas._shadingUsed),
+        len(canvas._extgstate._c),
+    )
+
+
+class _LayoutRecorder:
+    """
+    Registra, durante o build, quais flowables foram desenhados em cada
+    página e as operações de desenho de cada uma. As páginas em replay
+    recebem as operações gravadas na geração anterior.
+    """
+
+    def __init__(self, doc, replay: dict[int, dict]):
+        """
+        :param doc: Documento ainda não gerado (SimpleDocTemplate).
+        :param replay: Registro anterior de cada página reaproveitada, pelo
+            número da página.
+        """
+        self.doc = doc
+        self.pages: list[dict] = []
+        self._replay = replay
+        self._tag: int | None = None
+        self._last_tag: int | None = None
+        self._page: dict = {}
+        self._fonts = 0
+        self._resources: tuple = ()
+
+        self._handle_flowable = doc.handle_flowable
+        self._before_page = doc.beforePage
+        self._after_flowable = doc.afterFlowable
+        self._after_page = doc.afterPage
+        doc.handle_flowable = self.handle_flowable
+        doc.beforePage = self.before_page
+        doc.afterFlowable = self.after_flowable
+        doc.afterPage = self.after_page
+
+    def handle_flowable(self, flowables: list):
+        count = len(flowables)
+        previous = self._tag
+        tag = self._tag = getattr(flowables[0], _TAG, None) if flowables else None
+        try:
+            self._handle_flowable(flowables)
+        finally:
+            self._tag = previous
+        if tag is None:
+            return
+        # Partes de um split devolvidas à lista herdam o índice do original
+        for flowable in flowables[: len(flowables) - count + 1]:
+            if not isinstance(flowable, ActionFlowable) and not hasattr(flowable, _TAG):
+                setattr(flowable, _TAG, tag)
+
+    def before_page(self):
+        self._before_page()
+        self._page = {
+            "first": None,
+            "first_row": None,
+            "continued": False,
+            "last": None,
+            "last_row": None,
+        }
+        # Recursos da página já usados pela decoração, antes do conteúdo
+        self._resources = _page_resources(self.doc.canv)
+
+    def after_flowable(self, flowable: Flowable):
+        self._after_flowable(flowable)
+        if isinstance(flowable, (ActionFlowable, PageBreak)):
+            return
+        tag = getattr(flowable, _TAG, self._tag)
+        if tag is None:
+            return
+        first_row = last_row = None
+        if isinstance(flowable, ResultsTable):
+            first_row, last_row = flowable.start, flowable.stop - 1
+        page = self._page
+        if page["first"] is None:
+            page["first"] = tag
+            page["first_row"] = first_row
+            page["continued"] = tag == self._last_tag
+        page["last"] = tag
+        page["last_row"] = last_row
+        self._last_tag = tag
+
+    def after_page(self):
+        self._after_page()
+        canvas = self.doc.canv
+        pdf_doc = canvas._doc
+        previous = self._replay.get(self.doc.page)
+        if previous is not None:
+            # Mesma ordem de registro das fontes: mesmos objetos no PDF
+            for font_name in previous["fonts"]:
+                pdf_doc.getInternalFontName(font_name)
+            canvas._code[:] = _decode_ops(previous["ops"])
+            pdf_doc._pdfVersion = max(
+                pdf_doc._pdfVersion, tuple(previous["pdf_version"])
+            )
+            page = dict(previous)
+            if page["last"] is not None:
+                self._last_tag = page["last"]
+        else:
+            font_names = list(pdf_doc.fontMapping)
+            page = {
+                **self._page,
+                "fonts": font_names[self._fonts :],
+                # Páginas cujo conteúdo usa recursos próprios (imagens,
+                # transparência, anotações) ou fontes TrueType (subsets
+                # acumulados ao longo do documento) não podem ser copiadas
+                "replayable": _page_resources(canvas) == self._resources
+                and not pdf_doc.delayedFonts,
+                # Versão mínima do PDF exigida até aqui (ex.: 1.4 ao definir
+                # a opacidade das cores)
+                "pdf_version": pdf_doc._pdfVersion,
+                "ops": _encode_ops(canvas._code),
+            }
+        self._fonts = len(pdf_doc.fontMapping)
+        self.pages.append(page)
+
+
+def _has_keys(items: Any, keys: frozenset[str]) -> bool:
+    return isinstance(items, list) and all(
+        isinstance(item, dict) and keys <= item.keys() for item in items
+    )
+
+
+def load_sidecar(path: str) -> dict | None:
+    """
+    Lê o sidecar de layout de uma geração anterior; None se não existe, não
+    pode ser lido, é de outra versão do formato ou não tem a estrutura
+    esperada (o documento é então gerado inteiro).
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        # ValueError: JSON inválido ou arquivo que não é UTF-8
+        return None
+    if not isinstance(data, dict) or data.get("version") != SIDECAR_VERSION:
+        return None
+    if not isinstance(data.get("layout_key"), str):
+        return None
+    if not _has_keys(data.get("flowables"), _FLOWABLE_KEYS):
+        return None
+    if not _has_keys(data.get("pages"), _PAGE_KEYS):
+        return None
+    return data
+
+
+def save_sidecar(path: str, data: dict):
+    """
+    Grava o sidecar de forma atômica (arquivo temporário + os.replace).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(data, file, separators=(",", ":"))
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def _first_change(previous: list[dict], current: list[dict]) -> tuple[int, int]:
+    """
+    Primeira posição (índice do flowable, linha de dados) que difere entre
+    as duas gerações.
+    """
+    for index, (old, new) in enumerate(zip(previous, current)):
+        if old["digest"] != new["digest"]:
+            return index, 0
+        if old["rows"] != new["rows"]:
+            old_rows, new_rows = old["rows"], new["rows"]
+            row = next(
+                (row for row, (a, b) in enumerate(zip(old_rows, new_rows)) if a != b),
+                min(len(old_rows), len(new_rows)),
+            )
+            return index, row
+    return min(len(previous), len(current)), 0
+
+
+def _first_page(pages: list[dict], tag: int, row: int | None) -> int:
+    """
+    Primeira página que desenha o flowable tag (a partir da linha row, nas
+    ResultsTable) ou algum flowable posterior.
+    """
+    for index, page in enumerate(pages):
+        last = page["last"]
+        if last is None:
+            continue
+        if last > tag:
+            return index
+        if last == tag and (
+            row is None or page["last_row"] is None or page["last_row"] >= row
+        ):
+            return index
+    return 0
+
+
+def _resumable(pages: list[dict], index: int, content: list) -> bool:
+    """
+    O layout pode recomeçar do início da página: a página começa em um
+    flowable inteiro ou em um bloco de ResultsTable, e nenhum flowable de
+    ação (troca de template...) ficou entre as duas páginas.
+    """
+    page = pages[index]
+    first = page["first"]
+    if first is None or first >= len(content):
+        return False
+    if page["continued"] and page["first_row"] is None:
+        return False
+    previous = pages[index - 1]["last"]
+    if previous is None:
+        return False
+    return not any(
+        isinstance(flowable, ActionFlowable) and not isinstance(flowable, PageBreak)
+        for flowable in content[previous + 1 : first]
+    )
+
+
+def _resume_page(previous: dict, current: list[dict], content: list) -> int:
+    """
+    Índice da primeira página a ser refeita; as anteriores são copiadas.
+    """
+    pages = previous["pages"]
+    old = previous["flowables"]
+    tag, row = _first_change(old, current)
+    # Flowables presos ao seguinte (keepWithNext) mudam de página junto
+    while tag > 0 and content[tag - 1].getKeepWithNext():
+        tag, row = tag - 1, 0
+    if row:
+        # Linhas de altura fixa: a alteração não muda a quebra das linhas
+        # anteriores, mas a linha anterior pode passar a ser a última
+        page = _first_page(pages, tag, row - 1)
+    elif tag == 0:
+        return 0
+    else:
+        # Um flowable alterado pode caber na página onde o anterior termina
+        rows = old[tag - 1]["rows"]
+        page = _first_page(pages, tag - 1, len(rows) - 1 if rows else None)
+
+    for index in range(page):
+        if not pages[index]["replayable"]:
+            page = index
+            break
+    while page > 0 and not _resumable(pages, page, content):
+        page -= 1
+    return page
+
+
+def render_incremental(
+    document,
+    output: str | BinaryIO,
+    sidecar: str,
+    reproducible: bool = False,
+) -> IncrementalResult:
+    """
+    Gera o PDF do documento reaproveitando as páginas da geração anterior
+    (ver _PDFBase.generate_incremental) e grava o sidecar desta geração.
+    """
+    content = list(document.content_to_pdf())
+    current = fingerprints(content)
+    layout_key = document.layout_key()
+    for index, flowable in enumerate(content):
+        setattr(flowable, _TAG, index)
+
+    previous = load_sidecar(sidecar)
+    resume = 0
+    if previous is not None and previous["layout_key"] == layout_key:
+        resume = _resume_page(previous, current, content)
+
+    flowables = content
+    replay = {}
+    if resume:
+        pages = previous["pages"]
+        replay = {number: page for number, page in enumerate(pages[:resume], 1)}
+        page = pages[resume]
+        first = page["first"]
+        flowables = content[first:]
+        if page["continued"]:
+            # Recomeça a tabela a partir do primeiro bloco da página
+            table = content[first]._slice(page["first_row"], content[first].stop)
+            setattr(table, _TAG, first)
+            flowables = [table, *content[first + 1 :]]
+        flowables = [
+            item for _ in range(resume) for item in (_ReplayPage(), PageBreak())
+        ] + flowables
+
+    doc = document.base_template_pdf(output, reproducible)
+    recorder = _LayoutRecorder(doc, replay)
+    document.build_pdf(doc, flowables)
+
+    save_sidecar(
+        sidecar,
+        {
+            "version": SIDECAR_VERSION,
+            "layout_key": layout_key,
+            "flowables": current,
+            "pages": recorder.pages,
+        },
+    )
+    return IncrementalResult(pages=len(recorder.pages), reused_pages=resume)
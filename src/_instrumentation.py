@@ -0,0 +1,289 @@
+import logging
+import os
+import random
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterable, Iterator
+
+from reportlab.pdfgen.canvas import Canvas
+
+if TYPE_CHECKING:
+    # pstats é importado apenas quando um perfil é coletado (~50 ms)
+    import pstats
+
+logger = logging.getLogger(__name__)
+
+# Fases medidas em cada documento
+PHASE_CONTENT = "content"  # content_to_pdf, inclusive os flowables pedidos no build
+PHASE_LAYOUT = "layout"  # SimpleDocTemplate.build, sem decoração e escrita
+PHASE_DECORATION = "decoration"  # add_header_and_footer (cabeçalho e rodapé)
+PHASE_WRITE = "write"  # serialização e escrita do PDF (canvas.save)
+
+
+@dataclass
+class PhaseTiming:
+    """
+    Tempo de parede e de CPU (da thread que gera o documento), em segundos.
+    """
+
+    wall: float = 0.0
+    cpu: float = 0.0
+
+
+@dataclass(frozen=True)
+class ProfilingOptions:
+    """
+    Captura opcional de perfil por documento.
+    :param cprofile: Coleta um cProfile da geração.
+    :param tracemalloc: Coleta o pico e um snapshot de alocações.
+    :param sample_rate: Fração dos documentos perfilados (0.0 a 1.0).
+    """
+
+    cprofile: bool = False
+    tracemalloc: bool = False
+    sample_rate: float = 1.0
+
+    def sampled(self) -> bool:
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+
+@dataclass
+class RenderMetrics:
+    """
+    Métricas de geração de um documento, entregues aos hooks.
+    """
+
+    document: str
+    phases: dict[str, PhaseTiming] = field(default_factory=dict)
+    page_count: int = 0
+    flowable_count: int = 0
+    bytes_written: int = 0
+    error: str | None = None
+    profile: "pstats.Stats | None" = None
+    tracemalloc_peak: int | None = None
+    tracemalloc_snapshot: tracemalloc.Snapshot | None = None
+
+    @property
+    def wall(self) -> float:
+        return sum(timing.wall for timing in self.phases.values())
+
+    @property
+    def cpu(self) -> float:
+        return sum(timing.cpu for timing in self.phases.values())
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Acumula o tempo do bloco na fase informada.
+        """
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            timing = self.phases.setdefault(name, PhaseTiming())
+            timing.wall += time.perf_counter() - wall
+            timing.cpu += time.thread_time() - cpu
+
+
+RenderHook = Callable[[RenderMetrics], None]
+
+_hooks_lock = threading.Lock()
+_render_hooks: tuple[RenderHook, ...] = ()
+_default_profiling: ProfilingOptions | None = None
+
+
+def register_render_hook(hook: RenderHook):
+    """
+    Registra um hook chamado ao final de cada documento gerado no processo.
+    """
+    global _render_hooks
+    with _hooks_lock:
+        _render_hooks = (*_render_hooks, hook)
+
+
+def unregister_render_hook(hook: RenderHook):
+    global _render_hooks
+    with _hooks_lock:
+        _render_hooks = tuple(item for item in _render_hooks if item is not hook)
+
+
+def registered_render_hooks() -> tuple[RenderHook, ...]:
+    return _render_hooks
+
+
+def set_default_profiling(options: ProfilingOptions | None):
+    """
+    Define a captura de perfil usada quando generate_pdf não recebe uma.
+    """
+    global _default_profiling
+    _default_profiling = options
+
+
+def default_profiling() -> ProfilingOptions | None:
+    return _default_profiling
+
+
+class _CountingWriter:
+    """
+    Repassa as escritas para o stream de destino contando os bytes.
+    """
+
+    def __init__(self, target: BinaryIO):
+        self.target = target
+        self.count = 0
+
+    def write(self, data) -> int:
+        self.count += len(data)
+        return self.target.write(data)
+
+
+@contextmanager
+def _profiling(metrics: RenderMetrics, options: ProfilingOptions | None):
+    if options is None or not (options.cprofile or options.tracemalloc):
+        yield
+        return
+    if not options.sampled():
+        yield
+        return
+
+    profiler = None
+    if options.cprofile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Outro profiler já está ativo (ex.: outra thread perfilando)
+            profiler = None
+    started_tracemalloc = options.tracemalloc and not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start()
+    elif options.tracemalloc:
+        tracemalloc.reset_peak()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            import pstats
+
+            profiler.disable()
+            metrics.profile = pstats.Stats(profiler)
+        if options.tracemalloc:
+            metrics.tracemalloc_peak = tracemalloc.get_traced_memory()[1]
+            metrics.tracemalloc_snapshot = tracemalloc.take_snapshot()
+            if started_tracemalloc:
+                tracemalloc.stop()
+
+
+def _notify(hooks: Iterable[RenderHook], metrics: RenderMetrics):
+    for hook in hooks:
+        try:
+            hook(metrics)
+        except Exception:
+            # Um hook de métricas não pode derrubar a geração do documento
+            logger.exception("Erro no hook de renderização %r", hook)
+
+
+_END = object()
+
+
+def _timed_content(
+    metrics: RenderMetrics, content: Iterable, nested: PhaseTiming
+) -> Iterator:
+    """
+    Repassa os flowables contando-os e somando em nested o tempo gasto para
+    produzir cada um (content_to_pdf como gerador roda dentro do build).
+    """
+    iterator = iter(content)
+    while True:
+        wall, cpu = time.perf_counter(), time.thread_time()
+        flowable = next(iterator, _END)
+        nested.wall += time.perf_counter() - wall
+        nested.cpu += time.thread_time() - cpu
+        if flowable is _END:
+            return
+        metrics.flowable_count += 1
+        yield flowable
+
+
+def render_instrumented(
+    document,
+    output: str | BinaryIO,
+    hooks: Iterable[RenderHook],
+    profiling: ProfilingOptions | None,
+    reproducible: bool = False,
+    archival: bool = False,
+) -> RenderMetrics:
+    """
+    Gera o documento medindo cada fase e entrega as métricas aos hooks.
+    :param document: Instância de _PDFBase.
+    :param output: Caminho do arquivo ou stream binário gravável.
+    :param hooks: Hooks que recebem as métricas (também em caso de erro).
+    :param profiling: Captura de perfil opcional.
+    :param reproducible: Data de criação e ID do documento fixos.
+    :param archival: Gera PDF/A (ver _PDFBase.generate_pdf).
+    """
+    metrics = RenderMetrics(document=type(document).__name__)
+    target = output if isinstance(output, str) else _CountingWriter(output)
+
+    def add_header_and_footer(canvas: Canvas, doc=None):
+        with metrics.phase(PHASE_DECORATION):
+            document.PageBase.add_header_and_footer(canvas, doc)
+
+    def make_canvas(*args, **kwargs) -> Canvas:
+        canvas = canvas_factory(*args, **kwargs)
+        save = canvas.save
+
+        def timed_save():
+            with metrics.phase(PHASE_WRITE):
+                save()
+
+        canvas.save = timed_save
+        return canvas
+
+    canvas_factory = document.canvasmaker(archival)
+    lazy_content = PhaseTiming()
+    try:
+        with _profiling(metrics, profiling):
+            with metrics.phase(PHASE_CONTENT):
+                doc = document.base_template_pdf(target, reproducible, archival)
+                content = document.content_to_pdf()
+
+            with metrics.phase(PHASE_LAYOUT):
+                document.build_pdf(
+                    doc,
+                    _timed_content(metrics, content, lazy_content),
+                    add_header_and_footer,
+                    make_canvas,
+                )
+        metrics.page_count = doc.page
+    except Exception as error:
+        metrics.error = f"{type(error).__name__}: {error}"
+        raise
+    finally:
+        # O tempo de build inclui decoração, escrita e os flowables montados
+        # sob demanda; o layout é o restante
+        if lazy_content.wall:
+            timing = metrics.phases.setdefault(PHASE_CONTENT, PhaseTiming())
+            timing.wall += lazy_content.wall
+            timing.cpu += lazy_content.cpu
+        build = metrics.phases.get(PHASE_LAYOUT)
+        if build is not None:
+            for nested in (
+                metrics.phases.get(PHASE_DECORATION),
+                metrics.phases.get(PHASE_WRITE),
+                lazy_content,
+            ):
+                if nested is not None:
+                    build.wall -= nested.wall
+                    build.cpu -= nested.cpu
+        if isinstance(target, _CountingWriter):
+            metrics.bytes_written = target.count
+        elif os.path.exists(target):
+            metrics.bytes_written = os.path.getsize(target)
+        _notify(hooks, metrics)
+    return metrics
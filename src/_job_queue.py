@@ -0,0 +1,372 @@
+import json
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable
+
+# Estados de um job
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# Tentativas por job (a primeira e as repetições após falha)
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Tempo (s) que um job retirado fica reservado ao worker; o worker renova a
+# reserva dos jobs em andamento e, expirada, o job pode ser recuperado
+DEFAULT_LEASE = 60.0
+
+# Intervalo entre as tentativas de submit com a fila cheia
+_FULL_POLL_INTERVAL = 0.05
+
+# Erro registrado nos jobs recuperados sem tentativas restantes
+_INTERRUPTED = "Worker interrompido durante a geração; tentativas esgotadas."
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    priority INTEGER NOT NULL DEFAULT 0,
+    record TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    lease_until REAL,
+    finished_at REAL,
+    render_seconds REAL,
+    filename TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, priority DESC, id);
+CREATE TABLE IF NOT EXISTS worker_state (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class Job:
+    """
+    Job retirado da fila para geração.
+    """
+
+    id: int
+    record: dict
+    priority: int
+    attempts: int
+    max_attempts: int
+    submitted_at: float
+
+
+class JobQueue:
+    """
+    Fila de jobs de geração em um arquivo SQLite local, sem broker externo.
+
+    O mesmo arquivo pode ser usado ao mesmo tempo pelo worker e por quem
+    envia os jobs, em processos diferentes: o banco fica em modo WAL e a
+    retirada de jobs (claim) é feita em uma transação exclusiva, então cada
+    job é entregue a um único consumidor. Os jobs saem por prioridade (maior
+    primeiro) e, na mesma prioridade, por ordem de chegada; um job que falha
+    volta para a fila com espera exponencial até esgotar as tentativas.
+    """
+
+    def __init__(self, path: str, max_depth: int | None = None):
+        """
+        :param path: Arquivo do banco SQLite (criado se não existir).
+        :param max_depth: Máximo de jobs aguardando na fila; acima disso
+            submit levanta queue.Full (contrapressão para quem envia).
+        """
+        self.path = path
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        columns = {
+            row[1] for row in self._connection.execute("PRAGMA table_info(jobs)")
+        }
+        if "lease_until" not in columns:
+            # Arquivo criado por uma versão anterior da fila
+            self._connection.execute("ALTER TABLE jobs ADD COLUMN lease_until REAL")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "JobQueue":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _transaction(self, sql: str, *args) -> list[tuple]:
+        # BEGIN IMMEDIATE: trava a escrita já no início, sem corrida entre a
+        # leitura e a atualização
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                rows = connection.execute(sql, *args).fetchall()
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+            return rows
+
+    def submit_many(
+        self,
+        records: Iterable[dict],
+        priority: int = 0,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        timeout: float = 0.0,
+    ) -> list[int]:
+        """
+        Coloca registros na fila em uma única transação.
+        :param records: Dados dos certificados (como uma linha do JSONL do
+            lote; certificate_type escolhe a família).
+        :param priority: Jobs de maior prioridade saem primeiro.
+        :param max_attempts: Tentativas antes de o job ser dado como falho.
+        :param timeout: Segundos esperando espaço na fila cheia antes de
+            levantar queue.Full (0: levanta imediatamente).
+        :return: Ids dos jobs, na ordem dos registros.
+        """
+        rows = [json.dumps(record, ensure_ascii=False) for record in records]
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self._insert(rows, priority, max_attempts)
+            except queue.Full:
+                if time.monotonic() >= deadline:
+                    raise
+            time.sleep(_FULL_POLL_INTERVAL)
+
+    def _insert(self, rows: list[str], priority: int, max_attempts: int) -> list[int]:
+        now = time.time()
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                if self.max_depth is not None:
+                    (waiting,) = connection.execute(
+                        "SELECT COUNT(*) FROM jobs WHERE status = ?", (STATUS_QUEUED,)
+                    ).fetchone()
+                    if waiting + len(rows) > self.max_depth:
+                        raise queue.Full(
+                            f"Fila cheia: {waiting} jobs aguardando "
+                            f"(máximo: {self.max_depth})."
+                        )
+                ids = []
+                for record in rows:
+                    cursor = connection.execute(
+                        "INSERT INTO jobs (priority, record, max_attempts, "
+                        "available_at, submitted_at) VALUES (?, ?, ?, ?, ?)",
+                        (priority, record, max_attempts, now, now),
+                    )
+                    ids.append(cursor.lastrowid)
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        return ids
+
+    def submit(
+        self,
+        record: dict,
+        priority: int = 0,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        timeout: float = 0.0,
+    ) -> int:
+        """
+        Coloca um registro na fila (ver submit_many).
+        :return: Id do job.
+        """
+        return self.submit_many([record], priority, max_attempts, timeout)[0]
+
+    def claim(self, limit: int = 1, lease: float = DEFAULT_LEASE) -> list[Job]:
+        """
+        Retira até limit jobs prontos, marcando-os como em execução.
+        :param lease: Segundos de reserva dos jobs (ver renew e recover).
+        """
+        now = time.time()
+        rows = self._transaction(
+            "UPDATE jobs SET status = ?, attempts = attempts + 1, started_at = ?, "
+            "lease_until = ? "
+            "WHERE id IN (SELECT id FROM jobs WHERE status = ? AND available_at <= ? "
+            "ORDER BY priority DESC, id LIMIT ?) "
+            "RETURNING id, record, priority, attempts, max_attempts, submitted_at",
+            (STATUS_RUNNING, now, now + lease, STATUS_QUEUED, now, limit),
+        )
+        jobs = [
+            Job(
+                id=job_id,
+                record=json.loads(record),
+                priority=priority,
+                attempts=attempts,
+                max_attempts=max_attempts,
+                submitted_at=submitted_at,
+            )
+            for job_id, record, priority, attempts, max_attempts, submitted_at in rows
+        ]
+        # RETURNING não garante a ordem da subconsulta
+        jobs.sort(key=lambda job: (-job.priority, job.id))
+        return jobs
+
+    def complete(self, job: Job, filename: str | None, render_seconds: float):
+        self._transaction(
+            "UPDATE jobs SET status = ?, finished_at = ?, render_seconds = ?, "
+            "filename = ?, error = NULL WHERE id = ?",
+            (STATUS_DONE, time.time(), render_seconds, filename, job.id),
+        )
+
+    def fail(
+        self, job: Job, error: str, render_seconds: float, retry_delay: float = 1.0
+    ) -> bool:
+        """
+        Registra a falha do job. Se ainda há tentativas, ele volta para a
+        fila depois de retry_delay * 2 ** (tentativas - 1) segundos.
+        :return: True se o job voltou para a fila.
+        """
+        now = time.time()
+        if job.attempts < job.max_attempts:
+            self._transaction(
+                "UPDATE jobs SET status = ?, available_at = ?, render_seconds = ?, "
+                "error = ? WHERE id = ?",
+                (
+                    STATUS_QUEUED,
+                    now + retry_delay * 2 ** (job.attempts - 1),
+                    render_seconds,
+                    error,
+                    job.id,
+                ),
+            )
+            return True
+        self._transaction(
+            "UPDATE jobs SET status = ?, finished_at = ?, render_seconds = ?, "
+            "error = ? WHERE id = ?",
+            (STATUS_FAILED, now, render_seconds, error, job.id),
+        )
+        return False
+
+    def renew(self, jobs: Iterable[Job], lease: float = DEFAULT_LEASE):
+        """
+        Renova a reserva dos jobs ainda em execução por mais lease segundos.
+        """
+        ids = [job.id for job in jobs]
+        if not ids:
+            return
+        placeholders = ", ".join("?" * len(ids))
+        self._transaction(
+            f"UPDATE jobs SET lease_until = ? WHERE status = ? "
+            f"AND id IN ({placeholders})",
+            (time.time() + lease, STATUS_RUNNING, *ids),
+        )
+
+    def recover(self) -> int:
+        """
+        Recupera os jobs em execução cuja reserva expirou, isto é, cujo worker
+        parou sem concluí-los (ex.: processo morto); jobs de workers ativos
+        não são afetados. A tentativa interrompida conta: o job volta para a
+        fila ou, sem tentativas restantes, é dado como falho.
+        :return: Número de jobs devolvidos para a fila.
+        """
+        now = time.time()
+        expired = "status = ? AND (lease_until IS NULL OR lease_until < ?)"
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, error = ? "
+                    f"WHERE {expired} AND attempts >= max_attempts",
+                    (STATUS_FAILED, now, _INTERRUPTED, STATUS_RUNNING, now),
+                )
+                rows = connection.execute(
+                    "UPDATE jobs SET status = ?, available_at = ? "
+                    f"WHERE {expired} RETURNING id",
+                    (STATUS_QUEUED, now, STATUS_RUNNING, now),
+                ).fetchall()
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        return len(rows)
+
+    def depth(self) -> dict[str, int]:
+        """
+        Número de jobs em cada estado e quantos estão prontos para sair.
+        """
+        with self._lock:
+            counts = dict(
+                self._connection.execute(
+                    "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+                ).fetchall()
+            )
+            (ready,) = self._connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND available_at <= ?",
+                (STATUS_QUEUED, time.time()),
+            ).fetchone()
+        depth = {
+            status: counts.get(status, 0)
+            for status in (STATUS_QUEUED, STATUS_RUNNING, STATUS_DONE, STATUS_FAILED)
+        }
+        depth["ready"] = ready
+        return depth
+
+    def job(self, job_id: int) -> dict | None:
+        """
+        Estado de um job (sem os dados do registro), ou None se não existe.
+        """
+        with self._lock:
+            cursor = self._connection.execute(
+                "SELECT id, priority, status, attempts, max_attempts, submitted_at, "
+                "started_at, finished_at, render_seconds, filename, error "
+                "FROM jobs WHERE id = ?",
+                (job_id,),
+            )
+            row = cursor.fetchone()
+            names = [column[0] for column in cursor.description]
+        return None if row is None else dict(zip(names, row))
+
+    def finished(self, status: str = STATUS_DONE) -> list[tuple]:
+        """
+        Jobs concluídos, para medir a latência de ponta a ponta.
+        :return: Tuplas (id, prioridade, envio, conclusão), por id.
+        """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT id, priority, submitted_at, finished_at FROM jobs "
+                "WHERE status = ? ORDER BY id",
+                (status,),
+            ).fetchall()
+
+    def set_state(self, name: str, value: dict):
+        """
+        Grava um estado do worker (ex.: métricas) para ser lido por outros
+        processos.
+        """
+        self._transaction(
+            "INSERT INTO worker_state (name, value, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET value = excluded.value, "
+            "updated_at = excluded.updated_at",
+            (name, json.dumps(value), time.time()),
+        )
+
+    def state(self, name: str) -> tuple[dict, float] | None:
+        """
+        Estado gravado com set_state e o instante da gravação.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, updated_at FROM worker_state WHERE name = ?", (name,)
+            ).fetchone()
+        return None if row is None else (json.loads(row[0]), row[1])
@@ -0,0 +1,185 @@
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+# Resolução do padrão usada quando o budget não informa outra (°C)
+DEFAULT_RESOLUTION = 0.1
+
+
+@dataclass(frozen=True)
+class UncertaintyBudget:
+    """
+    Componentes de incerteza tipo B somadas à incerteza das próprias medições
+    (tipo A): resolução do mostrador do padrão e sua estabilidade térmica,
+    ambas com distribuição retangular.
+    """
+
+    resolution: float = DEFAULT_RESOLUTION
+    stability: float = 0.0  # Semiamplitude da variação térmica do padrão
+    k: float = 2.0  # Fator de abrangência
+
+    def type_b(self) -> float:
+        """
+        Incerteza padrão combinada das componentes tipo B.
+        """
+        return math.hypot(
+            self.resolution / (2 * math.sqrt(3)), self.stability / math.sqrt(3)
+        )
+
+
+@dataclass(frozen=True)
+class CalibrationResults:
+    """
+    Pontos de calibração de vários instrumentos, em arrays paralelos
+    ordenados por (grupo, vvc).
+    """
+
+    group: np.ndarray  # Índice do instrumento de cada ponto
+    vvc: np.ndarray
+    vml: np.ndarray
+    uc: np.ndarray
+    k: np.ndarray
+    count: np.ndarray  # Número de leituras do ponto
+
+    def __len__(self) -> int:
+        return len(self.vvc)
+
+    @property
+    def error(self) -> np.ndarray:
+        return self.vml - self.vvc
+
+    @property
+    def ue(self) -> np.ndarray:
+        # Incerteza expandida
+        return self.k * self.uc
+
+    def group_bounds(self, groups: int) -> np.ndarray:
+        """
+        Início dos pontos de cada grupo (e o fim do último): os pontos do
+        grupo i são [bounds[i], bounds[i + 1]).
+        """
+        return np.searchsorted(self.group, np.arange(groups + 1))
+
+
+def calibration_points(
+    group: np.ndarray,
+    vvc: np.ndarray,
+    readings: np.ndarray,
+    budget: UncertaintyBudget = UncertaintyBudget(),
+) -> CalibrationResults:
+    """
+    Calcula, de uma só vez para todos os pontos de todos os instrumentos, a
+    média das leituras (VML) e a incerteza combinada (Uc) de cada ponto de
+    calibração (grupo, VVC).
+
+    A incerteza tipo A de cada ponto é o desvio padrão experimental da média
+    (s/√n); a combinada soma, em quadratura, as componentes tipo B do budget.
+    Pontos com menos de 2 leituras não têm tipo A: Uc é NaN.
+    :param group: Índice do instrumento de cada leitura.
+    :param vvc: Valor do padrão de cada leitura.
+    :param readings: Leituras dos instrumentos.
+    :param budget: Componentes tipo B e fator de abrangência.
+    """
+    keys = np.empty(len(vvc), dtype=[("group", np.int64), ("vvc", np.float64)])
+    keys["group"] = group
+    keys["vvc"] = vvc
+    points, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    vml = np.bincount(inverse, weights=readings) / counts
+    deviations = readings - vml[inverse]
+    # Com uma única leitura não há desvio padrão: o ponto fica com Uc NaN
+    # (impresso como "nan") em vez de uma incerteza tipo A nula
+    variances = np.full(len(points), np.nan)
+    np.divide(
+        np.bincount(inverse, weights=deviations * deviations),
+        counts - 1,
+        out=variances,
+        where=counts > 1,
+    )
+    type_a = np.sqrt(variances / counts)
+    return CalibrationResults(
+        group=points["group"],
+        vvc=points["vvc"],
+        vml=vml,
+        uc=np.hypot(type_a, budget.type_b()),
+        k=np.full(len(points), budget.k),
+        count=counts,
+    )
+
+
+def format_decimals(values: np.ndarray, decimals: int = 2) -> np.ndarray:
+    """
+    Formata um array de números no padrão brasileiro (vírgula decimal), com
+    o mesmo resultado de format_decimal elemento a elemento.
+
+    Os valores são arredondados como inteiros escalados (valor · 10^decimals)
+    e montados com operações de string do NumPy. Os poucos valores cuja
+    multiplicação cai a menos de 1e-6 de um empate (…,5) são formatados pelo
+    Python, que arredonda pelo valor binário exato, assim como NaN, ±inf e
+    os valores grandes demais para um inteiro de 64 bits.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scaled = values * 10**decimals
+    special = ~(np.abs(scaled) < 2.0**62)
+    if special.any():
+        scaled[special] = 0.0
+    rounded = np.rint(scaled)
+    ties = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    if ties.any():
+        rounded[ties] = [
+            float(f"{value:.{decimals}f}".replace(".", ""))
+            for value in values[ties].tolist()
+        ]
+    integers = rounded.astype(np.int64)
+    magnitude = np.abs(integers)
+    whole, fraction = np.divmod(magnitude, 10**decimals)
+    text = whole.astype(str)
+    if decimals:
+        text = np.strings.add(
+            np.strings.add(text, ","),
+            np.strings.zfill(fraction.astype(str), decimals),
+        )
+    # Zero sem sinal ("-0,00" vira "0,00")
+    text = np.where(integers < 0, np.strings.add("-", text), text)
+    if special.any():
+        text = text.astype(object)
+        text[special] = [
+            f"{round(value, decimals) + 0.0:.{decimals}f}".replace(".", ",")
+            for value in values[special].tolist()
+        ]
+        text = text.astype(str)
+    return text
+
+
+def results_table(
+    vvc: np.ndarray, vml: np.ndarray, uc: np.ndarray, k: np.ndarray
+) -> list[list[str]]:
+    """
+    Linhas formatadas da tabela de resultados (VVC, VML, Erro, Uc, K, Ue):
+    erro e incerteza expandida calculados e todas as células formatadas em
+    uma única passada sobre o array.
+    """
+    return _results_cells(vvc, vml, uc, k).tolist()
+
+
+def results_cells(
+    vvc: np.ndarray, vml: np.ndarray, uc: np.ndarray, k: np.ndarray
+) -> np.ndarray:
+    """
+    Mesmas células de results_table em um array (pontos x 6) de bytes ASCII
+    com a largura da maior célula: a tabela formatada inteira ocupa poucas
+    dezenas de bytes por ponto e pode ser guardada durante o build.
+    """
+    cells = _results_cells(vvc, vml, uc, k)
+    width = int(np.strings.str_len(cells).max(initial=1))
+    return cells.astype(f"S{width}")
+
+
+def _results_cells(
+    vvc: np.ndarray, vml: np.ndarray, uc: np.ndarray, k: np.ndarray
+) -> np.ndarray:
+    vvc, vml, uc, k = (
+        np.asarray(column, dtype=np.float64) for column in (vvc, vml, uc, k)
+    )
+    values = np.column_stack((vvc, vml, vml - vvc, uc, k, k * uc))
+    return format_decimals(values)
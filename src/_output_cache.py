@@ -0,0 +1,227 @@
+import hashlib
+import os
+import tempfile
+import threading
+from stat import S_ISDIR
+from typing import Protocol
+
+# Tamanho máximo padrão do cache em disco
+DEFAULT_MAX_BYTES = 512 * 2**20
+
+# Digest do conteúdo dos arquivos de imagem, por (caminho, mtime, tamanho)
+_asset_digests: dict[tuple[str, int, int], str] = {}
+_asset_digests_lock = threading.Lock()
+
+
+def asset_digest(path: str) -> str:
+    """
+    SHA-256 do conteúdo de um arquivo, recalculado apenas quando o arquivo é
+    modificado.
+    :param path: Caminho do arquivo (imagem de cabeçalho, rodapé, assinatura).
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"O arquivo não existe no caminho especificado: {path}"
+        ) from None
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    digest = _asset_digests.get(key)
+    if digest is None:
+        with open(path, "rb") as file:
+            digest = hashlib.file_digest(file, "sha256").hexdigest()
+        with _asset_digests_lock:
+            _asset_digests[key] = digest
+    return digest
+
+
+def user_cache_dir(name: str) -> str:
+    """
+    Diretório de cache do usuário para os arquivos de um componente
+    ($XDG_CACHE_HOME, ~/.cache por padrão).
+    :param name: Nome do componente (ex.: "images").
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "report-lab-learning", name)
+
+
+def private_directory(path: str) -> bool:
+    """
+    Cria o diretório (modo 0700) e confirma que ele pertence ao usuário atual
+    e que nenhum outro usuário tem acesso a ele, antes de confiar nos arquivos
+    que estão lá.
+    :param path: Caminho do diretório.
+    :return: False se o diretório não pôde ser criado ou não é privado.
+    """
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        info = os.lstat(path)
+    except OSError:
+        return False
+    if not S_ISDIR(info.st_mode):
+        return False
+    if hasattr(os, "getuid"):
+        return info.st_uid == os.getuid() and not info.st_mode & 0o077
+    return True
+
+
+class PDFCache(Protocol):
+    """
+    Cache de PDFs prontos, endereçado pelo conteúdo (ver _PDFBase.cache_key).
+    """
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def put(self, key: str, data: bytes): ...
+
+
+class DiskPDFCache:
+    """
+    Cache de PDFs em disco com limite de tamanho (LRU).
+
+    Cada PDF fica em <diretório>/<2 primeiros caracteres da chave>/<chave>.pdf.
+    A escrita é atômica (arquivo temporário + os.replace), então leitores em
+    outros processos nunca veem um PDF incompleto e o mesmo diretório pode
+    ser compartilhado entre processos. O uso de cada entrada é registrado no
+    mtime do arquivo; ao passar do limite, as entradas usadas há mais tempo
+    são removidas.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        :param directory: Diretório do cache (criado se não existir).
+        :param max_bytes: Tamanho máximo do cache em bytes.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: int | None = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def __getstate__(self) -> dict:
+        # Permite enviar o cache a processos (ProcessPoolExecutor)
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.pdf")
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Retorna o PDF da chave, ou None se ele não está no cache.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            # Marca a entrada como usada recentemente
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        """
+        Grava o PDF da chave de forma atômica e aplica o limite de tamanho.
+        """
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        self._evict(len(data) - replaced)
+
+    def _entries(self) -> list[tuple[int, int, str]]:
+        """
+        Entradas do cache como (mtime_ns, tamanho, caminho).
+        """
+        entries = []
+        for bucket in os.scandir(self.directory):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if not entry.name.endswith(".pdf"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self, added: int):
+        with self._lock:
+            if self._size is None:
+                self._size = self.size()
+            else:
+                self._size += added
+            if self._size <= self.max_bytes:
+                return
+            # Outros processos podem ter gravado no diretório: recalcula
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+            self._size = total
+
+    def stats(self) -> dict:
+        """
+        Contadores do cache, no formato esperado por coletores de métricas.
+        """
+        entries = self._entries()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+            }
+
+    def clear(self):
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
@@ -1,19 +1,37 @@
+import hashlib
+import io
+import itertools
 import os
+import threading
 from abc import ABC, abstractmethod
-from copy import deepcopy
-from dataclasses import dataclass
-from typing import ClassVar
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from functools import cache, partial
+from typing import (TYPE_CHECKING, Any, AsyncIterator, BinaryIO, Callable,
+                    ClassVar, Iterable, Iterator, get_args)
 
+import reportlab
 from pydantic import BaseModel as PydanticBaseModel
-from pydantic import ConfigDict, field_validator
+from reportlab import rl_config
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.units import cm
-from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen.canvas import Canvas
-from reportlab.platypus import (Frame, HRFlowable, Image, Paragraph,
-                                SimpleDocTemplate, Spacer, Table, TableStyle)
+from reportlab.platypus import (Flowable, HRFlowable, PageBreak,
+                                SimpleDocTemplate)
+
+from _compiled_template import CompiledTemplate, compiled_template
+from _instrumentation import (ProfilingOptions, RenderHook, RenderMetrics,
+                              default_profiling, registered_render_hooks,
+                              render_instrumented)
+from _output_cache import PDFCache, asset_digest
+from _pdf_stream import (DEFAULT_CHUNK_SIZE, AsyncWriter, iter_chunks,
+                         write_async)
+
+if TYPE_CHECKING:
+    from _archival import DocumentMetadata
+    from _image_assets import ImageAsset, ImagePlacement
+    from _incremental import IncrementalResult
 
 # Tamanho da página A4
 PAGE_WIDTH, PAGE_HEIGHT = A4
@@ -26,10 +44,133 @@ MARGIN_BOTTOM = 2 * cm
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Builds em andamento com os streams binários (ver binary_streams)
+_binary_builds = 0
+_binary_builds_useA85 = None
+_binary_builds_lock = threading.Lock()
+
+# Nome do form XObject da decoração de página, por assinatura do template
+_decoration_form_names: dict[tuple, str] = {}
+
+
+@contextmanager
+def binary_streams():
+    """
+    Grava imagens e páginas como streams binários durante o build: a
+    codificação ASCII85 (padrão do ReportLab) aumenta cada imagem em 25% e é
+    o maior custo de CPU da gravação. A opção é global no ReportLab
+    (rl_config.useA85); o valor anterior volta quando o último build em
+    andamento termina.
+    """
+    global _binary_builds, _binary_builds_useA85
+    with _binary_builds_lock:
+        if not _binary_builds:
+            _binary_builds_useA85 = rl_config.useA85
+            rl_config.useA85 = 0
+        _binary_builds += 1
+    try:
+        yield
+    finally:
+        with _binary_builds_lock:
+            _binary_builds -= 1
+            if not _binary_builds:
+                rl_config.useA85 = _binary_builds_useA85
+
+
+def _contains_model(annotation: Any) -> bool:
+    if isinstance(annotation, type) and issubclass(annotation, PydanticBaseModel):
+        return True
+    return any(_contains_model(arg) for arg in get_args(annotation))
+
+
+@cache
+def _nested_model_fields(model_cls: type[PydanticBaseModel]) -> frozenset[str]:
+    """
+    Campos do modelo que contêm submodelos.
+    """
+    return frozenset(
+        name
+        for name, field in model_cls.model_fields.items()
+        if _contains_model(field.annotation)
+    )
+
+
+def _is_constructed(value: Any) -> bool:
+    # Submodelo já instanciado (ou sequência deles)
+    if value is None or isinstance(value, PydanticBaseModel):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(isinstance(item, PydanticBaseModel) for item in value)
+    return False
+
+
+class _MergedPages:
+    """
+    Estado da geração de vários documentos em um único PDF: em qual documento
+    cada página está, a numeração de páginas por documento e o sumário.
+    """
+
+    def __init__(self, page_base: type):
+        self.page_base = page_base
+        self.index = -1
+        self.first_page = 0
+
+    def page_count_form(self, index: int) -> str:
+        return f"MergedPageCount{index}"
+
+    def start(self, canvas: Canvas, index: int, title: str):
+        self.index = index
+        self.first_page = canvas.getPageNumber()
+        key = f"document{index}"
+        canvas.bookmarkPage(key)
+        canvas.addOutlineEntry(title, key, level=0)
+
+    def end(self, canvas: Canvas):
+        # O total de páginas do documento só é conhecido aqui; as páginas já
+        # desenhadas referenciam este form, que é gravado agora
+        total = canvas.getPageNumber() - self.first_page + 1
+        canvas.beginForm(self.page_count_form(self.index))
+        self.page_base.draw_page_count(canvas, total)
+        canvas.endForm()
+
+    def after_page(self, canvas: Canvas):
+        if self.index < 0:
+            return
+        page = canvas.getPageNumber() - self.first_page + 1
+        self.page_base.draw_page_number(canvas, page, self.page_count_form(self.index))
+
+
+class _DocumentMark(Flowable):
+    """
+    Flowable sem tamanho que marca o início ou o fim de um documento dentro
+    do PDF combinado.
+    """
+
+    def __init__(self, pages: _MergedPages, index: int, title: str | None = None):
+        super().__init__()
+        self.pages = pages
+        self.index = index
+        self.title = title
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        if self.title is not None:
+            self.pages.start(self.canv, self.index, self.title)
+        else:
+            self.pages.end(self.canv)
+
 
 class _PDFBase(PydanticBaseModel, ABC):
     filename: str
 
+    # Versão do layout: incremente ao alterar content_to_pdf ou a decoração
+    # de página, para invalidar os PDFs já guardados em cache
+    template_version: ClassVar[str] = "2"
+    # Id do tipo de documento, definido por register_certificate
+    type_id: ClassVar[str | None] = None
+
     class PageBase(PydanticBaseModel):
         """
         Estrutura da página com margens e áreas definidas.
@@ -63,21 +204,11 @@ class _PDFBase(PydanticBaseModel, ABC):
             )  # Caminho da imagem do rodapé
             footer_height: ClassVar[float] = 4 * cm  # Altura do rodapé
 
-        @staticmethod
-        def _validate_image_path(value: str) -> str:
-            if not os.path.exists(value):
-                print(f"Imagem não encontrada: {value}")
-                raise FileNotFoundError(
-                    f"A imagem não existe no caminho especificado: {value}"
-                )
-            return value
-
         @classmethod
-        def _generate_header(cls, canvas: Canvas):
-            header_image = ImageReader(cls.Header.image_path)
-            img_width, img_height = header_image.getSize()
+        def _header_placement(cls, header_image: "ImageAsset") -> "ImagePlacement":
+            from _image_assets import ImagePlacement
 
-            aspect = img_height / float(img_width)
+            aspect = header_image.aspect
             display_width = cls.page_width
             display_height = display_width * aspect
 
@@ -87,16 +218,19 @@ class _PDFBase(PydanticBaseModel, ABC):
                 display_width = display_height / aspect
 
             x = 0  # Sem margens laterais
-            y = PAGE_HEIGHT - display_height  # No topo da página
-
-            canvas.drawImage(
-                image=header_image,
-                x=x,
-                y=y,
-                width=display_width,
-                height=display_height,
-                preserveAspectRatio=True,
-                mask="auto",
+            y = cls.page_height - display_height  # No topo da página
+
+            return ImagePlacement(x=x, y=y, width=display_width, height=display_height)
+
+        @classmethod
+        def _generate_header(cls, canvas: Canvas):
+            from _image_assets import image_asset_cache
+
+            image_asset_cache.draw(
+                canvas,
+                cls.Header.image_path,
+                ("header", cls.page_width, cls.page_height, cls.Header.header_height),
+                cls._header_placement,
             )
 
         @classmethod
@@ -105,18 +239,13 @@ class _PDFBase(PydanticBaseModel, ABC):
             Desenha a imagem do cabeçalho centralizada horizontalmente,
             ocupando toda a altura do cabeçalho proporcionalmente.
             """
-            try:
-                cls._validate_image_path(cls.Header.image_path)
-                cls._generate_header(canvas)
-            except Exception as error:
-                print(f"Erro ao gerar o Header: {error}")
+            cls._generate_header(canvas)
 
         @classmethod
-        def _generate_footer(cls, canvas: Canvas):
-            footer_image = ImageReader(cls.Footer.image_path)
-            img_width, img_height = footer_image.getSize()
+        def _footer_placement(cls, footer_image: "ImageAsset") -> "ImagePlacement":
+            from _image_assets import ImagePlacement
 
-            aspect = img_height / float(img_width)
+            aspect = footer_image.aspect
 
             # Definir margens
             margin_x = 0.2 * cm
@@ -135,14 +264,17 @@ class _PDFBase(PydanticBaseModel, ABC):
             x = margin_x
             y = 0.3 * cm  # Altura do rodapé (um pequeno deslocamento vertical)
 
-            canvas.drawImage(
-                image=footer_image,
-                x=x,
-                y=y,
-                width=display_width,
-                height=display_height,
-                preserveAspectRatio=True,
-                mask="auto",
+            return ImagePlacement(x=x, y=y, width=display_width, height=display_height)
+
+        @classmethod
+        def _generate_footer(cls, canvas: Canvas):
+            from _image_assets import image_asset_cache
+
+            image_asset_cache.draw(
+                canvas,
+                cls.Footer.image_path,
+                ("footer", cls.page_width, cls.Footer.footer_height),
+                cls._footer_placement,
             )
 
         @classmethod
@@ -150,35 +282,130 @@ class _PDFBase(PydanticBaseModel, ABC):
             """
             Desenha o rodapé na parte inferior da página.
             """
-            try:
-                cls._validate_image_path(cls.Footer.image_path)
-                cls._generate_footer(canvas)
-            except Exception as error:
-                print(f"Erro ao gerar o Footer: {error}")
+            cls._generate_footer(canvas)
+
+        @classmethod
+        def draw_page_number(cls, canvas: Canvas, page: int, total_form: str):
+            """
+            Desenha "Página N de " sobre o rodapé, seguido do form com o total
+            de páginas (gravado depois, ao final do documento).
+            """
+            label = f"Página {page} de "
+            x = cls.page_width - 2.6 * cm
+            y = 0.75 * cm
+            canvas.saveState()
+            canvas.setFont("Helvetica", 8)
+            canvas.setFillColor(colors.white)
+            canvas.drawString(x, y, label)
+            canvas.translate(x + canvas.stringWidth(label, "Helvetica", 8), y)
+            canvas.doForm(total_form)
+            canvas.restoreState()
+
+        @classmethod
+        def draw_page_count(cls, canvas: Canvas, total: int):
+            """
+            Conteúdo do form com o total de páginas (na origem do form).
+            """
+            canvas.setFont("Helvetica", 8)
+            canvas.setFillColor(colors.white)
+            canvas.drawString(0, 0, str(total))
+
+        @classmethod
+        def template_signature(cls) -> tuple:
+            """
+            Configurações que definem a decoração estática da página. Qualquer
+            alteração gera um novo template na próxima página desenhada.
+            """
+            return (
+                cls.pagesize,
+                cls.page_width,
+                cls.page_height,
+                cls.left_margin,
+                cls.right_margin,
+                cls.top_margin,
+                cls.bottom_margin,
+                cls.Header.image_path,
+                cls.Header.header_height,
+                cls.Footer.image_path,
+                cls.Footer.footer_height,
+            )
+
+        @classmethod
+        def decoration_form_name(cls) -> str:
+            signature = cls.template_signature()
+            form_name = _decoration_form_names.get(signature)
+            if form_name is None:
+                digest = hashlib.md5(repr(signature).encode("utf-8")).hexdigest()
+                form_name = _decoration_form_names.setdefault(
+                    signature, f"PageDecoration{digest}"
+                )
+            return form_name
 
         @classmethod
         def add_header_and_footer(cls, canvas: Canvas, doc: SimpleDocTemplate = None):
             """
-            Adiciona o cabeçalho e rodapé ao documento.
+            Adiciona o cabeçalho e rodapé ao documento. A decoração é gravada
+            uma vez por documento como form XObject e cada página a referencia
+            com um único doForm.
             """
-            cls.generate_header(canvas, doc)
-            cls.generate_footer(canvas, doc)
+            form_name = cls.decoration_form_name()
+            if not canvas.hasForm(form_name):
+                canvas.beginForm(form_name)
+                cls.generate_header(canvas, doc)
+                cls.generate_footer(canvas, doc)
+                canvas.endForm()
+            canvas.doForm(form_name)
 
     class ElementsPage(PydanticBaseModel):
-        line_between_text: ClassVar[HRFlowable] = HRFlowable(
-            width="100%",
-            thickness=1,
-            color=colors.HexColor("#d4eced"),
-            spaceBefore=0.3 * cm,
-            spaceAfter=0.3 * cm,
-        )
+        """
+        Elementos repetidos ao longo do conteúdo. Flowables guardam estado de
+        layout (wrap, split), então cada uso recebe uma instância nova: um
+        mesmo flowable nunca é compartilhado entre documentos ou threads.
+        """
+
+        line_color: ClassVar[colors.Color] = colors.HexColor("#d4eced")
+        line_thickness: ClassVar[float] = 1
+        line_spacing: ClassVar[float] = 0.3 * cm
 
-    def base_template_pdf(self, filename: str) -> SimpleDocTemplate:
+        @classmethod
+        def line_between_text(cls) -> HRFlowable:
+            """
+            Linha horizontal que separa os blocos de texto.
+            """
+            return HRFlowable(
+                width="100%",
+                thickness=cls.line_thickness,
+                color=cls.line_color,
+                spaceBefore=cls.line_spacing,
+                spaceAfter=cls.line_spacing,
+            )
+
+    def base_template_pdf(
+        self,
+        filename: str | BinaryIO,
+        reproducible: bool = False,
+        archival: bool = False,
+    ) -> SimpleDocTemplate:
         """
         Gera a configuração base do PDF com margens ABNT.
-        :param filename: Caminho do arquivo PDF a ser gerado.
+        :param filename: Caminho do arquivo PDF a ser gerado ou stream binário
+            com método write().
+        :param reproducible: Data de criação e ID do documento fixos (modo
+            invariant do ReportLab): os mesmos dados geram os mesmos bytes.
+        :param archival: Grava os metadados de document_metadata no
+            dicionário Info (ver generate_pdf).
         :return: Instância do SimpleDocTemplate configurada.
         """
+        metadata = {}
+        if archival:
+            document_metadata = self.document_metadata()
+            metadata = {
+                "title": document_metadata.title,
+                "author": document_metadata.author,
+                "subject": document_metadata.subject,
+                "keywords": ", ".join(document_metadata.keywords),
+                "creator": document_metadata.creator,
+            }
         doc = SimpleDocTemplate(
             filename=filename,
             pagesize=self.PageBase.pagesize,
@@ -186,31 +413,415 @@ class _PDFBase(PydanticBaseModel, ABC):
             rightMargin=self.PageBase.right_margin,
             topMargin=self.PageBase.top_margin,
             bottomMargin=self.PageBase.bottom_margin,
+            invariant=1 if reproducible else None,
+            **metadata,
         )
         return doc
 
+    def document_metadata(self) -> "DocumentMetadata":
+        """
+        Metadados do PDF arquivável (dicionário Info e XMP). Subclasses
+        completam com os dados do modelo.
+        """
+        from _archival import DocumentMetadata
+
+        return DocumentMetadata(title=self.outline_title(), author="")
+
+    def canvasmaker(self, archival: bool = False) -> Callable:
+        """
+        Fábrica do canvas do build: PageFlushingCanvas ou, no modo
+        arquivável, ArchivalCanvas com os metadados do documento.
+        """
+        if archival:
+            # Importado aqui: só o modo arquivável usa o PDF/A (~20 ms)
+            from _archival import ArchivalCanvas
+
+            return partial(ArchivalCanvas, metadata=self.document_metadata())
+        from _bounded_build import PageFlushingCanvas
+
+        return PageFlushingCanvas
+
+    @classmethod
+    def from_trusted(cls, data: dict) -> "_PDFBase":
+        """
+        Cria o documento a partir de dados já confiáveis. Com os submodelos
+        já instanciados (ex.: vindos da ingestão de leituras), o documento é
+        montado sem validação (model_construct). Com submodelos em dict, os
+        dados passam por model_validate: a validação compilada do modelo
+        inteiro é mais rápida que converter cada campo separadamente.
+        :param data: Dados do documento.
+        """
+        nested = _nested_model_fields(cls)
+        if all(_is_constructed(data[name]) for name in nested if name in data):
+            return cls.model_construct(**data)
+        return cls.model_validate(data)
+
     @classmethod
+    def template_key(cls) -> tuple:
+        """
+        Configurações das quais os flowables estáticos dependem. Subclasses
+        que usam outros temas (fontes, imagens) devem incluí-los aqui.
+        """
+        from _image_pipeline import image_pipeline
+
+        return (*cls.PageBase.template_signature(), *image_pipeline.settings())
+
+    @classmethod
+    def static_flowables(cls) -> dict:
+        """
+        Protótipos dos flowables que não dependem dos dados do documento
+        (textos fixos, cabeçalhos de tabela, imagens). Chamado uma única vez
+        por template_key; o padrão é não ter partes estáticas.
+        """
+        return {}
+
+    @classmethod
+    def template(cls) -> CompiledTemplate:
+        """
+        Template compilado da classe: cada acesso devolve uma cópia do
+        protótipo, pronta para entrar no documento.
+        """
+        return compiled_template((cls, cls.template_key()), cls.static_flowables)
+
+    @classmethod
+    def warm_up(cls):
+        """
+        Prepara o processo para gerar documentos da classe: imagens de
+        cabeçalho e rodapé decodificadas e template compilado.
+        """
+        from _image_assets import image_asset_cache
+
+        image_asset_cache.get(cls.PageBase.Header.image_path)
+        image_asset_cache.get(cls.PageBase.Footer.image_path)
+        cls.template()
+
+    @classmethod
+    def asset_paths(cls) -> tuple[str, ...]:
+        """
+        Arquivos usados pelo documento além dos dados do modelo. O conteúdo
+        de cada um entra na chave do cache de PDFs.
+        """
+        return cls.PageBase.Header.image_path, cls.PageBase.Footer.image_path
+
+    @classmethod
+    def image_savings(cls) -> dict:
+        """
+        Bytes economizados pelo pipeline de imagens em cada documento da
+        classe (ver ImagePipeline.document_stats), com as imagens já
+        preparadas por uma renderização.
+        """
+        from _image_pipeline import image_pipeline
+
+        return image_pipeline.document_stats(cls.asset_paths())
+
+    @classmethod
+    def _layout_digest(cls):
+        digest = hashlib.sha256()
+        digest.update(
+            repr(
+                (
+                    cls.__module__,
+                    cls.__qualname__,
+                    cls.template_version,
+                    cls.template_key(),
+                    reportlab.Version,
+                )
+            ).encode("utf-8")
+        )
+        for path in cls.asset_paths():
+            digest.update(asset_digest(path).encode("ascii"))
+        return digest
+
+    @classmethod
+    def layout_key(cls) -> str:
+        """
+        Chave de tudo o que define o layout além dos dados do modelo: classe
+        e versão do template, template_key, versão do ReportLab e o conteúdo
+        dos arquivos de asset_paths.
+        """
+        return cls._layout_digest().hexdigest()
+
+    def cache_key(self, archival: bool = False) -> str:
+        """
+        Chave estável do PDF gerado: layout_key e os dados do modelo (exceto
+        filename).
+        :param archival: Chave do PDF/A, distinta da do PDF padrão.
+        """
+        digest = self._layout_digest()
+        digest.update(self.model_dump_json(exclude={"filename"}).encode("utf-8"))
+        if archival:
+            from _archival import ARCHIVAL_VERSION
+
+            digest.update(f"archival:{ARCHIVAL_VERSION}".encode("ascii"))
+        return digest.hexdigest()
+
     @abstractmethod
-    def content_to_pdf(cls) -> list:
+    def content_to_pdf(self) -> Iterable[Flowable]:
+        """
+        Monta os flowables do documento. Depende apenas dos campos do modelo.
+        Pode ser um gerador: os flowables são pedidos durante o layout, um
+        pouco antes de serem usados, e liberados depois de desenhados.
+        """
         pass
 
-    def generate_pdf(self):
+    def build_pdf(
+        self,
+        doc: SimpleDocTemplate,
+        content: Iterable[Flowable],
+        on_page: Callable | None = None,
+        canvasmaker: Callable | None = None,
+    ):
+        """
+        Monta o PDF a partir dos flowables, aplicando a decoração de página.
+        :param doc: Documento configurado por base_template_pdf.
+        :param content: Flowables gerados por content_to_pdf (lista ou
+            iterável consumido sob demanda).
+        :param on_page: Callback de página (padrão: cabeçalho e rodapé).
+        :param canvasmaker: Fábrica do canvas usada pelo ReportLab (padrão:
+            canvasmaker()).
+        """
+        from _bounded_build import FlowableQueue
+
+        on_page = on_page or self.PageBase.add_header_and_footer
+        canvasmaker = canvasmaker or self.canvasmaker()
+        if not isinstance(content, list):
+            content = FlowableQueue(content)
+        with binary_streams():
+            doc.build(
+                content,
+                onFirstPage=on_page,
+                onLaterPages=on_page,
+                canvasmaker=canvasmaker,
+            )
+
+    def generate_pdf(
+        self,
+        output: str | BinaryIO | None = None,
+        hooks: Iterable[RenderHook] = (),
+        profiling: ProfilingOptions | None = None,
+        cache: PDFCache | None = None,
+        reproducible: bool = False,
+        archival: bool = False,
+    ) -> RenderMetrics | None:
         """
         Gera um PDF com margens ABNT e áreas definidas para conteúdo.
-        :param filename: Caminho do arquivo PDF a ser gerado.
+        :param output: Caminho do arquivo PDF a ser gerado ou qualquer stream
+            binário gravável (BytesIO, socket, AsgiSendWriter...). Por padrão
+            usa self.filename.
+        :param hooks: Callbacks que recebem as métricas por fase do documento,
+            além dos registrados com register_render_hook.
+        :param profiling: Captura de cProfile/tracemalloc (padrão: a definida
+            com set_default_profiling).
+        :param cache: Cache de PDFs (ex.: DiskPDFCache). Se o PDF destes dados
+            já está no cache, ele é copiado para o output sem gerar o
+            documento; senão é gerado em modo reproducible e guardado.
+        :param reproducible: Gera sempre os mesmos bytes para os mesmos dados.
+        :param archival: Gera PDF/A-2b na mesma passagem (ver ArchivalCanvas):
+            fontes embutidas, output intent sRGB, XMP com document_metadata e
+            imagens sem transparência. O layout é o mesmo do PDF padrão.
+        :return: Métricas do documento quando instrumentado e gerado, senão
+            None.
         """
+        output = self.filename if output is None else output
+        if cache is not None:
+            return self._generate_cached(output, cache, hooks, profiling, archival)
+
+        hooks = (*registered_render_hooks(), *hooks)
+        profiling = profiling or default_profiling()
+        if hooks or profiling is not None:
+            return render_instrumented(
+                self, output, hooks, profiling, reproducible, archival
+            )
+
         # Configura o documento
-        doc = self.base_template_pdf(self.filename)
+        doc = self.base_template_pdf(output, reproducible, archival)
 
         # Conteúdo do PDF
         content = self.content_to_pdf()
 
         # Cria o PDF
-        doc.build(
-            content,
-            onFirstPage=self.PageBase.add_header_and_footer,
-            onLaterPages=self.PageBase.add_header_and_footer,
+        self.build_pdf(doc, content, canvasmaker=self.canvasmaker(archival))
+        return None
+
+    def _generate_cached(
+        self,
+        output: str | BinaryIO,
+        cache: PDFCache,
+        hooks: Iterable[RenderHook],
+        profiling: ProfilingOptions | None,
+        archival: bool = False,
+    ) -> RenderMetrics | None:
+        key = self.cache_key(archival)
+        data = cache.get(key)
+        metrics = None
+        if data is None:
+            buffer = io.BytesIO()
+            metrics = self.generate_pdf(
+                buffer, hooks, profiling, reproducible=True, archival=archival
+            )
+            data = buffer.getvalue()
+            cache.put(key, data)
+
+        if isinstance(output, str):
+            with open(output, "wb") as file:
+                file.write(data)
+        else:
+            output.write(data)
+        return metrics
+
+    def generate_incremental(
+        self,
+        output: str | BinaryIO | None = None,
+        sidecar: str | None = None,
+        reproducible: bool = False,
+    ) -> "IncrementalResult":
+        """
+        Gera o PDF refazendo o layout apenas a partir da primeira página
+        alterada desde a geração anterior do mesmo documento.
+
+        Cada geração grava um sidecar com a impressão digital dos flowables
+        de content_to_pdf (e de cada linha das ResultsTable), o mapa de quais
+        flowables caíram em cada página e as operações de desenho de cada
+        página. Na geração seguinte as páginas anteriores à primeira
+        alteração são copiadas do sidecar, sem wrap, split nem desenho dos
+        flowables, e o layout recomeça no início da página alterada (ou no
+        bloco da tabela de resultados que abre a página). Sem sidecar, com
+        outro layout_key ou com fontes TrueType, o documento é gerado inteiro.
+        Em modo reproducible os bytes são os mesmos de generate_pdf.
+        :param output: Caminho do arquivo PDF ou stream binário gravável. Por
+            padrão usa self.filename.
+        :param sidecar: Arquivo do sidecar (padrão: output + ".layout.json");
+            obrigatório quando output é um stream.
+        :param reproducible: Data de criação e ID do documento fixos.
+        :return: Total de páginas e páginas reaproveitadas.
+        """
+        # Importado aqui: só a regeneração incremental usa o sidecar (~8 ms)
+        from _incremental import SIDECAR_SUFFIX, render_incremental
+
+        output = self.filename if output is None else output
+        if sidecar is None:
+            if not isinstance(output, str):
+                raise ValueError("Informe o sidecar quando o output é um stream.")
+            sidecar = output + SIDECAR_SUFFIX
+        return render_incremental(self, output, sidecar, reproducible)
+
+    def outline_title(self) -> str:
+        """
+        Título do documento no sumário (bookmarks) do PDF combinado.
+        """
+        return os.path.splitext(os.path.basename(self.filename))[0]
+
+    @classmethod
+    def generate_merged(
+        cls,
+        documents: Iterable["_PDFBase"],
+        output: str | BinaryIO,
+        reproducible: bool = False,
+    ):
+        """
+        Gera vários documentos em um único PDF, em uma única passagem do
+        SimpleDocTemplate. Cada documento começa em uma nova página, tem uma
+        entrada no sumário e numeração de páginas própria ("Página N de M").
+        Imagens (decoração de página, assinatura) e fontes são gravadas uma
+        única vez e referenciadas por todas as páginas.
+        :param documents: Documentos com a mesma estrutura de página de cls;
+            consumido sob demanda (pode ser um gerador).
+        :param output: Caminho do arquivo PDF ou stream binário gravável.
+        :param reproducible: Data de criação e ID do documento fixos.
+        """
+        signature = cls.PageBase.template_signature()
+        pages = _MergedPages(cls.PageBase)
+        documents = iter(documents)
+        first = next(documents, None)
+        if first is None:
+            raise ValueError("Nenhum documento para gerar.")
+
+        def content() -> Iterator[Flowable]:
+            # Cada documento é montado apenas quando o anterior já foi
+            # desenhado: a campanha inteira nunca está em memória
+            for index, document in enumerate(itertools.chain([first], documents)):
+                if document.PageBase.template_signature() != signature:
+                    raise ValueError(
+                        f"O documento {index} ({type(document).__name__}) usa "
+                        f"uma estrutura de página diferente de {cls.__name__}."
+                    )
+                if index:
+                    yield PageBreak()
+                yield _DocumentMark(pages, index, document.outline_title())
+                yield from document.content_to_pdf()
+                yield _DocumentMark(pages, index)
+
+        # O primeiro documento define a configuração do PDF combinado
+        doc = first.base_template_pdf(output, reproducible)
+        doc.afterPage = lambda: pages.after_page(doc.canv)
+        first.build_pdf(doc, content())
+
+    def render_bytes(
+        self,
+        cache: PDFCache | None = None,
+        reproducible: bool = False,
+        archival: bool = False,
+    ) -> bytes:
+        """
+        Gera o PDF em memória, sem passar pelo disco.
+        :param cache: Cache de PDFs (ver generate_pdf).
+        :param reproducible: Gera sempre os mesmos bytes para os mesmos dados.
+        :param archival: Gera PDF/A (ver generate_pdf).
+        """
+        buffer = io.BytesIO()
+        self.generate_pdf(
+            buffer, cache=cache, reproducible=reproducible, archival=archival
         )
+        return buffer.getvalue()
+
+    def iter_pdf_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Gera o PDF inteiro em memória e o divide em blocos de até chunk_size
+        bytes (ex.: para respostas HTTP em partes). Não é streaming: o
+        ReportLab só serializa o arquivo no save(), ao fim do build, então o
+        primeiro bloco sai depois da última página.
+        """
+        yield from iter_chunks(self.render_bytes(), chunk_size)
+
+    async def agenerate_pdf(
+        self,
+        output: AsyncWriter | None = None,
+        executor: Executor | None = None,
+        timeout: float | None = None,
+    ) -> bytes | None:
+        """
+        Gera o PDF sem bloquear o event loop: o layout (CPU) roda no executor
+        informado (threads ou processos; padrão: o executor do event loop).
+        :param output: Destino assíncrono (write() aguardável ou StreamWriter).
+            Sem destino, os bytes do PDF são retornados.
+        :param executor: Executor onde o documento será gerado.
+        :param timeout: Tempo máximo (s) de geração; expirado, levanta
+            TimeoutError. Documentos ainda na fila do executor são cancelados;
+            um documento já em execução termina em segundo plano.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        data = await asyncio.wait_for(
+            loop.run_in_executor(executor, self.render_bytes), timeout
+        )
+        if output is None:
+            return data
+        for chunk in iter_chunks(data):
+            await write_async(output, chunk)
+        return None
+
+    async def aiter_pdf_chunks(
+        self, chunk_size: int = DEFAULT_CHUNK_SIZE, executor: Executor | None = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Versão assíncrona de iter_pdf_chunks: o layout roda no executor
+        informado (padrão: o executor do event loop) sem bloquear o loop, e o
+        PDF pronto é entregue em blocos.
+        """
+        data = await self.agenerate_pdf(executor=executor)
+        for chunk in iter_chunks(data, chunk_size):
+            yield chunk
 
 
 if __name__ == "__main__":
@@ -0,0 +1,154 @@
+import inspect
+import io
+import re
+from typing import (TYPE_CHECKING, AsyncIterator, Awaitable, Callable,
+                    Iterator, Protocol)
+from urllib.parse import quote
+
+if TYPE_CHECKING:
+    # asyncio é importado apenas pelas funções assíncronas (~25 ms)
+    import asyncio
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+AsgiSend = Callable[[dict], Awaitable[None]]
+
+# Caracteres de controle (inclusive CR/LF, que injetariam cabeçalhos)
+_CONTROL_CHARS = re.compile(r"[\x00-\x1f\x7f]")
+# Fora do ASCII imprimível ou com significado na sintaxe de filename="..."
+_UNSAFE_ASCII = re.compile(r'[^\x20-\x7e]|["\\]')
+
+# Envios agendados por AsgiSendWriter.close no event loop (o loop guarda
+# apenas referências fracas às tasks)
+_pending_sends: set = set()
+
+
+class AsyncWriter(Protocol):
+    """
+    Destino assíncrono: write() aguardável ou, como no asyncio.StreamWriter,
+    write() síncrono seguido de drain().
+    """
+
+    def write(self, data: bytes): ...
+
+
+def iter_chunks(data: bytes, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Divide o PDF em blocos de até chunk_size bytes, sem copiar o conteúdo.
+    """
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        yield view[start : start + chunk_size]
+
+
+async def write_async(writer: AsyncWriter, data: bytes):
+    """
+    Escreve em um destino assíncrono respeitando o controle de fluxo dele.
+    """
+    result = writer.write(data)
+    if inspect.isawaitable(result):
+        await result
+    elif hasattr(writer, "drain"):
+        await writer.drain()
+
+
+class AsgiSendWriter(io.RawIOBase):
+    """
+    Stream binário que encaminha cada write() para o send de uma resposta
+    ASGI, depois que a aplicação já enviou o http.response.start. Deve ser
+    usado fora do event loop (ex.: na thread que gera o PDF), pois cada
+    escrita aguarda o envio no loop informado; na thread do loop, write()
+    levanta RuntimeError.
+    """
+
+    def __init__(
+        self,
+        send: AsgiSend,
+        loop: "asyncio.AbstractEventLoop",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        super().__init__()
+        self._send = send
+        self._loop = loop
+        self._chunk_size = chunk_size
+
+    def writable(self) -> bool:
+        return True
+
+    def _on_loop_thread(self) -> bool:
+        import asyncio
+
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def _send_body(self, body: bytes, more_body: bool):
+        message = {"type": "http.response.body", "body": body, "more_body": more_body}
+        import asyncio
+
+        if self._on_loop_thread():
+            # Esperar o envio na thread do loop travaria o próprio loop
+            raise RuntimeError("AsgiSendWriter não pode escrever no event loop")
+        asyncio.run_coroutine_threadsafe(self._send(message), self._loop).result()
+
+    def write(self, data) -> int:
+        for chunk in iter_chunks(data, self._chunk_size):
+            self._send_body(bytes(chunk), more_body=True)
+        return len(data)
+
+    def close(self):
+        # close() também é chamado pelo IOBase.__del__, que pode rodar na
+        # thread do loop: nesse caso a mensagem final é apenas agendada
+        if not self.closed:
+            if self._on_loop_thread():
+                message = {
+                    "type": "http.response.body",
+                    "body": b"",
+                    "more_body": False,
+                }
+                task = self._loop.create_task(self._send(message))
+                _pending_sends.add(task)
+                task.add_done_callback(_pending_sends.discard)
+            else:
+                self._send_body(b"", more_body=False)
+        super().close()
+
+
+def content_disposition(filename: str, disposition: str = "inline") -> bytes:
+    """
+    Valor do cabeçalho Content-Disposition (RFC 6266) para o nome sugerido:
+    sem diretórios nem caracteres de controle, com filename ASCII (aspas e
+    caracteres fora do ASCII viram "_") e, se o nome não é ASCII puro, também
+    filename* em UTF-8.
+    :param filename: Nome (ou caminho) do arquivo.
+    :param disposition: "inline" ou "attachment".
+    """
+    name = _CONTROL_CHARS.sub("", filename.replace("\\", "/").rsplit("/", 1)[-1])
+    fallback = _UNSAFE_ASCII.sub("_", name)
+    value = f'{disposition}; filename="{fallback}"'
+    if fallback != name:
+        value += f"; filename*=UTF-8''{quote(name, safe='')}"
+    return value.encode("ascii")
+
+
+async def send_asgi_pdf(
+    send: AsgiSend,
+    chunks: AsyncIterator[bytes],
+    filename: str | None = None,
+):
+    """
+    Envia um PDF como resposta HTTP ASGI, bloco a bloco.
+    :param send: Callable send da aplicação ASGI.
+    :param chunks: Blocos do PDF (ex.: _PDFBase.aiter_pdf_chunks()).
+    :param filename: Nome sugerido para download (Content-Disposition).
+    """
+    headers = [(b"content-type", b"application/pdf")]
+    if filename:
+        headers.append((b"content-disposition", content_disposition(filename)))
+    await send({"type": "http.response.start", "status": 200, "headers": headers})
+    async for chunk in chunks:
+        await send(
+            {"type": "http.response.body", "body": bytes(chunk), "more_body": True}
+        )
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
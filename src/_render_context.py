@@ -0,0 +1,84 @@
+import threading
+from typing import Any, Callable, Hashable, Mapping
+
+from reportlab.platypus import TableStyle
+
+from _compiled_template import CompiledTemplate, compiled_template
+from _results_table import TableStylePreset
+
+
+class RenderContext:
+    """
+    Recursos de renderização compartilhados por todas as famílias de
+    documento com o mesmo tema: estilos de parágrafo (com as fontes já
+    carregadas), estilos de tabela, larguras de coluna e os flowables
+    estáticos comuns (rótulos, observações, assinatura). As imagens de página
+    ficam no cache do processo (ver ImageAssetCache).
+
+    Montado uma única vez por processo e por tema; um lote com vários tipos
+    de certificado paga a preparação do tema uma só vez, e cada família
+    compila apenas as suas partes próprias (ver _PDFBase.template).
+    """
+
+    def __init__(
+        self,
+        key: Hashable,
+        styles: Any,
+        table_styles: Mapping[str, TableStyle | TableStylePreset],
+        column_widths: Mapping[str, tuple[float, ...]],
+        compile: Callable[[], Mapping[str, Any]],
+    ):
+        """
+        :param key: Identifica o tema (ver shared_render_context).
+        :param styles: Conjunto de estilos de parágrafo do tema.
+        :param table_styles: Estilos de tabela por nome; compartilhados, não
+            devem ser alterados.
+        :param column_widths: Larguras das colunas de cada tabela, por nome.
+        :param compile: Monta os protótipos dos flowables estáticos comuns.
+        """
+        self.key = key
+        self.styles = styles
+        self.table_styles = dict(table_styles)
+        self.column_widths = dict(column_widths)
+        self._compile = compile
+
+    @property
+    def template(self) -> CompiledTemplate:
+        """
+        Flowables estáticos comuns às famílias, compilados no primeiro uso
+        (e de novo após clear_compiled_templates).
+        """
+        return compiled_template(("render_context", self.key), self._compile)
+
+
+# Contextos já montados, por chave do tema
+_render_contexts: dict[Hashable, RenderContext] = {}
+_render_contexts_lock = threading.Lock()
+
+
+def shared_render_context(
+    key: Hashable, build: Callable[[Hashable], RenderContext]
+) -> RenderContext:
+    """
+    Retorna o contexto da chave, montando-o apenas na primeira vez.
+    :param key: Tudo o que define os recursos do contexto (fontes, imagens,
+        estilos); famílias com a mesma chave compartilham o contexto.
+    :param build: Monta o contexto a partir da chave.
+    """
+    context = _render_contexts.get(key)
+    if context is None:
+        with _render_contexts_lock:
+            context = _render_contexts.get(key)
+            if context is None:
+                context = build(key)
+                _render_contexts[key] = context
+    return context
+
+
+def clear_render_contexts():
+    """
+    Descarta os contextos montados (ex.: após trocar uma imagem de página
+    ou um estilo de tabela em tempo de execução).
+    """
+    with _render_contexts_lock:
+        _render_contexts.clear()
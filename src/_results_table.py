@@ -0,0 +1,240 @@
+from functools import lru_cache
+from typing import Any, Mapping, Sequence
+
+from reportlab.lib.colors import Color
+from reportlab.platypus import Flowable, Table, TableStyle
+from reportlab.platypus.doctemplate import LayoutError
+from reportlab.platypus.tables import CellStyle
+
+
+def fit_style(style: TableStyle, row_count: int) -> TableStyle:
+    """
+    Descarta (ou limita) os comandos do estilo que apontam para linhas que
+    não existem na tabela, como o fundo da linha 3 em um bloco com 3 linhas.
+    """
+    fitted = []
+    changed = False
+    for command in style.getCommands():
+        (_, start_row), (stop_col, stop_row) = command[1], command[2]
+        if start_row >= row_count:
+            changed = True
+            continue
+        if stop_row >= row_count:
+            changed = True
+            command = (command[0], command[1], (stop_col, -1), *command[3:])
+        fitted.append(command)
+    return TableStyle(fitted) if changed else style
+
+
+class TableStylePreset:
+    """
+    Estilo pré-compilado das tabelas de resultados, reutilizado por todos os
+    blocos de todas as tabelas que o usam (resultados e resumo).
+
+    Para cada formato de bloco (colunas x linhas) são montados uma única vez
+    o TableStyle, com as faixas de fundo alternadas geradas para o número de
+    linhas do bloco, e a grade de estilos de célula. Todas as células
+    compartilham o mesmo CellStyle: a Table não precisa criar um estilo por
+    célula nem aplicar ALIGN/VALIGN célula a célula, que era a maior parte do
+    custo de montar cada bloco.
+    """
+
+    def __init__(
+        self,
+        commands: Sequence[tuple],
+        cell_style: Mapping[str, Any],
+        band_color: Color | None = None,
+        first_band_row: int = 1,
+    ):
+        """
+        :param commands: Comandos de linha e de fundo, com índices que valem
+            para qualquer tamanho de tabela (ex.: (-1, -1)).
+        :param cell_style: Atributos do CellStyle de todas as células (ex.:
+            {"alignment": "CENTER", "valign": "MIDDLE"}).
+        :param band_color: Cor das faixas alternadas (None: sem faixas).
+        :param first_band_row: Primeira linha com faixa; as seguintes são
+            alternadas a partir dela.
+        """
+        self.commands = tuple(commands)
+        self.cell_style = CellStyle("preset")
+        for name, value in cell_style.items():
+            setattr(self.cell_style, name, value)
+        self.band_color = band_color
+        self.first_band_row = first_band_row
+
+    def compiled(
+        self, column_count: int, row_count: int
+    ) -> tuple[TableStyle, list[list[CellStyle]]]:
+        """
+        TableStyle e grade de estilos de célula de um bloco. Compartilhados:
+        a Table que os recebe não deve receber outros comandos de célula.
+        """
+        return _compiled_preset(self, column_count, row_count)
+
+
+# Os blocos de uma ResultsTable têm poucos formatos distintos (página
+# inteira, sobra da primeira página e último bloco), então o número exato de
+# linhas já agrupa os blocos
+@lru_cache(maxsize=256)
+def _compiled_preset(
+    preset: TableStylePreset, column_count: int, row_count: int
+) -> tuple[TableStyle, list[list[CellStyle]]]:
+    bands = []
+    if preset.band_color is not None:
+        bands = [
+            ("BACKGROUND", (0, row), (-1, row), preset.band_color)
+            for row in range(preset.first_band_row, row_count, 2)
+        ]
+    style = fit_style(TableStyle([*preset.commands, *bands]), row_count)
+    cells = [preset.cell_style] * column_count
+    return style, [cells] * row_count
+
+
+def _block_style(
+    style: TableStyle | TableStylePreset, column_count: int, row_count: int
+) -> tuple[TableStyle, list[list[CellStyle]] | None]:
+    if isinstance(style, TableStylePreset):
+        return style.compiled(column_count, row_count)
+    return fit_style(style, row_count), None
+
+
+@lru_cache(maxsize=64)
+def data_row_height(
+    style: TableStyle | TableStylePreset, column_count: int, header_count: int
+) -> float:
+    """
+    Altura de uma linha de dados com o estilo compilado do bloco: leading da
+    fonte mais os paddings superior e inferior da célula, medidos pela
+    própria Table em um bloco com uma única linha de texto simples.
+    """
+    row_count = header_count + 1
+    block_style, cell_styles = _block_style(style, column_count, row_count)
+    table = Table(
+        [[""] * column_count] * header_count + [["0"] * column_count],
+        colWidths=[1] * column_count,
+        cellStyles=cell_styles,
+    )
+    table.setStyle(block_style)
+    table.wrap(column_count, 0)
+    return table._rowHeights[-1]
+
+
+class ResultsTable(Flowable):
+    """
+    Tabela de resultados que pode ter milhares de linhas.
+
+    Em vez de uma única Table gigante (cujo split recalcula todas as linhas a
+    cada página), a tabela é quebrada em blocos do tamanho do espaço
+    disponível na página, cada um com as linhas de cabeçalho repetidas. As
+    linhas de dados são strings de uma única linha, com a mesma altura, então
+    o número de linhas que cabe em uma página é calculado sem medir células e
+    o custo de layout cresce de forma linear com o número de linhas.
+    """
+
+    def __init__(
+        self,
+        header_rows: list[list],
+        rows: Sequence[Sequence[str]],
+        col_widths: Sequence[float],
+        style: TableStyle | TableStylePreset,
+        row_height: float | None = None,
+        h_align: str = "LEFT",
+        start: int = 0,
+        stop: int | None = None,
+        _header_height: float | None = None,
+    ):
+        """
+        :param header_rows: Linhas de cabeçalho, repetidas em cada página.
+        :param rows: Linhas de dados (strings simples, sem quebra de linha).
+        :param col_widths: Largura de cada coluna.
+        :param style: Estilo aplicado a cada bloco; compartilhado, não é
+            alterado.
+        :param row_height: Altura das linhas de dados (None: medida com o
+            estilo, ver data_row_height).
+        :param h_align: Alinhamento horizontal da tabela.
+        :param start: Primeira linha de dados deste bloco.
+        :param stop: Fim (exclusivo) das linhas de dados deste bloco.
+        """
+        super().__init__()
+        self.header_rows = header_rows
+        self.rows = rows
+        self.col_widths = list(col_widths)
+        self.style = style
+        if row_height is None:
+            row_height = data_row_height(style, len(self.col_widths), len(header_rows))
+        self.row_height = row_height
+        self.hAlign = h_align
+        self.start = start
+        self.stop = len(rows) if stop is None else stop
+        self._header_height = _header_height
+
+    def __repr__(self):
+        return f"<ResultsTable rows {self.start}:{self.stop} of {len(self.rows)}>"
+
+    @property
+    def row_count(self) -> int:
+        return self.stop - self.start
+
+    def _slice(self, start: int, stop: int) -> "ResultsTable":
+        return ResultsTable(
+            self.header_rows,
+            self.rows,
+            self.col_widths,
+            self.style,
+            self.row_height,
+            self.hAlign,
+            start,
+            stop,
+            self._header_height,
+        )
+
+    def header_height(self, available_width: float) -> float:
+        if self._header_height is None:
+            header = Table(self.header_rows, colWidths=self.col_widths)
+            self._header_height = header.wrap(available_width, 0)[1]
+        return self._header_height
+
+    def wrap(self, availWidth, availHeight):
+        self.width = sum(self.col_widths)
+        self.height = self.header_height(availWidth) + self.row_count * self.row_height
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        header_height = self.header_height(availWidth)
+        fit = int((availHeight - header_height) // self.row_height)
+        if fit <= 0:
+            frame = getattr(self, "_frame", None)
+            if frame is not None and frame._atTop:
+                # Em um frame vazio devolver [] faria o platypus tentar de
+                # novo no próximo frame, igual a este
+                raise LayoutError(
+                    f"{self!r}: o cabeçalho e uma linha de dados "
+                    f"({header_height + self.row_height:.1f} pt) não cabem "
+                    f"em um frame vazio ({availHeight:.1f} pt)"
+                )
+            # Nem o cabeçalho com uma linha cabe aqui: vai para o próximo frame
+            return []
+        if fit >= self.row_count:
+            return [self]
+        middle = self.start + fit
+        return [self._slice(self.start, middle), self._slice(middle, self.stop)]
+
+    def _table(self) -> Table:
+        header_count = len(self.header_rows)
+        style, cell_styles = _block_style(
+            self.style, len(self.col_widths), header_count + self.row_count
+        )
+        table = Table(
+            self.header_rows + [list(row) for row in self.rows[self.start : self.stop]],
+            colWidths=self.col_widths,
+            rowHeights=[None] * header_count + [self.row_height] * self.row_count,
+            hAlign=self.hAlign,
+            cellStyles=cell_styles,
+        )
+        table.setStyle(style)
+        return table
+
+    def draw(self):
+        table = self._table()
+        table.wrapOn(self.canv, self.width, self.height)
+        table.drawOn(self.canv, 0, 0)
@@ -0,0 +1,134 @@
+import asyncio
+import time
+import traceback
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Iterable
+
+from _pdf_base import _PDFBase
+from _pdf_stream import AsyncWriter, iter_chunks, write_async
+from batch_generation import RecordResult, warm_up
+from certificate_without_humidity import CertificateWithoutHumidity
+
+
+@dataclass(frozen=True)
+class DocumentResult(RecordResult):
+    """
+    Resultado da geração assíncrona de um documento, com os bytes do PDF.
+    """
+
+    data: bytes | None = field(default=None, repr=False)
+
+
+def process_executor(
+    max_workers: int | None = None,
+    certificate_cls: type[_PDFBase] = CertificateWithoutHumidity,
+) -> ProcessPoolExecutor:
+    """
+    Pool de processos já preparados (warm_up) para gerar certificados.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers, initializer=warm_up, initargs=(certificate_cls,)
+    )
+
+
+class AsyncRenderer:
+    """
+    Gera documentos a partir de código asyncio sem bloquear o event loop.
+
+    O layout roda no executor configurado (threads ou processos) e um
+    semáforo limita quantos documentos são gerados ao mesmo tempo; uma única
+    instância pode ser compartilhada por todas as requisições do servidor.
+    """
+
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        max_concurrency: int = 4,
+        timeout: float | None = None,
+    ):
+        """
+        :param executor: Executor do layout (padrão: o executor do event loop).
+        :param max_concurrency: Máximo de documentos sendo gerados ao mesmo
+            tempo; as demais chamadas aguardam a vez.
+        :param timeout: Tempo máximo (s) de geração de cada documento, sem
+            contar a espera pelo semáforo (ver render).
+        """
+        self.executor = executor
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._max_concurrency = max_concurrency
+
+    async def render(
+        self, document: _PDFBase, output: AsyncWriter | None = None
+    ) -> bytes | None:
+        """
+        Gera um documento. Sem output, retorna os bytes do PDF.
+        Expirado o timeout, levanta TimeoutError; o documento termina em
+        segundo plano e continua contando no limite de max_concurrency.
+        """
+        await self._semaphore.acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, document.render_bytes)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        # A vaga só é liberada quando o executor termina o documento: depois
+        # de um timeout ou cancelamento, o layout continua em execução e
+        # ainda ocupa um worker
+        future.add_done_callback(lambda _: self._semaphore.release())
+        data = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        if output is None:
+            return data
+        for chunk in iter_chunks(data):
+            await write_async(output, chunk)
+        return None
+
+    async def _render_result(self, index: int, document: _PDFBase) -> DocumentResult:
+        start = time.perf_counter()
+        try:
+            data = await self.render(document)
+        except Exception as error:
+            return DocumentResult(
+                index=index,
+                filename=document.filename,
+                seconds=time.perf_counter() - start,
+                error="".join(traceback.format_exception_only(error)).strip(),
+            )
+        return DocumentResult(
+            index=index,
+            filename=document.filename,
+            seconds=time.perf_counter() - start,
+            data=data,
+        )
+
+    async def render_batch(
+        self, documents: Iterable[_PDFBase]
+    ) -> AsyncIterator[DocumentResult]:
+        """
+        Gera um lote de documentos, entregando cada resultado assim que fica
+        pronto (ordem de conclusão). Erros e timeouts ficam no resultado do
+        próprio documento. Se o consumidor cancelar ou abandonar a iteração,
+        os documentos que ainda aguardam o semáforo são cancelados; os que já
+        estão no executor terminam em segundo plano.
+        """
+        pending: set[asyncio.Task] = set()
+        try:
+            for index, document in enumerate(documents):
+                if len(pending) >= self._max_concurrency:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        yield task.result()
+                pending.add(asyncio.create_task(self._render_result(index, document)))
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,419 @@
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field, replace
+from typing import Iterable, Iterator
+
+from _certificate_registry import certificate_types, resolve_record
+from _output_cache import DiskPDFCache, PDFCache
+from _pdf_base import _PDFBase
+from certificate_without_humidity import CertificateWithoutHumidity
+
+
+@dataclass(frozen=True)
+class RecordResult:
+    """
+    Resultado da geração de um certificado do lote.
+    """
+
+    index: int
+    filename: str | None
+    seconds: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchSummary:
+    """
+    Resumo de vazão e latência de um lote de certificados.
+    """
+
+    total: int = 0
+    succeeded: int = 0
+    elapsed: float = 0.0
+    latencies: list[float] = field(default_factory=list, repr=False)
+    failures: list[RecordResult] = field(default_factory=list)
+
+    @property
+    def failed(self) -> int:
+        return len(self.failures)
+
+    @property
+    def throughput(self) -> float:
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, percent: float) -> float:
+        if not self.latencies:
+            return 0.0
+        if len(self.latencies) == 1:
+            return self.latencies[0]
+        import statistics
+
+        cuts = statistics.quantiles(self.latencies, n=100, method="inclusive")
+        return cuts[min(max(int(percent) - 1, 0), len(cuts) - 1)]
+
+    def add(self, result: RecordResult):
+        self.total += 1
+        self.latencies.append(result.seconds)
+        if result.ok:
+            self.succeeded += 1
+        else:
+            self.failures.append(result)
+
+    def as_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "elapsed_s": round(self.elapsed, 4),
+            "throughput_per_s": round(self.throughput, 2),
+            "latency_p50_s": round(self.percentile(50), 4),
+            "latency_p95_s": round(self.percentile(95), 4),
+            "latency_p99_s": round(self.percentile(99), 4),
+            "latency_max_s": round(max(self.latencies, default=0.0), 4),
+        }
+
+    def format(self) -> str:
+        data = self.as_dict()
+        lines = [
+            f"Certificados: {data['total']} "
+            f"(ok: {data['succeeded']}, falhas: {data['failed']})",
+            f"Tempo total: {data['elapsed_s']:.2f}s "
+            f"({data['throughput_per_s']:.2f} certificados/s)",
+            f"Latência p50/p95/p99/máx: {data['latency_p50_s']:.4f}s / "
+            f"{data['latency_p95_s']:.4f}s / {data['latency_p99_s']:.4f}s / "
+            f"{data['latency_max_s']:.4f}s",
+        ]
+        for failure in self.failures:
+            lines.append(f"  registro {failure.index}: {failure.error}")
+        return "\n".join(lines)
+
+
+_worker_certificate_cls: type[_PDFBase] = CertificateWithoutHumidity
+
+
+def warm_up(
+    certificate_cls: type[_PDFBase] = CertificateWithoutHumidity,
+    families: Iterable[type[_PDFBase]] | None = None,
+):
+    """
+    Prepara o processo para gerar muitos documentos: carrega as métricas das
+    fontes, os estilos de parágrafo, as imagens de cabeçalho e rodapé e os
+    templates compilados. As famílias com o mesmo tema compartilham o
+    contexto de renderização (ver CalibrationCertificate.render_context),
+    preparado uma única vez.
+    :param certificate_cls: Classe dos registros que não informam o tipo.
+    :param families: Demais classes que o processo pode gerar, escolhidas
+        pelo campo certificate_type dos registros (padrão: todas as
+        registradas).
+    """
+    global _worker_certificate_cls
+    _worker_certificate_cls = certificate_cls
+
+    if families is None:
+        families = certificate_types().values()
+    for family in dict.fromkeys((certificate_cls, *families)):
+        family.warm_up()
+
+
+def render_record(
+    index: int,
+    record: dict | _PDFBase,
+    trusted: bool = False,
+    cache: PDFCache | None = None,
+    archival: bool = False,
+) -> RecordResult:
+    """
+    Gera um certificado a partir de um registro, isolando qualquer erro no
+    resultado do próprio registro.
+    :param index: Posição do registro no lote.
+    :param record: Dados do certificado; o campo opcional certificate_type
+        escolhe a família (ver register_certificate). Um certificado já
+        validado (ex.: vindo da ingestão de leituras) é gerado como está.
+    :param trusted: Pula a validação (ver _PDFBase.from_trusted).
+    :param cache: Cache de PDFs; certificados já gerados são apenas copiados.
+    :param archival: Gera no modo de arquivamento (PDF/A-2b).
+    """
+    start = time.perf_counter()
+    filename = record.get("filename") if isinstance(record, dict) else None
+    try:
+        if isinstance(record, _PDFBase):
+            pdf = record
+        else:
+            certificate_cls, record = resolve_record(record, _worker_certificate_cls)
+            if trusted:
+                pdf = certificate_cls.from_trusted(record)
+            else:
+                pdf = certificate_cls.model_validate(record)
+        filename = pdf.filename
+        pdf.generate_pdf(cache=cache, archival=archival)
+    except Exception as error:
+        return RecordResult(
+            index=index,
+            filename=filename,
+            seconds=time.perf_counter() - start,
+            error="".join(traceback.format_exception_only(error)).strip(),
+        )
+    return RecordResult(
+        index=index, filename=filename, seconds=time.perf_counter() - start
+    )
+
+
+def record_with_filename(
+    record: dict | _PDFBase, number: int, output_dir: str | None = None
+) -> dict | _PDFBase:
+    """
+    Define o arquivo de saída de um registro do lote. Registros sem filename
+    recebem certificado_<número>.pdf: o padrão do modelo é o mesmo para todos
+    e cada certificado sobrescreveria o anterior.
+    :param record: Registro (dict) ou certificado já validado.
+    :param number: Número único do registro (posição no lote, id do job).
+    :param output_dir: Diretório onde o arquivo será gravado.
+    """
+    default = f"certificado_{number:06d}.pdf"
+    if isinstance(record, _PDFBase):
+        if "filename" in record.model_fields_set:
+            filename = record.filename
+        else:
+            filename = default
+        if output_dir is not None:
+            filename = os.path.join(output_dir, filename)
+        return record.model_copy(update={"filename": filename})
+    if isinstance(record, dict):
+        filename = record.get("filename") or default
+        if isinstance(filename, str):
+            if output_dir is not None:
+                filename = os.path.join(output_dir, filename)
+            return {**record, "filename": filename}
+    return record
+
+
+def generate_batch(
+    records: Iterable[dict | _PDFBase | RecordResult],
+    certificate_cls: type[_PDFBase] = CertificateWithoutHumidity,
+    max_workers: int | None = None,
+    max_in_flight: int | None = None,
+    output_dir: str | None = None,
+    trusted: bool = False,
+    cache: PDFCache | None = None,
+    archival: bool = False,
+) -> BatchSummary:
+    """
+    Gera um lote de certificados distribuindo os registros entre processos.
+    Cada processo é preparado uma única vez (warm_up) e gera muitos documentos.
+    :param records: Iterável de registros (dicts) ou de certificados já
+        validados, consumido sob demanda. Um lote pode misturar famílias pelo
+        campo certificate_type. Um RecordResult (linha inválida de
+        read_jsonl) entra no resumo como a falha daquele registro.
+    :param certificate_cls: Classe dos registros que não informam o tipo.
+    :param max_workers: Número de processos (padrão: número de CPUs).
+    :param max_in_flight: Máximo de registros enviados e ainda não concluídos
+        (padrão: 4 por processo).
+    :param output_dir: Diretório onde os arquivos serão gravados. Registros
+        sem filename são numerados (ver record_with_filename).
+    :param trusted: Registros com os submodelos já instanciados; pula a
+        validação do pydantic (ver _PDFBase.from_trusted).
+    :param cache: Cache de PDFs compartilhado pelos processos (ex.:
+        DiskPDFCache); precisa poder ser enviado por pickle.
+    :param archival: Gera no modo de arquivamento (PDF/A-2b).
+    :return: Resumo de vazão, latência e falhas do lote.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 4 * max_workers
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    # Importado aqui: concurrent.futures.process custa ~25 ms no import do CLI
+    from concurrent.futures import ProcessPoolExecutor
+
+    summary = BatchSummary()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=warm_up,
+        initargs=(certificate_cls,),
+    ) as executor:
+        in_flight: set[Future] = set()
+        for index, record in enumerate(records):
+            if isinstance(record, RecordResult):
+                summary.add(replace(record, index=index))
+                continue
+            record = record_with_filename(record, index, output_dir)
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    summary.add(future.result())
+            in_flight.add(
+                executor.submit(render_record, index, record, trusted, cache, archival)
+            )
+        for future in wait(in_flight).done:
+            summary.add(future.result())
+    summary.elapsed = time.perf_counter() - start
+    summary.failures.sort(key=lambda result: result.index)
+    return summary
+
+
+def _invalid_line(number: int, reason: str) -> RecordResult:
+    return RecordResult(number, None, 0.0, f"Linha {number}: {reason}")
+
+
+def read_jsonl(path: str) -> Iterator[dict | RecordResult]:
+    """
+    Lê registros de um arquivo JSONL (um objeto JSON por linha) sob demanda.
+    Uma linha que não é um objeto JSON não interrompe a leitura: no lugar do
+    registro vem um RecordResult com o erro e o número da linha (em index).
+    :param path: Caminho do arquivo, ou "-" para a entrada padrão.
+    """
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as error:
+                yield _invalid_line(number, f"JSON inválido ({error})")
+                continue
+            if not isinstance(record, dict):
+                yield _invalid_line(number, "o registro não é um objeto JSON")
+                continue
+            yield record
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def valid_records(
+    records: Iterable[dict | RecordResult], invalid: list[RecordResult]
+) -> Iterator[dict]:
+    """
+    Registros válidos de read_jsonl. As linhas inválidas são informadas no
+    stderr e guardadas em invalid, sem interromper a leitura.
+    """
+    for record in records:
+        if isinstance(record, RecordResult):
+            print(record.error, file=sys.stderr)
+            invalid.append(record)
+        else:
+            yield record
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Gera certificados em lote a partir de um arquivo JSONL."
+    )
+    parser.add_argument("records", help='arquivo JSONL de registros ("-" = stdin)')
+    parser.add_argument("-o", "--output-dir", default=".", help="diretório de saída")
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="resumo em JSON")
+    parser.add_argument(
+        "--cache-dir", help="cache de PDFs: reaproveita certificados já gerados"
+    )
+    parser.add_argument(
+        "--cache-max-mb", type=int, default=512, help="tamanho máximo do cache"
+    )
+    parser.add_argument(
+        "--readings",
+        action="store_true",
+        help="o arquivo tem leituras brutas (CSV, JSONL ou Parquet), agrupadas "
+        "em um certificado por nº de série",
+    )
+    parser.add_argument(
+        "--base",
+        metavar="JSON",
+        help="com --readings: arquivo JSON com os campos comuns aos certificados",
+    )
+    parser.add_argument(
+        "--delimiter", default=",", help='com --readings: separador do CSV (ex.: ";")'
+    )
+    parser.add_argument(
+        "--decimal", default=".", help="com --readings: separador decimal do CSV"
+    )
+    parser.add_argument(
+        "--merge",
+        metavar="ARQUIVO",
+        help="gera todos os certificados em um único PDF (no diretório de saída)",
+    )
+    parser.add_argument(
+        "--archival",
+        action="store_true",
+        help="gera PDF/A-2b (fontes embutidas, perfil ICC e metadados XMP)",
+    )
+    args = parser.parse_args(argv)
+    if args.archival and args.merge:
+        parser.error("--archival não é suportado com --merge")
+
+    certificates = None
+    if args.readings:
+        # Importado aqui: numpy só é necessário para as leituras brutas
+        from ingestion import iter_certificates
+
+        base = None
+        if args.base:
+            with open(args.base, encoding="utf-8") as file:
+                base = json.load(file)
+        certificates = iter_certificates(
+            args.records, base, delimiter=args.delimiter, decimal=args.decimal
+        )
+
+    if args.merge:
+        os.makedirs(args.output_dir, exist_ok=True)
+        invalid: list[RecordResult] = []
+        if certificates is None:
+            certificates = (
+                certificate_cls.model_validate(record)
+                for certificate_cls, record in (
+                    resolve_record(record, CertificateWithoutHumidity)
+                    for record in valid_records(read_jsonl(args.records), invalid)
+                )
+            )
+        CertificateWithoutHumidity.generate_merged(
+            certificates, os.path.join(args.output_dir, args.merge)
+        )
+        return 1 if invalid else 0
+
+    cache = None
+    if args.cache_dir:
+        cache = DiskPDFCache(args.cache_dir, max_bytes=args.cache_max_mb * 2**20)
+
+    # Certificados já validados na leitura são enviados como estão (pickle):
+    # os processos não revalidam
+    records = read_jsonl(args.records) if certificates is None else certificates
+
+    summary = generate_batch(
+        records,
+        max_workers=args.workers,
+        max_in_flight=args.max_in_flight,
+        output_dir=args.output_dir,
+        cache=cache,
+        archival=args.archival,
+    )
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    **summary.as_dict(),
+                    "failures": [
+                        {"index": failure.index, "error": failure.error}
+                        for failure in summary.failures
+                    ],
+                },
+                ensure_ascii=False,
+            )
+        )
+    else:
+        print(summary.format())
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,730 @@
+import os
+import textwrap
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING, Callable, ClassVar, Iterator, Sequence
+from xml.sax.saxutils import escape
+
+from pydantic import BaseModel as PydanticBaseModel
+from pydantic import ConfigDict
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import getFont
+from reportlab.platypus import (Flowable, Image, PageBreak, Paragraph, Spacer,
+                                Table, TableStyle)
+
+from _pdf_base import BASE_DIR, _PDFBase
+from _render_context import RenderContext, shared_render_context
+from _results_table import ResultsTable, TableStylePreset
+from paragraph_style_gota import ParagraphStylesGota
+
+if TYPE_CHECKING:
+    from _archival import DocumentMetadata
+
+
+def format_decimal(value: float, decimals: int = 2) -> str:
+    """
+    Formata um número no padrão brasileiro (vírgula como separador decimal).
+    """
+    # Soma 0.0 para não exibir "-0,00"
+    return f"{round(value, decimals) + 0.0:.{decimals}f}".replace(".", ",")
+
+
+def format_date(value: date) -> str:
+    return value.strftime("%d/%m/%Y")
+
+
+class Requester(PydanticBaseModel):
+    """
+    Solicitante da calibração.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    name: str = "Hemorio"
+    address: str = "Rua Frei Caneca, 8 - Centro, Rio de Janeiro - RJ, 20211-030"
+
+
+class Instrument(PydanticBaseModel):
+    """
+    Objeto de calibração.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    description: str = "Termômetro"
+    brand: str = "Senfio"
+    model: str = "EXPLORER"
+    serial_number: str = "0637"
+
+
+class CalibrationData(PydanticBaseModel):
+    """
+    Datas e local da calibração.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    calibration_date: date = date(2024, 5, 23)
+    issue_date: date = date(2025, 4, 24)
+    location: str = "Senfio Soluções Tecnológicas"
+
+
+class AmbientConditions(PydanticBaseModel):
+    """
+    Condições ambientais durante a calibração.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    temperature: float = 26.0  # °C
+    temperature_uncertainty: float = 1.0  # °C
+
+
+class CalibrationStandard(PydanticBaseModel):
+    """
+    Padrão utilizado na calibração.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    description: str = "Termohigrômetro"
+    model: str = "Explorer"
+    brand: str = "Senfio"
+    usage_range: str = "-100°C a 100°C"
+    certificate_number: str = "7XVH1M24"
+    calibration_date: date = date(2025, 1, 23)
+    serial_number: str = "0112"
+    resolution: float = 0.1  # °C
+
+
+class MeasurementPoint(PydanticBaseModel):
+    """
+    Ponto de calibração da tabela de resultados.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    vvc: float  # Valor Verdadeiro Convencional
+    vml: float  # Valor Médio das Leituras
+    uc: float  # Incerteza combinada
+    k: float = 2.0  # Fator de abrangência
+
+    @property
+    def error(self) -> float:
+        return self.vml - self.vvc
+
+    @property
+    def ue(self) -> float:
+        # Incerteza expandida
+        return self.k * self.uc
+
+
+# Proporção da largura útil ocupada por cada coluna das tabelas
+RESULTS_COLUMN_FRACTIONS = (0.2, 0.16, 0.16, 0.16, 0.16, 0.16)
+SUMMARY_COLUMN_FRACTIONS = (0.25, 0.75)
+
+# Estilo compartilhado pelas tabelas de resultados e de resumo: apenas linhas
+# verticais, conteúdo centralizado e faixas alternadas a partir da linha das
+# unidades (índice 1)
+RESULTS_TABLE_STYLE = TableStylePreset(
+    [("LINEBEFORE", (1, 0), (-1, -1), 0.5, colors.HexColor("#d0f0f8"))],
+    cell_style={"alignment": "CENTER", "valign": "MIDDLE"},
+    band_color=colors.HexColor("#d0f0f8"),
+)
+
+
+# Estilo da tabela de duas colunas (dados da calibração e condições
+# ambientais): alinhamento no topo, sem bordas
+CALIBRATION_TABLE_STYLE = TableStyle(
+    [
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),  # Alinha conteúdo verticalmente ao topo
+        ("LEFTPADDING", (0, 0), (-1, -1), 0),  # Remove espaçamento à esquerda
+        ("RIGHTPADDING", (0, 0), (-1, -1), 6),  # Pequeno espaço à direita
+        ("TOPPADDING", (0, 0), (-1, -1), 0),  # Sem padding superior
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
+        ("BOX", (0, 0), (-1, -1), 0, colors.white),  # Sem bordas
+        ("INNERGRID", (0, 0), (-1, -1), 0, colors.white),
+    ]
+)
+
+
+def column_widths(fractions: tuple[float, ...], max_width: float) -> tuple[float, ...]:
+    return tuple(fraction * max_width for fraction in fractions)
+
+
+# A partir deste número de pontos a tabela de resultados é formatada com
+# NumPy, importado apenas nesse caso (o import custa ~150 ms)
+VECTORIZED_MIN_POINTS = 64
+
+
+def results_rows(points: Sequence[MeasurementPoint]) -> list[Sequence[str]]:
+    """
+    Células formatadas da tabela de resultados (VVC, VML, Erro, Uc, K, Ue),
+    calculadas uma única vez e usadas pelas tabelas de resultados e de resumo.
+    """
+    if len(points) < VECTORIZED_MIN_POINTS:
+        return [
+            (
+                format_decimal(point.vvc),
+                format_decimal(point.vml),
+                format_decimal(point.error),
+                format_decimal(point.uc),
+                format_decimal(point.k),
+                format_decimal(point.ue),
+            )
+            for point in points
+        ]
+
+    from _metrology import results_table
+
+    return results_table(
+        [point.vvc for point in points],
+        [point.vml for point in points],
+        [point.uc for point in points],
+        [point.k for point in points],
+    )
+
+
+def summary_row(row: Sequence[str]) -> tuple[str, str]:
+    """
+    Linha da tabela de resumo (VVC, medição final) a partir da linha de
+    resultados.
+    """
+    vvc, vml, _, uc, _, _ = row
+    return vvc, f"{vml} com Uc = {uc}"
+
+
+# Pontos convertidos em linhas de cada vez pelas ResultRows
+RESULT_ROWS_BLOCK = 1024
+
+
+class FormattedPoints:
+    """
+    Células da tabela de resultados de uma grandeza (ver results_rows),
+    formatadas uma única vez, no primeiro acesso, e compartilhadas pelas
+    tabelas de resultados e de resumo.
+
+    Em documentos longos as células ficam em um array de bytes do NumPy
+    (results_cells, poucas dezenas de bytes por ponto) e só o trecho pedido
+    vira str.
+    """
+
+    def __init__(self, points: Sequence[MeasurementPoint]):
+        """
+        :param points: Pontos de calibração da grandeza.
+        """
+        self.points = points
+        self._cells = None
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def rows(self, start: int, stop: int) -> list[Sequence[str]]:
+        """
+        Linhas de resultados dos pontos [start, stop).
+        """
+        if len(self.points) < VECTORIZED_MIN_POINTS:
+            if self._cells is None:
+                self._cells = results_rows(self.points)
+            return self._cells[start:stop]
+
+        if self._cells is None:
+            from _metrology import results_cells
+
+            points = self.points
+            self._cells = results_cells(
+                [point.vvc for point in points],
+                [point.vml for point in points],
+                [point.uc for point in points],
+                [point.k for point in points],
+            )
+        return self._cells[start:stop].astype(str).tolist()
+
+
+class ResultRows(Sequence):
+    """
+    Linhas de uma tabela de resultados montadas sob demanda, em blocos de
+    RESULT_ROWS_BLOCK pontos, a partir das células de FormattedPoints.
+
+    A ResultsTable lê as linhas de cada página em sequência, então apenas o
+    bloco atual fica em memória como str; as células formatadas são as
+    mesmas para a tabela de resultados e a de resumo.
+    """
+
+    def __init__(
+        self,
+        points: FormattedPoints,
+        row: Callable[[Sequence[str]], Sequence[str]] | None = None,
+    ):
+        """
+        :param points: Células formatadas dos pontos da tabela.
+        :param row: Converte cada linha de resultados na linha da tabela
+            (ex.: summary_row); por padrão a linha de resultados inteira.
+        """
+        self.points = points
+        self.row = row
+        self._block_start = 0
+        self._block: list[Sequence[str]] = []
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _format(self, start: int, stop: int) -> list[Sequence[str]]:
+        rows = self.points.rows(start, stop)
+        if self.row is not None:
+            rows = [self.row(row) for row in rows]
+        return rows
+
+    def _load(self, start: int, stop: int):
+        if not (
+            self._block_start <= start and stop <= self._block_start + len(self._block)
+        ):
+            self._block_start = start
+            self._block = self._format(start, max(stop, start + RESULT_ROWS_BLOCK))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1 or stop - start > RESULT_ROWS_BLOCK:
+                # Leitura avulsa da tabela inteira (ex.: impressão digital)
+                if step == 1:
+                    return self._format(start, stop)
+                return self._format(0, len(self))[index]
+            stop = max(start, stop)
+            self._load(start, stop)
+            offset = start - self._block_start
+            return self._block[offset : offset + stop - start]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        self._load(index, index + 1)
+        return self._block[index - self._block_start]
+
+
+DEFAULT_MEASUREMENT_POINTS = (
+    MeasurementPoint(vvc=-20.0, vml=-21.13, uc=0.34),
+    MeasurementPoint(vvc=0.0, vml=-0.47, uc=0.34),
+    MeasurementPoint(vvc=20.0, vml=19.77, uc=0.34),
+)
+
+
+@dataclass(frozen=True)
+class Quantity:
+    """
+    Grandeza calibrada: cada uma tem a sua tabela de resultados e o seu
+    resumo.
+    """
+
+    name: str  # Identifica a grandeza nas chaves do template
+    label: str  # Nome exibido (ex.: "Temperatura")
+    unit: str  # Unidade das colunas da tabela (ex.: "°C")
+
+
+TEMPERATURE = Quantity("temperature", "Temperatura", "°C")
+
+# Procedimento padrão: medições repetidas em cada ponto ({readings} vezes)
+PROCEDURES_TEXT = textwrap.dedent(
+    """\
+    A calibração foi conduzida em um meio termostático com incerteza conhecida, onde foram realizadas 
+    {readings} medições em cada ponto. Neste certificado foi representado o valor médio dessas {readings} medições. 
+    Todas as instruções foram executadas conforme o documento interno Norma-04 da Senfio.
+"""
+)
+
+
+class CalibrationCertificate(_PDFBase):
+    """
+    Base das famílias de certificado de calibração (temperatura, umidade,
+    pressão, grandezas elétricas). O layout é o mesmo para todas; cada
+    família define as grandezas calibradas (quantities), os pontos de cada
+    uma, as condições ambientais e o texto dos procedimentos.
+
+    Estilos, fontes, imagens, estilos de tabela e os flowables estáticos
+    comuns ficam no contexto de renderização compartilhado (render_context),
+    montado uma única vez por processo para todas as famílias do mesmo tema.
+    """
+
+    filename: str = "certificado.pdf"
+    number: str = "2290"
+    norm_reference: str = "04_00"
+    requester: Requester = Requester()
+    instrument: Instrument = Instrument()
+    calibration: CalibrationData = CalibrationData()
+    ambient_conditions: AmbientConditions = AmbientConditions()
+    standard: CalibrationStandard = CalibrationStandard()
+    readings_per_point: int = 5
+    measurement_points: tuple[MeasurementPoint, ...] = DEFAULT_MEASUREMENT_POINTS
+
+    # Grandezas calibradas, na ordem das tabelas de resultados
+    quantities: ClassVar[tuple[Quantity, ...]] = (TEMPERATURE,)
+    procedures_text: ClassVar[str] = PROCEDURES_TEXT
+    # Tema de fontes dos parágrafos (ex.: ParagraphStylesVera)
+    paragraph_styles: ClassVar[type[ParagraphStylesGota]] = ParagraphStylesGota
+    results_table_style: ClassVar[TableStylePreset] = RESULTS_TABLE_STYLE
+    calibration_table_style: ClassVar[TableStyle] = CALIBRATION_TABLE_STYLE
+    signature_image_path: ClassVar[str] = os.path.join(
+        BASE_DIR, "images", "assignElyr.png"
+    )
+
+    @classmethod
+    def render_context_key(cls) -> tuple:
+        """
+        Configurações das quais o contexto de renderização depende: página,
+        imagens, fontes e assinatura.
+        """
+        return (
+            *super().template_key(),
+            cls.paragraph_styles.font_name,
+            cls.paragraph_styles.font_bold_name,
+            cls.signature_image_path,
+        )
+
+    @classmethod
+    def template_key(cls) -> tuple:
+        return cls.render_context_key()
+
+    @classmethod
+    def asset_paths(cls) -> tuple[str, ...]:
+        return (*super().asset_paths(), cls.signature_image_path)
+
+    @classmethod
+    def render_context(cls) -> RenderContext:
+        """
+        Contexto de renderização do tema da classe, compartilhado com as
+        demais famílias que usam as mesmas configurações.
+        """
+        key = (
+            cls.common_flowables.__func__,
+            cls.results_table_style,
+            cls.calibration_table_style,
+            *cls.render_context_key(),
+        )
+        return shared_render_context(key, cls._build_render_context)
+
+    @classmethod
+    def _build_render_context(cls, key: tuple) -> RenderContext:
+        styles = cls.paragraph_styles
+        # Registra a família TrueType do tema, se houver, antes das métricas
+        style_set = styles.styles()
+        getFont(styles.font_name)
+        getFont(styles.font_bold_name)
+        max_width_for_table = (
+            cls.PageBase.page_width
+            - cls.PageBase.left_margin
+            - cls.PageBase.right_margin
+        )
+        return RenderContext(
+            key,
+            styles=style_set,
+            table_styles={
+                "results": cls.results_table_style,
+                "calibration": cls.calibration_table_style,
+            },
+            column_widths={
+                "results": column_widths(RESULTS_COLUMN_FRACTIONS, max_width_for_table),
+                "summary": column_widths(SUMMARY_COLUMN_FRACTIONS, max_width_for_table),
+            },
+            compile=cls.common_flowables,
+        )
+
+    @classmethod
+    def warm_up(cls):
+        cls.render_context().template
+        super().warm_up()
+
+    def outline_title(self) -> str:
+        return f"Certificado N° {self.number}"
+
+    def document_metadata(self) -> "DocumentMetadata":
+        from _archival import DocumentMetadata
+
+        instrument = self.instrument
+        return DocumentMetadata(
+            title=f"Certificado de Calibração N° {self.number}",
+            author=self.calibration.location,
+            subject=(
+                f"Calibração de {instrument.description} {instrument.brand} "
+                f"{instrument.model}, nº de série {instrument.serial_number}"
+            ),
+            keywords=(
+                instrument.description,
+                instrument.serial_number,
+                self.requester.name,
+                *(quantity.label for quantity in self.quantities),
+            ),
+            identifier=self.number,
+        )
+
+    @classmethod
+    def common_flowables(cls) -> dict:
+        """
+        Protótipos dos flowables estáticos comuns a todas as famílias (ver
+        RenderContext.template).
+        """
+        styles = cls.paragraph_styles
+        normal_adjusted = styles.normal_adjusted()
+        normal_left_bold = styles.normal_left_bold()
+
+        # Corpo do texto, usando HTML básico para formatação
+        obs_text_1 = """
+        <b>1)</b> As componentes de incerteza consideradas neste certificado englobam além da incerteza das próprias medições, a resolução digital do mostrador do padrão e sua estabilidade térmica.<br/>
+        """
+        obs_text_2 = """
+        <b>2)</b> Este certificado se aplica somente ao instrumento calibrado.<br/>
+        """
+        obs_text_3 = """
+        <b>3)</b> Sua utilização para fins promocionais depende de prévia autorização formal da Senfio. Sua reprodução só pode ser realizada integralmente, sem nenhuma alteração.<br/>
+        """
+        obs_text_4 = """
+        <b>4)</b> A incerteza da calibração (incerteza expandida) é baseada em um fator de abrangência K, para um nível de confiança de 95,45%.
+        """
+
+        # Bloco: Assinatura
+        from _image_assets import decode_image
+        from _image_pipeline import image_pipeline
+
+        signature = image_pipeline.prepare(cls.signature_image_path, 5 * cm, 2 * cm)
+        img = Image(
+            signature.path,
+            width=5 * cm,
+            height=2 * cm,
+        )
+        img.hAlign = "CENTER"
+        # Decodifica a imagem agora; as cópias compartilham a imagem lida
+        img.wrap(0, 0)
+        if img._img is not None:
+            decode_image(img._img)
+
+        return {
+            "calibration_data_label": Paragraph(
+                "Dados da calibração", normal_left_bold
+            ),
+            "ambient_conditions_label": Paragraph(
+                "Condições ambientais", normal_left_bold
+            ),
+            "procedures_label": Paragraph("Procedimentos", normal_left_bold),
+            "standard_label": Paragraph(
+                "Padrão utilizado na calibração", normal_left_bold
+            ),
+            "summary_label": Paragraph("Resumo", normal_left_bold),
+            "observations_label": Paragraph("Observações:", normal_left_bold),
+            "observations": [
+                Paragraph(obs_text_1, normal_adjusted),
+                Paragraph(obs_text_2, normal_adjusted),
+                Paragraph(obs_text_3, normal_adjusted),
+                Paragraph(obs_text_4, normal_adjusted),
+            ],
+            "signature": img,
+        }
+
+    @classmethod
+    def static_flowables(cls) -> dict:
+        """
+        Partes estáticas próprias da família: rótulos e cabeçalhos das
+        tabelas de cada grandeza, que dependem da unidade.
+        """
+        styles = cls.paragraph_styles
+        normal_left_bold = styles.normal_left_bold()
+        normal_center_bold = styles.normal_center_bold()
+
+        flowables = {}
+        for quantity in cls.quantities:
+            unit = f"({quantity.unit})"
+            flowables[f"results_label_{quantity.name}"] = (
+                styles.paragraph_label_bold_value_normal_left(
+                    "Resultados:", quantity.label
+                )
+            )
+            flowables[f"results_header_rows_{quantity.name}"] = [
+                [
+                    Paragraph(
+                        "VVC (Valor Verdadeiro Convencional)", normal_center_bold
+                    ),
+                    Paragraph("VML (Valor Médio das Leituras)", normal_center_bold),
+                    Paragraph("Erro<br/>(VML-VVC)", normal_center_bold),
+                    Paragraph("Incerteza combinada<br/>(Uc)", normal_center_bold),
+                    Paragraph("Fator de abrangência<br/>(K)", normal_center_bold),
+                    Paragraph("Incerteza expandida<br/>(Ue)", normal_center_bold),
+                ],
+                [
+                    Paragraph(unit, normal_center_bold),
+                    Paragraph(unit, normal_center_bold),
+                    Paragraph(unit, normal_center_bold),
+                    Paragraph(unit, normal_center_bold),
+                    Paragraph("", normal_center_bold),
+                    Paragraph(unit, normal_center_bold),
+                ],
+            ]
+            flowables[f"summary_label_{quantity.name}"] = Paragraph(
+                quantity.label, normal_left_bold
+            )
+            flowables[f"summary_header_rows_{quantity.name}"] = [
+                [
+                    Paragraph("VVC", normal_center_bold),
+                    Paragraph("Medição final", normal_center_bold),
+                ],
+                [
+                    Paragraph(unit, normal_center_bold),
+                    Paragraph(unit, normal_center_bold),
+                ],
+            ]
+        return flowables
+
+    def points(self, quantity: Quantity) -> Sequence[MeasurementPoint]:
+        """
+        Pontos de calibração da grandeza; o padrão é measurement_points.
+        """
+        return self.measurement_points
+
+    def ambient_condition_lines(self) -> list[str]:
+        """
+        Linhas do bloco "Condições ambientais".
+        """
+        ambient = self.ambient_conditions
+        return [
+            f"Temperatura: ({format_decimal(ambient.temperature, 1)} ± "
+            f"{format_decimal(ambient.temperature_uncertainty, 1)})°C"
+        ]
+
+    def content_to_pdf(self) -> Iterator[Flowable]:
+        context = self.render_context()
+        common = context.template
+        template = self.template()
+        styles = context.styles
+        normal_left = styles.normal_left
+        normal_right = styles.normal_right
+        normal_adjusted = styles.normal_adjusted
+        title = styles.title
+        results_table_style = context.table_styles["results"]
+        results_col_widths = context.column_widths["results"]
+        summary_col_widths = context.column_widths["summary"]
+        label_bold_and_value_normal_left = (
+            self.paragraph_styles.paragraph_label_bold_value_normal_left
+        )
+        requester = self.requester
+        instrument = self.instrument
+        calibration = self.calibration
+        standard = self.standard
+
+        yield Paragraph(f"Certificado de Calibração N° {escape(self.number)}", title)
+        yield Paragraph(f"Ref. Norma: {escape(self.norm_reference)}", normal_right)
+        yield self.ElementsPage.line_between_text()
+        # yield Spacer(1, 0.2 * cm)
+
+        # Bloco: Solicitante
+        yield label_bold_and_value_normal_left("Solicitante:", escape(requester.name))
+        yield label_bold_and_value_normal_left("Endereço:", escape(requester.address))
+        yield label_bold_and_value_normal_left(
+            "Objeto de calibração:", escape(instrument.description)
+        )
+        yield label_bold_and_value_normal_left("Marca:", escape(instrument.brand))
+        yield label_bold_and_value_normal_left("Modelo:", escape(instrument.model))
+        yield label_bold_and_value_normal_left(
+            "Nº de série:", escape(instrument.serial_number)
+        )
+
+        yield self.ElementsPage.line_between_text()
+
+        # Bloco: Dados da calibração
+        dados_calibracao = [
+            common["calibration_data_label"],
+            Paragraph(
+                f"Data da calibração: {format_date(calibration.calibration_date)}",
+                normal_left,
+            ),
+            Paragraph(
+                f"Data emissão: {format_date(calibration.issue_date)}", normal_left
+            ),
+            Paragraph(f"Local: {escape(calibration.location)}", normal_left),
+        ]
+
+        # Bloco: Condições ambientais
+        condicoes_ambientais = [
+            common["ambient_conditions_label"],
+            *(Paragraph(line, normal_left) for line in self.ambient_condition_lines()),
+        ]
+
+        # Tabela com duas colunas
+        tabela = Table(
+            data=[[dados_calibracao, condicoes_ambientais]],
+            colWidths=[10 * cm, 7 * cm],  # ajuste conforme necessário
+            hAlign="LEFT",
+        )
+
+        tabela.setStyle(context.table_styles["calibration"])
+
+        yield tabela
+
+        yield self.ElementsPage.line_between_text()
+
+        yield common["procedures_label"]
+        text_proceed = self.procedures_text.format(readings=self.readings_per_point)
+        yield Paragraph(text_proceed, normal_adjusted)
+        yield Spacer(1, 0.3 * cm)
+
+        # Bloco: Padrão utilizado
+        yield common["standard_label"]
+        yield Paragraph(f"Descrição: {escape(standard.description)}", normal_left)
+        yield Paragraph(f"Modelo: {escape(standard.model)}", normal_left)
+        yield Paragraph(f"Marca: {escape(standard.brand)}", normal_left)
+        yield Paragraph(f"Faixa de uso: {escape(standard.usage_range)}", normal_left)
+        yield Paragraph(
+            "Certificado de Calibração do Padrão: "
+            f"{escape(standard.certificate_number)}",
+            normal_left,
+        )
+        yield Paragraph(
+            f"Data da Calibração: {format_date(standard.calibration_date)}",
+            normal_left,
+        )
+        yield Paragraph(
+            f"Número de série: {escape(standard.serial_number)}", normal_left
+        )
+        yield Paragraph(
+            f"Resolução: {f'{standard.resolution:g}'.replace('.', ',')}"
+            f"{escape(self.quantities[0].unit)}",
+            normal_left,
+        )
+
+        yield self.ElementsPage.line_between_text()
+
+        # Bloco: Tabelas de resultados. Os pontos de cada grandeza são
+        # formatados uma única vez para as duas tabelas (resultados e resumo)
+        formatted = {
+            quantity.name: FormattedPoints(self.points(quantity))
+            for quantity in self.quantities
+        }
+        for quantity in self.quantities:
+            yield template[f"results_label_{quantity.name}"]
+            yield ResultsTable(
+                template[f"results_header_rows_{quantity.name}"],
+                ResultRows(formatted[quantity.name]),
+                results_col_widths,
+                style=results_table_style,
+            )
+
+        yield PageBreak()  # 👉 quebra de página aqui!
+
+        # Resumo
+        yield common["summary_label"]
+
+        for quantity in self.quantities:
+            if len(self.quantities) > 1:
+                yield template[f"summary_label_{quantity.name}"]
+            yield ResultsTable(
+                template[f"summary_header_rows_{quantity.name}"],
+                ResultRows(formatted[quantity.name], summary_row),
+                summary_col_widths,
+                style=results_table_style,
+            )
+
+        yield Spacer(1, 0.3 * cm)
+        yield common["observations_label"]
+        yield from common["observations"]
+
+        yield Spacer(1, 1 * cm)
+
+        # Bloco: Assinatura
+        yield common["signature"]
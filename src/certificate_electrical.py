@@ -0,0 +1,54 @@
+import textwrap
+from datetime import date
+from typing import ClassVar
+
+from _certificate_registry import register_certificate
+from calibration_certificate import (CalibrationCertificate,
+                                     CalibrationStandard, Instrument,
+                                     MeasurementPoint, Quantity)
+
+VOLTAGE = Quantity("voltage", "Tensão elétrica contínua", "V")
+
+ELECTRICAL_PROCEDURES_TEXT = textwrap.dedent(
+    """\
+    A calibração foi conduzida pelo método de medição direta, aplicando ao instrumento os valores gerados 
+    pelo calibrador padrão, com {readings} medições em cada ponto. Neste certificado foi representado o valor 
+    médio dessas {readings} medições. Todas as instruções foram executadas conforme o documento interno Norma-04 da Senfio.
+"""
+)
+
+DEFAULT_VOLTAGE_POINTS = (
+    MeasurementPoint(vvc=1.0, vml=1.002, uc=0.004),
+    MeasurementPoint(vvc=10.0, vml=10.01, uc=0.02),
+    MeasurementPoint(vvc=100.0, vml=100.08, uc=0.15),
+)
+
+
+@register_certificate("electrical")
+class CertificateElectrical(CalibrationCertificate):
+    """
+    Modelo de dados para o certificado de multímetros (tensão contínua).
+    """
+
+    filename: str = "certificado_eletrico.pdf"
+    instrument: Instrument = Instrument(
+        description="Multímetro digital", model="MX-20", serial_number="2077"
+    )
+    standard: CalibrationStandard = CalibrationStandard(
+        description="Calibrador multifunção",
+        model="CM-5",
+        usage_range="0 V a 1000 V",
+        certificate_number="E8QW2L07",
+        calibration_date=date(2025, 3, 5),
+        serial_number="0318",
+        resolution=0.001,
+    )
+    measurement_points: tuple[MeasurementPoint, ...] = DEFAULT_VOLTAGE_POINTS
+
+    quantities: ClassVar[tuple[Quantity, ...]] = (VOLTAGE,)
+    procedures_text: ClassVar[str] = ELECTRICAL_PROCEDURES_TEXT
+
+
+if __name__ == "__main__":
+    pdf = CertificateElectrical()
+    pdf.generate_pdf()
@@ -0,0 +1,54 @@
+import textwrap
+from datetime import date
+from typing import ClassVar
+
+from _certificate_registry import register_certificate
+from calibration_certificate import (CalibrationCertificate,
+                                     CalibrationStandard, Instrument,
+                                     MeasurementPoint, Quantity)
+
+PRESSURE = Quantity("pressure", "Pressão", "kPa")
+
+PRESSURE_PROCEDURES_TEXT = textwrap.dedent(
+    """\
+    A calibração foi conduzida por comparação direta com o padrão, ligados ao mesmo gerador de pressão, 
+    com {readings} medições em cada ponto, em carga e descarga. Neste certificado foi representado o valor médio 
+    dessas {readings} medições. Todas as instruções foram executadas conforme o documento interno Norma-04 da Senfio.
+"""
+)
+
+DEFAULT_PRESSURE_POINTS = (
+    MeasurementPoint(vvc=0.0, vml=0.1, uc=0.25),
+    MeasurementPoint(vvc=250.0, vml=250.4, uc=0.3),
+    MeasurementPoint(vvc=500.0, vml=500.9, uc=0.35),
+)
+
+
+@register_certificate("pressure")
+class CertificatePressure(CalibrationCertificate):
+    """
+    Modelo de dados para o certificado de manômetros.
+    """
+
+    filename: str = "certificado_pressao.pdf"
+    instrument: Instrument = Instrument(
+        description="Manômetro", model="MD-1000", serial_number="1024"
+    )
+    standard: CalibrationStandard = CalibrationStandard(
+        description="Manômetro digital padrão",
+        model="MD-P",
+        usage_range="0 kPa a 1000 kPa",
+        certificate_number="P2K9X31",
+        calibration_date=date(2025, 2, 10),
+        serial_number="0450",
+        resolution=0.1,
+    )
+    measurement_points: tuple[MeasurementPoint, ...] = DEFAULT_PRESSURE_POINTS
+
+    quantities: ClassVar[tuple[Quantity, ...]] = (PRESSURE,)
+    procedures_text: ClassVar[str] = PRESSURE_PROCEDURES_TEXT
+
+
+if __name__ == "__main__":
+    pdf = CertificatePressure()
+    pdf.generate_pdf()
@@ -0,0 +1,63 @@
+from typing import ClassVar, Sequence
+
+from pydantic import ConfigDict
+
+from _certificate_registry import register_certificate
+from calibration_certificate import (TEMPERATURE, AmbientConditions,
+                                     CalibrationCertificate, Instrument,
+                                     MeasurementPoint, Quantity,
+                                     format_decimal)
+
+HUMIDITY = Quantity("humidity", "Umidade relativa", "%UR")
+
+
+class AmbientConditionsWithHumidity(AmbientConditions):
+    """
+    Condições ambientais com a umidade relativa do ar.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    humidity: float = 55.0  # %UR
+    humidity_uncertainty: float = 5.0  # %UR
+
+
+DEFAULT_HUMIDITY_POINTS = (
+    MeasurementPoint(vvc=30.0, vml=31.2, uc=1.1),
+    MeasurementPoint(vvc=50.0, vml=50.6, uc=1.1),
+    MeasurementPoint(vvc=70.0, vml=69.1, uc=1.2),
+)
+
+
+@register_certificate("humidity")
+class CertificateWithHumidity(CalibrationCertificate):
+    """
+    Modelo de dados para o certificado de termo-higrômetro: tabelas de
+    resultados de temperatura (measurement_points) e de umidade relativa
+    (humidity_points).
+    """
+
+    filename: str = "certificado_com_umidade.pdf"
+    instrument: Instrument = Instrument(description="Termo-higrômetro")
+    ambient_conditions: AmbientConditionsWithHumidity = AmbientConditionsWithHumidity()
+    humidity_points: tuple[MeasurementPoint, ...] = DEFAULT_HUMIDITY_POINTS
+
+    quantities: ClassVar[tuple[Quantity, ...]] = (TEMPERATURE, HUMIDITY)
+
+    def points(self, quantity: Quantity) -> Sequence[MeasurementPoint]:
+        if quantity == HUMIDITY:
+            return self.humidity_points
+        return self.measurement_points
+
+    def ambient_condition_lines(self) -> list[str]:
+        ambient = self.ambient_conditions
+        return [
+            *super().ambient_condition_lines(),
+            f"Umidade relativa: ({format_decimal(ambient.humidity, 1)} ± "
+            f"{format_decimal(ambient.humidity_uncertainty, 1)})%UR",
+        ]
+
+
+if __name__ == "__main__":
+    pdf = CertificateWithHumidity()
+    pdf.generate_pdf()
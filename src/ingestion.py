@@ -0,0 +1,374 @@
+import csv
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Mapping
+
+import numpy as np
+
+from _metrology import UncertaintyBudget, calibration_points
+from _pdf_base import _PDFBase
+from calibration_certificate import CalibrationStandard, MeasurementPoint
+from certificate_without_humidity import CertificateWithoutHumidity
+
+# Leituras convertidas em arrays a cada bloco de linhas
+DEFAULT_CHUNK_SIZE = 16384
+
+# Colunas do arquivo de leituras: uma leitura do instrumento por linha
+SERIAL_NUMBER = "serial_number"  # Nº de série do instrumento calibrado
+VVC = "vvc"  # Valor indicado pelo padrão (Valor Verdadeiro Convencional)
+READING = "reading"  # Leitura do instrumento
+DEFAULT_COLUMNS: Mapping[str, str] = {
+    SERIAL_NUMBER: SERIAL_NUMBER,
+    VVC: VVC,
+    READING: READING,
+}
+
+# Caracteres do nº de série que não podem ir para o nome do arquivo (ex.: "/",
+# que levaria o PDF para fora do diretório de saída)
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w.-]")
+
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+FORMAT_PARQUET = "parquet"
+_EXTENSIONS = {
+    ".csv": FORMAT_CSV,
+    ".jsonl": FORMAT_JSONL,
+    ".ndjson": FORMAT_JSONL,
+    ".parquet": FORMAT_PARQUET,
+}
+
+
+@dataclass(frozen=True)
+class ReadingsChunk:
+    """
+    Bloco de leituras consecutivas do arquivo, em arrays do mesmo tamanho.
+    """
+
+    serial_numbers: np.ndarray
+    vvc: np.ndarray
+    readings: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.serial_numbers)
+
+
+def detect_format(path: str) -> str:
+    """
+    Formato do arquivo de leituras pela extensão.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        return _EXTENSIONS[extension]
+    except KeyError:
+        raise ValueError(
+            f"Formato de arquivo não suportado: {path} "
+            f"(use {', '.join(sorted(_EXTENSIONS))})"
+        ) from None
+
+
+def _floats(values, decimal: str = ".") -> np.ndarray:
+    if isinstance(values, np.ndarray):
+        return values.astype(np.float64)
+    if decimal != ".":
+        values = [value.replace(decimal, ".") for value in values]
+    # float() por elemento é ~4x mais rápido que astype de um array de strings
+    return np.fromiter(map(float, values), np.float64, len(values))
+
+
+def _chunk(
+    serial_numbers: list, vvc: list, readings: list, decimal: str = "."
+) -> ReadingsChunk:
+    return ReadingsChunk(
+        serial_numbers=np.asarray(serial_numbers, dtype=object),
+        vvc=_floats(vvc, decimal),
+        readings=_floats(readings, decimal),
+    )
+
+
+def _read_csv(
+    path: str,
+    columns: Mapping[str, str],
+    chunk_size: int,
+    delimiter: str,
+    decimal: str,
+) -> Iterator[ReadingsChunk]:
+    with open(path, newline="", encoding="utf-8") as file:
+        reader = csv.reader(file, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        try:
+            indexes = [
+                header.index(columns[name]) for name in (SERIAL_NUMBER, VVC, READING)
+            ]
+        except ValueError as error:
+            raise ValueError(f"Coluna ausente em {path}: {error}") from None
+        serial_index, vvc_index, reading_index = indexes
+        serial_numbers, vvc, readings = [], [], []
+        for row in reader:
+            if not row:
+                continue
+            serial_numbers.append(row[serial_index])
+            vvc.append(row[vvc_index])
+            readings.append(row[reading_index])
+            if len(serial_numbers) >= chunk_size:
+                yield _chunk(serial_numbers, vvc, readings, decimal)
+                serial_numbers, vvc, readings = [], [], []
+        if serial_numbers:
+            yield _chunk(serial_numbers, vvc, readings, decimal)
+
+
+def _read_jsonl(
+    path: str, columns: Mapping[str, str], chunk_size: int
+) -> Iterator[ReadingsChunk]:
+    serial_key, vvc_key, reading_key = (
+        columns[name] for name in (SERIAL_NUMBER, VVC, READING)
+    )
+    with open(path, encoding="utf-8") as file:
+        serial_numbers, vvc, readings = [], [], []
+        for line in file:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            serial_numbers.append(row[serial_key])
+            vvc.append(row[vvc_key])
+            readings.append(row[reading_key])
+            if len(serial_numbers) >= chunk_size:
+                yield _chunk(serial_numbers, vvc, readings)
+                serial_numbers, vvc, readings = [], [], []
+        if serial_numbers:
+            yield _chunk(serial_numbers, vvc, readings)
+
+
+def _read_parquet(
+    path: str, columns: Mapping[str, str], chunk_size: int
+) -> Iterator[ReadingsChunk]:
+    try:
+        import pyarrow.parquet as parquet
+    except ImportError:
+        raise ImportError(
+            "A leitura de arquivos Parquet requer o pyarrow "
+            "(pip install 'reportlib-learning[parquet]')."
+        ) from None
+
+    names = [columns[name] for name in (SERIAL_NUMBER, VVC, READING)]
+    for batch in parquet.ParquetFile(path).iter_batches(
+        batch_size=chunk_size, columns=names
+    ):
+        serial_numbers, vvc, readings = (
+            batch.column(name).to_numpy(zero_copy_only=False) for name in names
+        )
+        yield _chunk(serial_numbers, vvc, readings)
+
+
+def read_readings(
+    path: str,
+    format: str | None = None,
+    columns: Mapping[str, str] = DEFAULT_COLUMNS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    delimiter: str = ",",
+    decimal: str = ".",
+) -> Iterator[ReadingsChunk]:
+    """
+    Lê o arquivo de leituras em blocos de até chunk_size linhas, sem carregar
+    o arquivo inteiro na memória.
+    :param path: Arquivo CSV, JSONL ou Parquet (requer pyarrow).
+    :param format: "csv", "jsonl" ou "parquet" (padrão: pela extensão).
+    :param columns: Nome no arquivo de cada coluna (serial_number, vvc, reading).
+    :param chunk_size: Número de linhas por bloco.
+    :param delimiter: Separador de campos do CSV (ex.: ";").
+    :param decimal: Separador decimal dos números no CSV (ex.: ",").
+    """
+    format = format or detect_format(path)
+    columns = {**DEFAULT_COLUMNS, **columns}
+    if format == FORMAT_CSV:
+        return _read_csv(path, columns, chunk_size, delimiter, decimal)
+    if format == FORMAT_JSONL:
+        return _read_jsonl(path, columns, chunk_size)
+    if format == FORMAT_PARQUET:
+        return _read_parquet(path, columns, chunk_size)
+    raise ValueError(f"Formato de arquivo não suportado: {format}")
+
+
+def group_readings(
+    chunks: Iterable[ReadingsChunk],
+) -> Iterator[tuple[str, np.ndarray, np.ndarray]]:
+    """
+    Agrupa as leituras por instrumento, como (nº de série, vvc, leituras).
+
+    As leituras de cada instrumento devem estar em linhas consecutivas (como
+    exportadas pelos bancos de calibração): cada grupo é entregue assim que o
+    próximo instrumento começa, então a memória usada depende do maior grupo
+    e não do tamanho do arquivo.
+    """
+    current: str | None = None
+    pending: list[tuple[np.ndarray, np.ndarray]] = []
+    seen: set[str] = set()
+    for chunk in chunks:
+        if not len(chunk):
+            continue
+        serial_numbers = chunk.serial_numbers
+        # Posições onde o nº de série muda dentro do bloco
+        starts = np.flatnonzero(serial_numbers[1:] != serial_numbers[:-1]) + 1
+        bounds = [0, *starts.tolist(), len(chunk)]
+        for start, stop in zip(bounds, bounds[1:]):
+            serial_number = str(serial_numbers[start])
+            if serial_number != current:
+                if current is not None:
+                    yield current, *_concatenate(pending)
+                if serial_number in seen:
+                    raise ValueError(
+                        f"As leituras do instrumento {serial_number} não estão em "
+                        "linhas consecutivas: ordene o arquivo pelo nº de série."
+                    )
+                seen.add(serial_number)
+                current, pending = serial_number, []
+            pending.append((chunk.vvc[start:stop], chunk.readings[start:stop]))
+    if current is not None:
+        yield current, *_concatenate(pending)
+
+
+def _concatenate(pending: list[tuple[np.ndarray, np.ndarray]]) -> tuple:
+    if len(pending) == 1:
+        return pending[0]
+    return (
+        np.concatenate([vvc for vvc, _ in pending]),
+        np.concatenate([readings for _, readings in pending]),
+    )
+
+
+def _measurement_points(
+    results, start: int, stop: int
+) -> tuple[tuple[MeasurementPoint, ...], int]:
+    return (
+        tuple(
+            MeasurementPoint(vvc=vvc, vml=vml, uc=uc, k=k)
+            for vvc, vml, uc, k in zip(
+                results.vvc[start:stop].tolist(),
+                results.vml[start:stop].tolist(),
+                results.uc[start:stop].tolist(),
+                results.k[start:stop].tolist(),
+            )
+        ),
+        int(results.count[start:stop].min()),
+    )
+
+
+def standard_budget(
+    standard: CalibrationStandard | Mapping | None = None,
+) -> UncertaintyBudget:
+    """
+    Budget com a resolução do padrão da calibração, a mesma impressa no
+    certificado ("Resolução").
+    :param standard: Padrão (modelo ou campos no formato JSON); padrão:
+        CalibrationStandard().
+    """
+    standard = CalibrationStandard.model_validate({} if standard is None else standard)
+    return UncertaintyBudget(resolution=standard.resolution)
+
+
+def _default_standard(certificate_cls: type[_PDFBase]) -> CalibrationStandard | None:
+    field = certificate_cls.model_fields.get("standard")
+    return None if field is None else field.default
+
+
+def aggregate_points(
+    vvc: np.ndarray,
+    readings: np.ndarray,
+    budget: UncertaintyBudget | None = None,
+    standard: CalibrationStandard | Mapping | None = None,
+) -> tuple[tuple[MeasurementPoint, ...], int]:
+    """
+    Calcula os pontos de calibração de um instrumento a partir das leituras
+    repetidas (ver _metrology.calibration_points).
+    :param vvc: Valor do padrão de cada leitura.
+    :param readings: Leituras do instrumento.
+    :param budget: Componentes tipo B e fator de abrangência (padrão:
+        standard_budget(standard)).
+    :param standard: Padrão da calibração, de onde vem a resolução.
+    :return: Pontos ordenados por VVC e o menor número de leituras por ponto.
+    """
+    budget = budget or standard_budget(standard)
+    results = calibration_points(np.zeros(len(vvc), np.int64), vvc, readings, budget)
+    return _measurement_points(results, 0, len(results))
+
+
+def certificate_filename(serial_number: str) -> str:
+    """
+    Nome do PDF de um instrumento. O nº de série vem do arquivo de leituras:
+    caracteres fora de letras, dígitos, "_", "." e "-" viram "_", então o
+    nome nunca tem separadores de diretório.
+    """
+    return f"certificado_{_UNSAFE_FILENAME_CHARS.sub('_', serial_number)}.pdf"
+
+
+def _certificates(
+    groups: list[tuple[str, np.ndarray, np.ndarray]],
+    base: dict,
+    budget: UncertaintyBudget,
+    certificate_cls: type[_PDFBase],
+) -> Iterator[_PDFBase]:
+    # Um único cálculo para todos os instrumentos do lote
+    lengths = [len(vvc) for _, vvc, _ in groups]
+    results = calibration_points(
+        np.repeat(np.arange(len(groups)), lengths),
+        np.concatenate([vvc for _, vvc, _ in groups]),
+        np.concatenate([readings for _, _, readings in groups]),
+        budget,
+    )
+    bounds = results.group_bounds(len(groups)).tolist()
+    for index, (serial_number, _, _) in enumerate(groups):
+        points, readings_per_point = _measurement_points(
+            results, bounds[index], bounds[index + 1]
+        )
+        yield certificate_cls.model_validate(
+            {
+                **base,
+                "filename": certificate_filename(serial_number),
+                "instrument": {
+                    **base.get("instrument", {}),
+                    "serial_number": serial_number,
+                },
+                "readings_per_point": readings_per_point,
+                "measurement_points": points,
+            }
+        )
+
+
+def iter_certificates(
+    path: str,
+    base: Mapping | None = None,
+    budget: UncertaintyBudget | None = None,
+    certificate_cls: type[_PDFBase] = CertificateWithoutHumidity,
+    **read_options,
+) -> Iterator[_PDFBase]:
+    """
+    Lê um arquivo de leituras e entrega um certificado validado por
+    instrumento, um de cada vez. Os instrumentos são calculados em lotes de
+    ~chunk_size leituras, com uma única passada do NumPy por lote.
+    :param path: Arquivo de leituras (ver read_readings).
+    :param base: Campos comuns a todos os certificados (solicitante, datas,
+        padrão...), no formato dos registros JSONL.
+    :param budget: Componentes de incerteza tipo B e fator de abrangência
+        (padrão: standard_budget do padrão de base, ou do padrão da classe).
+    :param certificate_cls: Classe de certificado a ser gerada.
+    :param read_options: Opções de read_readings (format, columns,
+        chunk_size, delimiter, decimal).
+    """
+    base = dict(base or {})
+    if budget is None:
+        budget = standard_budget(
+            base.get("standard", _default_standard(certificate_cls))
+        )
+    batch_size = read_options.get("chunk_size", DEFAULT_CHUNK_SIZE)
+    batch, rows = [], 0
+    for group in group_readings(read_readings(path, **read_options)):
+        batch.append(group)
+        rows += len(group[1])
+        if rows >= batch_size:
+            yield from _certificates(batch, base, budget, certificate_cls)
+            batch, rows = [], 0
+    if batch:
+        yield from _certificates(batch, base, budget, certificate_cls)
@@ -1,3 +1,5 @@
+import threading
+from dataclasses import dataclass
 from typing import ClassVar
 
 from pydantic import BaseModel as PydanticBaseModel
@@ -5,78 +7,143 @@ from reportlab.lib import colors
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.platypus import Paragraph
 
+from _font_registry import VERA, FontFamily, font_registry
+
+
+@dataclass(frozen=True)
+class ParagraphStyleSet:
+    """
+    Conjunto imutável de estilos de um tema (fonte normal + fonte negrito).
+    Os estilos são compartilhados entre documentos e threads: não devem ser
+    alterados. Para variar um estilo, crie um novo com parent=<estilo>.
+    """
+
+    normal_left: ParagraphStyle
+    normal_right: ParagraphStyle
+    normal_adjusted: ParagraphStyle
+    normal_left_bold: ParagraphStyle
+    normal_center_bold: ParagraphStyle
+    title: ParagraphStyle
+
+    @classmethod
+    def build(cls, font_name: str, font_bold_name: str) -> "ParagraphStyleSet":
+        return cls(
+            normal_left=ParagraphStyle(
+                name="NormalLeft",
+                fontName=font_name,
+                fontSize=10,
+                leading=14,
+                textColor=colors.black,
+                alignment=0,  # Left alignment
+            ),
+            normal_right=ParagraphStyle(
+                name="NormalRight",
+                fontName=font_name,
+                fontSize=10,
+                leading=14,
+                textColor=colors.black,
+                alignment=2,  # Right alignment
+            ),
+            normal_adjusted=ParagraphStyle(
+                name="NormalAdjusted",
+                fontName=font_name,
+                fontSize=10,
+                leading=14,
+                textColor=colors.black,
+                alignment=4,
+                firstLineIndent=15,
+            ),
+            normal_left_bold=ParagraphStyle(
+                name="NormalLeftBold",
+                fontName=font_bold_name,
+                fontSize=10,
+                leading=14,
+                textColor=colors.black,
+                alignment=0,  # Left alignment
+            ),
+            normal_center_bold=ParagraphStyle(
+                name="NormalCenterBold",
+                fontName=font_bold_name,
+                fontSize=10,
+                leading=14,
+                textColor=colors.black,
+                alignment=1,  # Center alignment
+            ),
+            title=ParagraphStyle(
+                name="Title",
+                fontName=font_bold_name,
+                fontSize=18,
+                leading=22,
+                textColor=colors.black,
+                alignment=1,  # Center alignment
+            ),
+        )
+
+
+# Estilos já construídos, por tema (font_name, font_bold_name)
+_style_sets: dict[tuple[str, str], ParagraphStyleSet] = {}
+_style_sets_lock = threading.Lock()
+
 
 class ParagraphStylesGota(PydanticBaseModel):
     font_name: ClassVar[str] = "Helvetica"
     font_bold_name: ClassVar[str] = "Helvetica-Bold"
+    # Família TrueType do tema, registrada (e embutida no PDF) no primeiro uso.
+    # None para as fontes padrão do PDF, que não são embutidas.
+    font_family: ClassVar[FontFamily | None] = None
+
+    @classmethod
+    def styles(cls) -> ParagraphStyleSet:
+        """
+        Estilos do tema da classe, construídos uma única vez por processo.
+        Subclasses com outras fontes têm o seu próprio conjunto em cache.
+        """
+        theme = (cls.font_name, cls.font_bold_name)
+        style_set = _style_sets.get(theme)
+        if style_set is None:
+            with _style_sets_lock:
+                style_set = _style_sets.get(theme)
+                if style_set is None:
+                    if cls.font_family is not None:
+                        font_registry.register(cls.font_family)
+                    style_set = ParagraphStyleSet.build(*theme)
+                    _style_sets[theme] = style_set
+        return style_set
 
     @classmethod
     def normal_left(cls) -> ParagraphStyle:
-        return ParagraphStyle(
-            name="NormalLeft",
-            fontName=cls.font_name,
-            fontSize=10,
-            leading=14,
-            textColor=colors.black,
-            alignment=0,  # Left alignment
-        )
+        return cls.styles().normal_left
 
     @classmethod
     def normal_right(cls) -> ParagraphStyle:
-        return ParagraphStyle(
-            name="NormalRight",
-            fontName=cls.font_name,
-            fontSize=10,
-            leading=14,
-            textColor=colors.black,
-            alignment=2,  # Right alignment
-        )
+        return cls.styles().normal_right
 
     @classmethod
     def normal_adjusted(cls) -> ParagraphStyle:
-        return ParagraphStyle(
-            name="NormalAdjusted",
-            fontName=cls.font_name,
-            fontSize=10,
-            leading=14,
-            textColor=colors.black,
-            alignment=4,
-            firstLineIndent=15,
-        )
+        return cls.styles().normal_adjusted
 
     @classmethod
     def normal_left_bold(cls) -> ParagraphStyle:
-        return ParagraphStyle(
-            name="NormalLeftBold",
-            fontName=cls.font_bold_name,
-            fontSize=10,
-            leading=14,
-            textColor=colors.black,
-            alignment=0,  # Left alignment
-        )
+        return cls.styles().normal_left_bold
 
     @classmethod
     def normal_center_bold(cls) -> ParagraphStyle:
-        return ParagraphStyle(
-            name="NormalCenterBold",
-            fontName=cls.font_bold_name,
-            fontSize=10,
-            leading=14,
-            textColor=colors.black,
-            alignment=1,  # Center alignment
-        )
+        return cls.styles().normal_center_bold
 
     @classmethod
     def title(cls) -> ParagraphStyle:
-        return ParagraphStyle(
-            name="Title",
-            fontName=cls.font_bold_name,
-            fontSize=18,
-            leading=22,
-            textColor=colors.black,
-            alignment=1,  # Center alignment
-        )
+        return cls.styles().title
 
     @classmethod
     def paragraph_label_bold_value_normal_left(cls, label: str, valor: str):
         return Paragraph(f"<b>{label}</b> {valor}", cls.normal_left())
+
+
+class ParagraphStylesVera(ParagraphStylesGota):
+    """
+    Tema com a Bitstream Vera embutida no PDF (apenas os glifos usados).
+    """
+
+    font_name: ClassVar[str] = VERA.font_name
+    font_bold_name: ClassVar[str] = VERA.font_bold_name
+    font_family: ClassVar[FontFamily | None] = VERA
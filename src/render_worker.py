@@ -0,0 +1,413 @@
+import argparse
+import bisect
+import json
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+
+from _job_queue import DEFAULT_LEASE, Job, JobQueue
+from _output_cache import DiskPDFCache, PDFCache
+from _pdf_base import _PDFBase
+from batch_generation import (RecordResult, read_jsonl, record_with_filename,
+                              render_record, valid_records, warm_up)
+from certificate_without_humidity import CertificateWithoutHumidity
+
+# Limites superiores (s) das faixas dos histogramas de latência
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+# Nome das métricas gravadas na fila (JobQueue.state)
+METRICS_STATE = "metrics"
+
+
+class LatencyHistogram:
+    """
+    Histograma de latências em faixas fixas (LATENCY_BUCKETS): memória
+    constante em um worker que roda indefinidamente. Os percentis são
+    aproximados pelo limite superior da faixa.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # A última faixa conta as latências acima do maior limite
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, percent: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = percent / 100 * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_s": round(self.total / self.count, 4) if self.count else 0.0,
+            "p50_s": round(self.percentile(50), 4),
+            "p95_s": round(self.percentile(95), 4),
+            "p99_s": round(self.percentile(99), 4),
+            "max_s": round(self.max, 4),
+            "buckets": {
+                **{
+                    f"le_{bound:g}": count
+                    for bound, count in zip(self.buckets, self.counts)
+                },
+                "inf": self.counts[-1],
+            },
+        }
+
+
+@dataclass
+class WorkerMetrics:
+    """
+    Contadores e histogramas do worker desde o início.
+    """
+
+    completed: int = 0
+    failed: int = 0
+    retried: int = 0
+    started: float = field(default_factory=time.monotonic)
+    render: LatencyHistogram = field(default_factory=LatencyHistogram)
+    queue_wait: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def uptime(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def throughput(self) -> float:
+        uptime = self.uptime
+        return self.completed / uptime if uptime else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "uptime_s": round(self.uptime, 2),
+            "throughput_per_s": round(self.throughput, 2),
+            "render_latency": self.render.as_dict(),
+            "queue_wait": self.queue_wait.as_dict(),
+        }
+
+
+def _init_process(certificate_cls: type[_PDFBase]):
+    # Ctrl+C chega a todo o grupo de processos: quem encerra os processos é o
+    # worker, depois de terminar os jobs em andamento
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    warm_up(certificate_cls)
+
+
+class RenderWorker:
+    """
+    Worker de longa duração que gera os certificados de uma JobQueue.
+
+    Os processos do pool são preparados uma única vez (warm_up: estilos,
+    imagens, fontes e templates) e reaproveitados por todos os jobs. O worker
+    retira da fila apenas os jobs que cabem em max_in_flight, então a fila
+    (e não a memória do worker) absorve os picos; quem envia recebe
+    queue.Full quando a fila passa de max_depth. Jobs com erro voltam para a
+    fila com espera exponencial (JobQueue.fail) e um processo morto recria o
+    pool sem derrubar o worker.
+    """
+
+    def __init__(
+        self,
+        job_queue: JobQueue,
+        certificate_cls: type[_PDFBase] = CertificateWithoutHumidity,
+        max_workers: int | None = None,
+        max_in_flight: int | None = None,
+        output_dir: str | None = None,
+        cache: PDFCache | None = None,
+        retry_delay: float = 1.0,
+        poll_interval: float = 0.05,
+        metrics_interval: float = 1.0,
+        lease: float = DEFAULT_LEASE,
+    ):
+        """
+        :param job_queue: Fila de onde os jobs são retirados.
+        :param certificate_cls: Classe dos registros que não informam o tipo.
+        :param max_workers: Número de processos (padrão: número de CPUs).
+        :param max_in_flight: Máximo de jobs retirados e ainda não concluídos
+            (padrão: 2 por processo).
+        :param output_dir: Diretório dos PDFs cujo filename é relativo.
+        :param cache: Cache de PDFs compartilhado pelos processos.
+        :param retry_delay: Espera antes da primeira repetição de um job com
+            erro; dobra a cada tentativa.
+        :param poll_interval: Espera (s) entre consultas à fila vazia.
+        :param metrics_interval: Intervalo (s) entre as gravações das métricas
+            na fila (lidas por "render_worker.py status").
+        :param lease: Reserva (s) dos jobs retirados, renovada a cada terço
+            desse tempo enquanto o job está em andamento; jobs com a reserva
+            expirada (de workers que pararam) voltam para a fila.
+        """
+        self.job_queue = job_queue
+        self.certificate_cls = certificate_cls
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or 2 * self.max_workers
+        self.output_dir = output_dir
+        self.cache = cache
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+        self.metrics_interval = metrics_interval
+        self.lease = lease
+        self.metrics = WorkerMetrics()
+        self._stopping = threading.Event()
+
+    def stop(self):
+        """
+        Para de retirar jobs; run() retorna depois dos jobs em andamento.
+        """
+        self._stopping.set()
+
+    def _executor(self):
+        # Importado aqui: concurrent.futures.process custa ~25 ms no import
+        from concurrent.futures import ProcessPoolExecutor
+
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_process,
+            initargs=(self.certificate_cls,),
+        )
+
+    def _record(self, job: Job) -> dict:
+        return record_with_filename(job.record, job.id, self.output_dir)
+
+    def _finish(self, job: Job, result: RecordResult):
+        if result.ok:
+            self.job_queue.complete(job, result.filename, result.seconds)
+            self.metrics.completed += 1
+            self.metrics.render.observe(result.seconds)
+        elif self.job_queue.fail(job, result.error, result.seconds, self.retry_delay):
+            self.metrics.retried += 1
+        else:
+            self.metrics.failed += 1
+
+    def _collect(self, done: set[Future], in_flight: dict[Future, Job]) -> bool:
+        """
+        Registra os jobs concluídos.
+        :return: True se algum processo do pool morreu.
+        """
+        from concurrent.futures.process import BrokenProcessPool
+
+        broken = False
+        for future in done:
+            job = in_flight.pop(future)
+            try:
+                result = future.result()
+            except BrokenProcessPool as error:
+                # Um processo morreu (ex.: falta de memória): o job conta a
+                # tentativa e o pool é recriado
+                broken = True
+                result = RecordResult(job.id, None, 0.0, repr(error))
+            self._finish(job, result)
+        return broken
+
+    def publish_metrics(self):
+        """
+        Grava as métricas e a profundidade da fila para outros processos.
+        """
+        self.job_queue.set_state(
+            METRICS_STATE,
+            {
+                "pid": os.getpid(),
+                "workers": self.max_workers,
+                "depth": self.job_queue.depth(),
+                **self.metrics.as_dict(),
+            },
+        )
+
+    def run(self, stop_when_idle: bool = False) -> WorkerMetrics:
+        """
+        Gera os jobs da fila até stop() (ou SIGTERM/SIGINT no CLI).
+        :param stop_when_idle: Retorna quando a fila não tiver mais jobs
+            aguardando (inclusive repetições agendadas).
+        :return: Métricas do worker.
+        """
+        if self.output_dir is not None:
+            os.makedirs(self.output_dir, exist_ok=True)
+        executor = self._executor()
+        in_flight: dict[Future, Job] = {}
+        published = 0.0
+        renewed = 0.0
+        try:
+            while not self._stopping.is_set() or in_flight:
+                free = self.max_in_flight - len(in_flight)
+                if free > 0 and not self._stopping.is_set():
+                    for job in self.job_queue.claim(free, self.lease):
+                        self.metrics.queue_wait.observe(
+                            max(time.time() - job.submitted_at, 0.0)
+                        )
+                        future = executor.submit(
+                            render_record, job.id, self._record(job), False, self.cache
+                        )
+                        in_flight[future] = job
+
+                if in_flight:
+                    done, _ = wait(
+                        in_flight,
+                        timeout=self.poll_interval,
+                        return_when=FIRST_COMPLETED,
+                    )
+                    broken = self._collect(done, in_flight)
+                    if broken:
+                        # Os demais jobs do pool quebrado terminam (com
+                        # BrokenProcessPool) logo em seguida
+                        self._collect(wait(in_flight).done, in_flight)
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        executor = self._executor()
+                elif stop_when_idle and not self.job_queue.depth()["queued"]:
+                    break
+                else:
+                    self._stopping.wait(self.poll_interval)
+
+                if time.monotonic() - renewed >= self.lease / 3:
+                    # Mantém a reserva dos jobs em andamento e recupera os
+                    # jobs de workers que pararam
+                    self.job_queue.renew(in_flight.values(), self.lease)
+                    self.job_queue.recover()
+                    renewed = time.monotonic()
+
+                if time.monotonic() - published >= self.metrics_interval:
+                    self.publish_metrics()
+                    published = time.monotonic()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.publish_metrics()
+        return self.metrics
+
+
+def _serve(args) -> int:
+    cache = None
+    if args.cache_dir:
+        cache = DiskPDFCache(args.cache_dir, max_bytes=args.cache_max_mb * 2**20)
+    with JobQueue(args.queue) as job_queue:
+        worker = RenderWorker(
+            job_queue,
+            max_workers=args.workers,
+            max_in_flight=args.max_in_flight,
+            output_dir=args.output_dir,
+            cache=cache,
+            retry_delay=args.retry_delay,
+            lease=args.lease,
+        )
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: worker.stop())
+        metrics = worker.run(stop_when_idle=args.exit_when_idle)
+    print(json.dumps(metrics.as_dict(), ensure_ascii=False))
+    return 0
+
+
+def _submit(args) -> int:
+    invalid: list[RecordResult] = []
+    with JobQueue(args.queue, max_depth=args.max_depth) as job_queue:
+        try:
+            ids = job_queue.submit_many(
+                valid_records(read_jsonl(args.records), invalid),
+                priority=args.priority,
+                max_attempts=args.max_attempts,
+                timeout=args.timeout,
+            )
+        except queue.Full as error:
+            print(error, file=sys.stderr)
+            return 2
+    print(f"{len(ids)} jobs enviados ({ids[0]}..{ids[-1]})" if ids else "0 jobs")
+    return 1 if invalid else 0
+
+
+def _status(args) -> int:
+    with JobQueue(args.queue) as job_queue:
+        status = {"depth": job_queue.depth()}
+        state = job_queue.state(METRICS_STATE)
+        if state is not None:
+            metrics, updated_at = state
+            status["worker"] = {**metrics, "age_s": round(time.time() - updated_at, 2)}
+    print(json.dumps(status, ensure_ascii=False, indent=2))
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Worker de geração de certificados a partir de uma fila SQLite."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="gera os jobs da fila")
+    serve.add_argument("queue", help="arquivo SQLite da fila")
+    serve.add_argument("-o", "--output-dir", default=".", help="diretório de saída")
+    serve.add_argument("-w", "--workers", type=int, default=None)
+    serve.add_argument("--max-in-flight", type=int, default=None)
+    serve.add_argument(
+        "--retry-delay", type=float, default=1.0, help="espera antes de repetir (s)"
+    )
+    serve.add_argument(
+        "--lease",
+        type=float,
+        default=DEFAULT_LEASE,
+        help="reserva dos jobs em andamento (s); expirada, o job é recuperado",
+    )
+    serve.add_argument(
+        "--exit-when-idle", action="store_true", help="encerra com a fila vazia"
+    )
+    serve.add_argument(
+        "--cache-dir", help="cache de PDFs: reaproveita certificados já gerados"
+    )
+    serve.add_argument(
+        "--cache-max-mb", type=int, default=512, help="tamanho máximo do cache"
+    )
+    serve.set_defaults(handler=_serve)
+
+    submit = commands.add_parser("submit", help="envia registros JSONL para a fila")
+    submit.add_argument("queue", help="arquivo SQLite da fila")
+    submit.add_argument("records", help='arquivo JSONL de registros ("-" = stdin)')
+    submit.add_argument("-p", "--priority", type=int, default=0)
+    submit.add_argument("--max-attempts", type=int, default=3)
+    submit.add_argument(
+        "--max-depth", type=int, default=None, help="recusa se a fila passar disso"
+    )
+    submit.add_argument(
+        "--timeout", type=float, default=0.0, help="espera por espaço na fila (s)"
+    )
+    submit.set_defaults(handler=_submit)
+
+    status = commands.add_parser("status", help="profundidade da fila e métricas")
+    status.add_argument("queue", help="arquivo SQLite da fila")
+    status.set_defaults(handler=_status)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
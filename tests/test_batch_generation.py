@@ -0,0 +1,64 @@
+import json
+import os
+
+from fixtures import certificate_record
+
+import render_worker
+from _job_queue import JobQueue
+from batch_generation import RecordResult, generate_batch, read_jsonl
+
+
+def _write_jsonl(path, lines: list[str]) -> str:
+    with open(path, "w", encoding="utf-8") as file:
+        file.writelines(f"{line}\n" for line in lines)
+    return str(path)
+
+
+def _record(seed: int) -> str:
+    return json.dumps(certificate_record(seed=seed))
+
+
+def test_read_jsonl_reports_invalid_lines(tmp_path):
+    path = _write_jsonl(tmp_path / "lote.jsonl", [_record(0), "{", "", "[1, 2]"])
+    first, broken, not_object = read_jsonl(path)
+    assert first["number"] == "1000"
+    assert isinstance(broken, RecordResult) and not broken.ok
+    assert broken.error.startswith("Linha 2: JSON inválido")
+    assert not_object.error.startswith("Linha 4:")
+
+
+def test_invalid_line_fails_only_its_record(tmp_path):
+    path = _write_jsonl(tmp_path / "lote.jsonl", [_record(0), "{", _record(2)])
+    output_dir = tmp_path / "saida"
+    summary = generate_batch(
+        read_jsonl(path), max_workers=1, output_dir=str(output_dir)
+    )
+    assert (summary.total, summary.succeeded) == (3, 2)
+    (failure,) = summary.failures
+    assert failure.index == 1
+    assert failure.error.startswith("Linha 2:")
+    assert sorted(os.listdir(output_dir)) == [
+        "certificado_000000.pdf",
+        "certificado_000002.pdf",
+    ]
+
+
+def test_records_without_filename_get_unique_names(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    records = [certificate_record(seed=seed) for seed in range(3)]
+    for record in records:
+        del record["filename"]
+    summary = generate_batch(records, max_workers=1)
+    assert summary.succeeded == 3
+    assert sorted(name for name in os.listdir() if name.endswith(".pdf")) == [
+        f"certificado_{index:06d}.pdf" for index in range(3)
+    ]
+
+
+def test_worker_submit_skips_invalid_lines(tmp_path, capsys):
+    path = _write_jsonl(tmp_path / "lote.jsonl", [_record(0), "{", _record(2)])
+    queue_path = str(tmp_path / "fila.db")
+    assert render_worker.main(["submit", queue_path, path]) == 1
+    assert "Linha 2:" in capsys.readouterr().err
+    with JobQueue(queue_path) as job_queue:
+        assert job_queue.depth()["queued"] == 2
@@ -0,0 +1,19 @@
+import os
+
+from PIL import Image as PILImage
+
+from _image_assets import ImageAssetCache
+
+
+def test_image_asset_cache_reloads_modified_file(tmp_path):
+    path = str(tmp_path / "logo.png")
+    PILImage.new("RGB", (4, 2), "red").save(path)
+    cache = ImageAssetCache()
+    asset = cache.get(path)
+    assert cache.get(path) is asset
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    PILImage.new("RGB", (8, 2), "blue").save(path)
+    os.utime(path, ns=(asset.mtime_ns + 10**9, asset.mtime_ns + 10**9))
+    assert cache.get(path).pixel_width == 8
+    assert (cache.hits, cache.misses) == (1, 2)
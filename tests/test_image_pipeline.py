@@ -0,0 +1,52 @@
+import os
+
+import numpy as np
+from PIL import Image as PILImage
+
+from _image_pipeline import ENCODING_ORIGINAL, ImagePipeline
+
+
+def _pipeline(tmp_path) -> ImagePipeline:
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir(mode=0o700)
+    return ImagePipeline(cache_dir=str(cache_dir), dpi=72)
+
+
+def _noise(path, size, quality: int) -> str:
+    pixels = np.random.default_rng(0).integers(0, 256, (*size, 3), dtype=np.uint8)
+    PILImage.fromarray(pixels).save(path, "JPEG", quality=quality)
+    return str(path)
+
+
+def test_keeps_original_when_prepared_is_not_smaller(tmp_path):
+    # JPEG muito comprimido: reamostrado e recomprimido em qualidade 90 fica
+    # maior que o original, mesmo com metade dos pixels
+    source = _noise(tmp_path / "ruido.jpg", (200, 400), quality=5)
+    pipeline = _pipeline(tmp_path)
+    prepared = pipeline.prepare(source, 300, 150)
+    assert prepared.encoding == ENCODING_ORIGINAL
+    assert prepared.path == source
+    assert (prepared.pixel_width, prepared.pixel_height) == (400, 200)
+    assert prepared.saved_bytes == 0
+    assert os.listdir(pipeline.cache_dir) != []
+    # O cache em disco também devolve a original
+    pipeline.clear()
+    assert pipeline.prepare(source, 300, 150) == prepared
+
+
+def test_document_stats_sums_document_images(tmp_path):
+    pipeline = _pipeline(tmp_path)
+    large = tmp_path / "grande.png"
+    PILImage.new("RGB", (800, 400), "white").save(large)
+    kept = _noise(tmp_path / "ruido.jpg", (200, 400), quality=5)
+    other = _noise(tmp_path / "outro.jpg", (50, 50), quality=50)
+    prepared = [pipeline.prepare(str(large), 100, 50), pipeline.prepare(kept, 300, 150)]
+    pipeline.prepare(other, 50, 50)
+    stats = pipeline.document_stats([str(large), kept])
+    assert stats == {
+        "images": 2,
+        "source_bytes": sum(item.source_bytes for item in prepared),
+        "prepared_bytes": sum(item.prepared_bytes for item in prepared),
+        "saved_bytes": prepared[0].saved_bytes,
+    }
+    assert stats["saved_bytes"] > 0
@@ -0,0 +1,75 @@
+import io
+
+import pytest
+from bench_incremental import with_last_point
+from fixtures import certificate_record
+
+from _incremental import load_sidecar
+from certificate_without_humidity import CertificateWithoutHumidity
+
+# Tabela longa o bastante para ocupar várias páginas
+POINTS = 120
+
+
+@pytest.fixture
+def record() -> dict:
+    return certificate_record(POINTS)
+
+
+def _incremental(document, sidecar: str):
+    output = io.BytesIO()
+    result = document.generate_incremental(output, sidecar, reproducible=True)
+    return output.getvalue(), result
+
+
+def test_first_generation_matches_full_render(record, tmp_path):
+    document = CertificateWithoutHumidity.model_validate(record)
+    data, result = _incremental(document, str(tmp_path / "layout.json"))
+    assert result.reused_pages == 0
+    assert data == document.render_bytes(reproducible=True)
+
+
+def test_unchanged_document_reuses_pages(record, tmp_path):
+    sidecar = str(tmp_path / "layout.json")
+    document = CertificateWithoutHumidity.model_validate(record)
+    _incremental(document, sidecar)
+    data, result = _incremental(document, sidecar)
+    # Só a página onde o conteúdo termina é refeita
+    assert result.pages > 1
+    assert result.reused_pages == result.pages - 1
+    assert data == document.render_bytes(reproducible=True)
+
+
+def test_changed_last_point_matches_full_render(record, tmp_path):
+    sidecar = str(tmp_path / "layout.json")
+    _incremental(CertificateWithoutHumidity.model_validate(record), sidecar)
+    changed = with_last_point(record, 99.0)
+    data, result = _incremental(changed, sidecar)
+    assert 0 < result.reused_pages < result.pages
+    assert data == changed.render_bytes(reproducible=True)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"[1, 2, 3]",
+        b"\xff\xfe n\xe3o \xe9 UTF-8",
+        b'{"version": 1}',
+        b'{"version": 1, "layout_key": "x", "flowables": [], "pages": [{}]}',
+        b"{",
+    ],
+)
+def test_invalid_sidecar_falls_back_to_full_render(record, tmp_path, content):
+    sidecar = tmp_path / "layout.json"
+    sidecar.write_bytes(content)
+    document = CertificateWithoutHumidity.model_validate(record)
+    data, result = _incremental(document, str(sidecar))
+    assert result.reused_pages == 0
+    assert data == document.render_bytes(reproducible=True)
+    # O sidecar é regravado e a geração seguinte volta a reaproveitar páginas
+    assert _incremental(document, str(sidecar))[1].reused_pages > 0
+
+
+def test_unreadable_sidecar_is_ignored(tmp_path):
+    # Um diretório no lugar do arquivo: IsADirectoryError (OSError)
+    assert load_sidecar(str(tmp_path)) is None
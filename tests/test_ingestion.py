@@ -0,0 +1,90 @@
+import math
+
+import numpy as np
+import pytest
+
+from _metrology import DEFAULT_RESOLUTION
+from certificate_electrical import CertificateElectrical
+from ingestion import (ReadingsChunk, certificate_filename, group_readings,
+                       iter_certificates)
+
+
+def _chunk(serial_numbers: list[str]) -> ReadingsChunk:
+    count = len(serial_numbers)
+    return ReadingsChunk(
+        serial_numbers=np.array(serial_numbers),
+        vvc=np.arange(count, dtype=np.float64),
+        readings=np.arange(count, dtype=np.float64) + 0.5,
+    )
+
+
+def test_groups_span_chunks():
+    chunks = [_chunk(["A", "A", "B"]), _chunk(["B", "C"]), _chunk([])]
+    groups = [
+        (serial, vvc.tolist(), readings.tolist())
+        for serial, vvc, readings in group_readings(chunks)
+    ]
+    assert groups == [
+        ("A", [0.0, 1.0], [0.5, 1.5]),
+        ("B", [2.0, 0.0], [2.5, 0.5]),
+        ("C", [1.0], [1.5]),
+    ]
+
+
+@pytest.mark.parametrize(
+    "chunks",
+    [
+        [["A", "B", "A"]],
+        [["A", "B"], ["A"]],
+    ],
+)
+def test_non_consecutive_serial_numbers_raise(chunks):
+    with pytest.raises(ValueError, match="instrumento A"):
+        list(group_readings(_chunk(serials) for serials in chunks))
+
+
+def _write_csv(path, rows: list[tuple[str, float, float]]) -> str:
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("serial_number,vvc,reading\n")
+        file.writelines(f"{serial},{vvc},{reading}\n" for serial, vvc, reading in rows)
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    "serial, filename",
+    [
+        ("0042", "certificado_0042.pdf"),
+        ("../../etc/x", "certificado_.._.._etc_x.pdf"),
+        ("/tmp/abs", "certificado__tmp_abs.pdf"),
+        ("A 1\\2", "certificado_A_1_2.pdf"),
+    ],
+)
+def test_certificate_filename_stays_in_output_dir(serial, filename):
+    assert certificate_filename(serial) == filename
+
+
+def test_iter_certificates_sanitizes_serial_number(tmp_path):
+    path = _write_csv(
+        tmp_path / "leituras.csv", [("../x", 10.0, 10.1), ("../x", 10.0, 10.2)]
+    )
+    (certificate,) = iter_certificates(path)
+    assert certificate.filename == "certificado_.._x.pdf"
+    assert certificate.instrument.serial_number == "../x"
+
+
+def test_budget_uses_standard_resolution(tmp_path):
+    path = _write_csv(tmp_path / "leituras.csv", [("A", 10.0, 10.1), ("A", 10.0, 10.2)])
+    (certificate,) = iter_certificates(path, {"standard": {"resolution": 1.0}})
+    (point,) = certificate.measurement_points
+    type_a = 0.05  # s / √n, com s = 0,05·√2 e n = 2
+    assert point.uc == pytest.approx(math.hypot(type_a, 1.0 / (2 * math.sqrt(3))))
+    assert certificate.standard.resolution == 1.0
+
+
+def test_budget_defaults_to_class_standard(tmp_path):
+    path = _write_csv(tmp_path / "leituras.csv", [("A", 10.0, 10.1), ("A", 10.0, 10.2)])
+    (certificate,) = iter_certificates(path, certificate_cls=CertificateElectrical)
+    (point,) = certificate.measurement_points
+    resolution = certificate.standard.resolution
+    assert resolution != DEFAULT_RESOLUTION
+    assert point.uc == pytest.approx(math.hypot(0.05, resolution / (2 * math.sqrt(3))))
@@ -0,0 +1,87 @@
+import queue
+import time
+
+import pytest
+
+from _job_queue import STATUS_FAILED, STATUS_QUEUED, STATUS_RUNNING, JobQueue
+
+
+@pytest.fixture
+def job_queue(tmp_path):
+    with JobQueue(str(tmp_path / "fila.db")) as job_queue:
+        yield job_queue
+
+
+def test_claim_by_priority_then_arrival(job_queue):
+    low = job_queue.submit({"n": 1})
+    high = job_queue.submit({"n": 2}, priority=1)
+    later = job_queue.submit({"n": 3})
+    assert [job.id for job in job_queue.claim(3)] == [high, low, later]
+    assert job_queue.claim() == []
+    assert job_queue.depth()[STATUS_RUNNING] == 3
+
+
+def test_claim_hands_each_job_out_once(tmp_path):
+    path = str(tmp_path / "fila.db")
+    with JobQueue(path) as first, JobQueue(path) as second:
+        first.submit_many([{"n": n} for n in range(4)])
+        claimed = first.claim(3) + second.claim(3)
+    assert sorted(job.id for job in claimed) == [1, 2, 3, 4]
+
+
+def test_fail_retries_with_backoff_until_exhausted(job_queue):
+    job_id = job_queue.submit({"n": 1}, max_attempts=2)
+    (job,) = job_queue.claim()
+    assert job_queue.fail(job, "erro 1", 0.1, retry_delay=0.05)
+    assert job_queue.job(job_id)["status"] == STATUS_QUEUED
+    # Ainda dentro da espera antes da nova tentativa
+    assert job_queue.claim() == []
+
+    time.sleep(0.06)
+    (job,) = job_queue.claim()
+    assert job.attempts == 2
+    assert not job_queue.fail(job, "erro 2", 0.1)
+    state = job_queue.job(job_id)
+    assert (state["status"], state["error"]) == (STATUS_FAILED, "erro 2")
+
+
+def test_complete(job_queue):
+    job_id = job_queue.submit({"n": 1})
+    (job,) = job_queue.claim()
+    job_queue.complete(job, "certificado.pdf", 0.2)
+    state = job_queue.job(job_id)
+    assert (state["status"], state["filename"]) == ("done", "certificado.pdf")
+    assert job_queue.finished()[0][0] == job_id
+
+
+def test_recover_only_expired_leases(job_queue):
+    job_queue.submit_many([{"n": 1}, {"n": 2}])
+    (live,) = job_queue.claim(lease=60)
+    (expired,) = job_queue.claim(lease=0.01)
+    time.sleep(0.02)
+    assert job_queue.recover() == 1
+    assert job_queue.job(live.id)["status"] == STATUS_RUNNING
+    assert job_queue.job(expired.id)["status"] == STATUS_QUEUED
+
+    # Com a reserva renovada, o job continua com o worker
+    (job,) = job_queue.claim(lease=0.01)
+    job_queue.renew([job], lease=60)
+    time.sleep(0.02)
+    assert job_queue.recover() == 0
+
+
+def test_recover_fails_exhausted_jobs(job_queue):
+    job_id = job_queue.submit({"n": 1}, max_attempts=1)
+    job_queue.claim(lease=0.0)
+    time.sleep(0.01)
+    assert job_queue.recover() == 0
+    assert job_queue.job(job_id)["status"] == STATUS_FAILED
+
+
+def test_submit_rejects_when_full(tmp_path):
+    with JobQueue(str(tmp_path / "fila.db"), max_depth=2) as job_queue:
+        job_queue.submit_many([{"n": 1}, {"n": 2}])
+        with pytest.raises(queue.Full):
+            job_queue.submit({"n": 3})
+        job_queue.claim()
+        job_queue.submit({"n": 3})
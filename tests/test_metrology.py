@@ -0,0 +1,93 @@
+import math
+
+import numpy as np
+import pytest
+from fixtures import certificate_record
+
+import _metrology
+import calibration_certificate
+from _metrology import calibration_points, format_decimals, results_cells
+from calibration_certificate import (FormattedPoints, ResultRows,
+                                     format_decimal, results_rows, summary_row)
+from certificate_without_humidity import CertificateWithoutHumidity
+
+EDGE_CASES = [
+    0.0,
+    -0.0,
+    -0.004,
+    0.005,
+    1.005,
+    2.675,
+    -2.675,
+    12.5,
+    -12.5,
+    0.125,
+    123456.789,
+    1e17,
+    -1e300,
+    math.nan,
+    math.inf,
+    -math.inf,
+]
+
+
+@pytest.mark.parametrize("decimals", [0, 1, 2, 3])
+def test_edge_cases_match_format_decimal(decimals):
+    expected = [format_decimal(value, decimals) for value in EDGE_CASES]
+    assert format_decimals(np.array(EDGE_CASES), decimals).tolist() == expected
+
+
+def test_non_finite_values():
+    values = np.array([math.nan, math.inf, -math.inf, 1.0])
+    assert format_decimals(values).tolist() == ["nan", "inf", "-inf", "1,00"]
+
+
+def test_random_values_match_format_decimal():
+    rng = np.random.default_rng(0)
+    values = np.concatenate(
+        [rng.normal(0, 100, 20000).round(3), rng.uniform(-1, 1, 20000)]
+    )
+    expected = [format_decimal(value) for value in values.tolist()]
+    assert format_decimals(values).tolist() == expected
+
+
+def test_single_reading_point_has_no_uncertainty():
+    results = calibration_points(
+        np.zeros(3, np.int64), np.array([0.0, 0.0, 5.0]), np.array([0.1, 0.3, 5.2])
+    )
+    assert results.count.tolist() == [2, 1]
+    assert math.isfinite(results.uc[0])
+    assert math.isnan(results.uc[1])
+    assert results.vml[1] == 5.2
+    assert format_decimals(results.uc).tolist()[1] == "nan"
+
+
+@pytest.mark.parametrize("points", [3, 300])
+def test_tables_share_formatted_points(points, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        calibration_certificate,
+        "results_rows",
+        lambda items: calls.append(len(items)) or results_rows(items),
+    )
+    monkeypatch.setattr(
+        _metrology,
+        "results_cells",
+        lambda *columns: calls.append(len(columns[0])) or results_cells(*columns),
+    )
+    document = CertificateWithoutHumidity.model_validate(certificate_record(points))
+    document.render_bytes()
+    # Uma única formatação para a tabela de resultados e a de resumo
+    assert calls == [points]
+
+
+def test_formatted_points_match_results_rows():
+    points = CertificateWithoutHumidity.model_validate(
+        certificate_record(300)
+    ).measurement_points
+    rows = ResultRows(FormattedPoints(points))
+    assert rows[:] == results_rows(points)
+    assert rows[10:20] == results_rows(points)[10:20]
+    assert ResultRows(FormattedPoints(points), summary_row)[-1] == summary_row(
+        results_rows(points)[-1]
+    )
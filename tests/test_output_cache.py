@@ -0,0 +1,54 @@
+import os
+
+from fixtures import certificate_record
+
+from _output_cache import DiskPDFCache
+from calibration_certificate import CalibrationCertificate
+
+
+def _certificate(**changes) -> CalibrationCertificate:
+    return CalibrationCertificate.model_validate({**certificate_record(), **changes})
+
+
+def test_cache_key_ignores_filename():
+    assert (
+        _certificate().cache_key()
+        == _certificate(filename="outro_nome.pdf").cache_key()
+    )
+
+
+def test_cache_key_changes_with_data_and_mode():
+    key = _certificate().cache_key()
+    assert _certificate(number="9999").cache_key() != key
+    assert _certificate().cache_key(archival=True) != key
+
+
+def test_disk_cache_miss_then_hit(tmp_path):
+    cache = DiskPDFCache(str(tmp_path))
+    assert cache.get("ab" * 32) is None
+    cache.put("ab" * 32, b"%PDF-1.4 dados")
+    assert cache.get("ab" * 32) == b"%PDF-1.4 dados"
+    assert cache.get("cd" * 32) is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "entries": 1, "bytes": 14}
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskPDFCache(str(tmp_path), max_bytes=25)
+    cache.put("aa" * 32, b"x" * 10)
+    cache.put("bb" * 32, b"y" * 10)
+    # Usada por último: "aa" sobrevive à remoção
+    os.utime(cache._path("bb" * 32), ns=(0, 0))
+    cache.get("aa" * 32)
+    cache.put("cc" * 32, b"z" * 10)
+    assert cache.get("bb" * 32) is None
+    assert cache.get("aa" * 32) == b"x" * 10
+    assert cache.get("cc" * 32) == b"z" * 10
+
+
+def test_generate_pdf_uses_cache(tmp_path):
+    cache = DiskPDFCache(str(tmp_path))
+    first = _certificate().render_bytes(cache=cache)
+    second = _certificate(filename="outro_nome.pdf").render_bytes(cache=cache)
+    assert first == second
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert first == _certificate().render_bytes(reproducible=True)
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from _pdf_stream import content_disposition, send_asgi_pdf
+
+
+@pytest.mark.parametrize(
+    "filename, expected",
+    [
+        ("certificado.pdf", b'inline; filename="certificado.pdf"'),
+        ("saida/lote\\certificado.pdf", b'inline; filename="certificado.pdf"'),
+        ("a\r\nSet-Cookie: x=1.pdf", b'inline; filename="aSet-Cookie: x=1.pdf"'),
+        (
+            'a"; b=1.pdf',
+            b"inline; filename=\"a_; b=1.pdf\"; filename*=UTF-8''a%22%3B%20b%3D1.pdf",
+        ),
+        (
+            "São.pdf",
+            b"inline; filename=\"S_o.pdf\"; filename*=UTF-8''S%C3%A3o.pdf",
+        ),
+    ],
+)
+def test_content_disposition(filename, expected):
+    assert content_disposition(filename) == expected
+
+
+def test_send_asgi_pdf_headers_and_body():
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    async def chunks():
+        yield b"%PDF"
+        yield b"-1.4"
+
+    asyncio.run(send_asgi_pdf(send, chunks(), "cert\r\nX-Evil: 1.pdf"))
+    start, *body = messages
+    assert dict(start["headers"])[b"content-disposition"] == (
+        b'inline; filename="certX-Evil: 1.pdf"'
+    )
+    assert b"".join(message["body"] for message in body) == b"%PDF-1.4"
+    assert body[-1]["more_body"] is False
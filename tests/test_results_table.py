@@ -0,0 +1,59 @@
+import io
+
+import pytest
+from reportlab.platypus import SimpleDocTemplate, TableStyle
+from reportlab.platypus.doctemplate import LayoutError
+
+from _results_table import ResultsTable, TableStylePreset
+from calibration_certificate import RESULTS_TABLE_STYLE
+
+HEADER = [["VVC", "VML"]]
+ROWS = [(f"{index},00", f"{index},10") for index in range(200)]
+
+
+def _table(style=RESULTS_TABLE_STYLE) -> ResultsTable:
+    return ResultsTable(HEADER, ROWS, [60, 60], style=style)
+
+
+def test_row_height_from_default_style():
+    # Helvetica 10 (leading 12) com paddings de 3 pt acima e abaixo
+    assert _table().row_height == 18
+
+
+@pytest.mark.parametrize(
+    "style",
+    [
+        TableStyle(
+            [
+                ("FONT", (0, 1), (-1, -1), "Helvetica", 14, 16),
+                ("TOPPADDING", (0, 1), (-1, -1), 2),
+                ("BOTTOMPADDING", (0, 1), (-1, -1), 4),
+            ]
+        ),
+        TableStylePreset(
+            [],
+            cell_style={"fontsize": 14, "leading": 16, "topPadding": 2},
+        ),
+    ],
+)
+def test_row_height_follows_style(style):
+    table = _table(style)
+    expected = 16 + 2 + (4 if isinstance(style, TableStyle) else 3)
+    assert table.row_height == expected
+    # Os blocos do split usam a mesma altura
+    first, rest = table.split(120, table.header_height(120) + 10 * expected)
+    assert (first.row_count, first.row_height) == (10, expected)
+    assert rest.row_height == expected
+
+
+def test_split_moves_to_next_frame_when_header_does_not_fit():
+    table = _table()
+    assert table.split(120, table.header_height(120) + 10) == []
+
+
+def test_header_taller_than_empty_frame_raises_clear_error():
+    document = SimpleDocTemplate(
+        io.BytesIO(), pagesize=(300, 60), topMargin=10, bottomMargin=10
+    )
+    with pytest.raises(LayoutError, match="não cabem em um frame vazio"):
+        document.build([_table()])
@@ -0,0 +1,14 @@
+import stress_threads
+
+
+def test_threaded_render_matches_serial():
+    results = stress_threads.run(documents_count=6, threads=4, rounds=1)
+    assert results["mismatches"] == 0
+
+
+def test_each_build_gets_its_own_flowables():
+    # O build altera os flowables (wrap, split): nenhum pode ser compartilhado
+    (document,) = stress_threads.documents(1)
+    first = list(document.content_to_pdf())
+    second = list(document.content_to_pdf())
+    assert {id(flowable) for flowable in first}.isdisjoint(map(id, second))